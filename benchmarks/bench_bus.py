@@ -0,0 +1,70 @@
+"""
+Throughput of the message bus with and without the durable spool.
+
+Publishes N inbound messages from a producer while a consumer takes and
+releases them (one full turn each, as AgentLoop does), then the same for
+outbound messages through a channel lane.
+
+    python benchmarks/bench_bus.py [N]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.spool import BusSpool
+
+
+async def inbound(bus: MessageBus, n: int) -> float:
+    async def consume() -> None:
+        for _ in range(n):
+            msg = await bus.consume_inbound(hold=True)
+            await bus.release_inbound(msg)
+
+    started = time.perf_counter()
+    consumer = asyncio.create_task(consume())
+    for i in range(n):
+        await bus.publish_inbound(InboundMessage("telegram", "u", str(i % 50), f"message {i}"))
+    await consumer
+    return n / (time.perf_counter() - started)
+
+
+async def outbound(bus: MessageBus, n: int) -> float:
+    done = asyncio.Event()
+    sent = 0
+
+    async def send(msg: OutboundMessage) -> None:
+        nonlocal sent
+        sent += 1
+        if sent == n:
+            done.set()
+
+    bus.subscribe_outbound("telegram", send, workers=4)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+    started = time.perf_counter()
+    for i in range(n):
+        await bus.publish_outbound(OutboundMessage("telegram", str(i % 50), f"reply {i}"))
+    await done.wait()
+    rate = n / (time.perf_counter() - started)
+    bus.stop()
+    await dispatcher
+    return rate
+
+
+async def main(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (
+            ("in-memory", lambda: MessageBus()),
+            ("spool", lambda: MessageBus(spool=BusSpool(Path(tmp) / f"spool-{time.monotonic_ns()}.db"))),
+        ):
+            rate_in = await inbound(make(), n)
+            rate_out = await outbound(make(), n)
+            print(f"{name:>10}: inbound {rate_in:10,.0f} msg/s   outbound {rate_out:10,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
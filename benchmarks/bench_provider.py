@@ -0,0 +1,94 @@
+"""
+Per-request overhead of the native OpenAI-compatible provider vs LiteLLM.
+
+Starts a local stub chat completions server that answers instantly, then
+makes N sequential chat() calls (a turn's tool iterations, many times
+over) through each provider and reports the mean and p95 latency. With
+a stub upstream, the latency is the provider's own overhead: request
+building, HTTP client and connection handling, response parsing.
+
+    python benchmarks/bench_provider.py [N]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from nanobot.providers.base import LLMProvider
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.openai_compat import OpenAICompatProvider
+
+RESPONSE = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench-model",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "ok"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 20, "completion_tokens": 1, "total_tokens": 21},
+}).encode()
+
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant. " * 50},
+    {"role": "user", "content": "ping"},
+]
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal HTTP/1.1 keep-alive server: every POST gets RESPONSE."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: " + str(len(RESPONSE)).encode() + b"\r\n\r\n" + RESPONSE
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        pass  # client closed the connection, or shutdown with LiteLLM's connection still open
+    finally:
+        writer.close()
+
+
+async def measure(provider: LLMProvider, n: int) -> tuple[float, float]:
+    """Mean and p95 latency (ms) of n sequential calls, after a warm-up call."""
+    await provider.chat(MESSAGES)
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        response = await provider.chat(MESSAGES)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.content == "ok", response.content
+    samples.sort()
+    return sum(samples) / n, samples[int(n * 0.95)]
+
+
+async def main(n: int) -> None:
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    api_base = f"http://127.0.0.1:{port}/v1"
+
+    native = OpenAICompatProvider(api_key="bench", api_base=api_base, default_model="bench-model")
+    litellm_provider = LiteLLMProvider(api_key="bench", api_base=api_base, default_model="bench-model")
+    print(f"{n} sequential chat() calls against a local stub server")
+    for name, provider in (("litellm", litellm_provider), ("native", native)):
+        mean, p95 = await measure(provider, n)
+        print(f"  {name:8} mean {mean:6.2f} ms   p95 {p95:6.2f} ms")
+    await native.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
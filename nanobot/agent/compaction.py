@@ -0,0 +1,137 @@
+"""Background compaction of long sessions into rolling summaries."""
+
+import asyncio
+
+from loguru import logger
+
+from nanobot.agent.packing import stored_message_tokens
+from nanobot.providers.base import LLMProvider
+from nanobot.session.manager import Message, Session, SessionManager
+from nanobot.usage.scope import COMPACTION, set_scope
+
+# Share of the threshold kept as raw messages after a compaction
+KEEP_RATIO = 0.5
+
+# Reply budget for the summarizer
+SUMMARY_MAX_TOKENS = 1024
+
+# Per-message cap on text fed to the summarizer
+MAX_SUMMARY_INPUT_CHARS = 4000
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an AI assistant.
+
+Merge the previous summary (if any) with the new messages into a single concise summary. Keep facts about the user, their preferences, decisions made, results of work done, open tasks and anything else needed to continue the conversation. Drop greetings and chit-chat.
+
+Reply with the summary only, as short paragraphs or bullet points."""
+
+
+class SessionCompactor:
+    """
+    Folds the oldest turns of long sessions into a persisted rolling summary.
+
+    After a turn is saved, the session's history is measured in tokens; when
+    it crosses the threshold, a background task summarizes the oldest turns
+    (keeping roughly the newest half of the threshold verbatim) with the
+    summary model, then replaces those turns with the updated summary. The
+    turn that triggered it never waits on the summarizer.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        sessions: SessionManager,
+        model: str,
+        threshold_tokens: int,
+        summary_model: str | None = None,
+    ):
+        self.provider = provider
+        self.sessions = sessions
+        self.model = model
+        self.threshold_tokens = threshold_tokens
+        self.summary_model = summary_model or model
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    def session_tokens(self, session: Session) -> int:
+        """Token count of a session's stored history (cached per message)."""
+        return sum(stored_message_tokens(self.provider, self.model, m) for m in session.messages)
+
+    def maybe_compact(self, session: Session) -> asyncio.Task[None] | None:
+        """Start a background compaction if the session is over the threshold."""
+        if session.key in self._tasks or self.session_tokens(session) <= self.threshold_tokens:
+            return None
+
+        task = asyncio.create_task(self._compact(session))
+        self._tasks[session.key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(session.key, None))
+        return task
+
+    def _split(self, messages: list[Message]) -> int:
+        """Number of oldest messages to fold into the summary."""
+        keep_budget = int(self.threshold_tokens * KEEP_RATIO)
+        kept = 0
+        start = len(messages)
+        while start > 0:
+            tokens = stored_message_tokens(self.provider, self.model, messages[start - 1])
+            if kept + tokens > keep_budget:
+                break
+            kept += tokens
+            start -= 1
+
+        # Keep whole turns: the verbatim part starts at a user message
+        while start < len(messages) and messages[start].role != "user":
+            start += 1
+        return start
+
+    async def _compact(self, session: Session) -> None:
+        """Summarize the oldest turns and drop them from the session."""
+        set_scope(session.key, session.key.split(":", 1)[0], COMPACTION)
+        # The oldest turns may not be in memory after a tail-only load
+        if not await self.sessions.page_in_older(session):
+            logger.debug(f"Compaction of {session.key} skipped: session changed while paging in")
+            return
+        # Off the loop: paged-in messages have no cached token counts yet
+        count = await asyncio.to_thread(self._split, list(session.messages))
+        if count == 0:
+            return
+        batch = session.messages[:count]
+        previous = session.summary
+
+        transcript = "\n\n".join(
+            f"{m.role}: {m.content[:MAX_SUMMARY_INPUT_CHARS]}" for m in batch
+        )
+        prompt = f"Previous summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+        try:
+            response = await self.provider.chat(
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                model=self.summary_model,
+                max_tokens=SUMMARY_MAX_TOKENS,
+                temperature=0.2,
+            )
+        except Exception as e:
+            logger.warning(f"Compaction of {session.key} failed: {e}")
+            return
+        if response.finish_reason == "error" or not response.content:
+            logger.warning(f"Compaction of {session.key} failed: {response.content}")
+            return
+
+        # The session may have been cleared, trimmed or reloaded while summarizing
+        current = session.messages[:count]
+        if (
+            self.sessions.get_or_create(session.key) is not session
+            or session.summary != previous
+            or len(current) != count
+            or any(a is not b for a, b in zip(current, batch))
+        ):
+            logger.debug(f"Compaction of {session.key} discarded: session changed meanwhile")
+            return
+
+        session.summary = response.content.strip()
+        session.drop_oldest(count)
+        self.sessions.save(session)
+        logger.info(
+            f"Compacted {count} message(s) of {session.key} into a "
+            f"{len(session.summary)}-char summary"
+        )
@@ -7,7 +7,9 @@ from pathlib import Path
 from typing import Any
 
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.prompt_cache import SectionCache, file_stamp
 from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.helpers import today_date
 
 
 # Resource limits for context building
@@ -26,10 +28,16 @@ class ContextBuilder:
 
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, stable_prefix: bool = False):
         self.workspace = workspace
+        self.stable_prefix = stable_prefix
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self._sections = SectionCache()
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Hit/miss counters of the prompt section cache."""
+        return self._sections.stats()
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -41,6 +49,10 @@ class ContextBuilder:
         Returns:
             Complete system prompt.
         """
+        if self.stable_prefix:
+            static, volatile = self.build_system_prompt_parts(skill_names)
+            return f"{static}\n\n---\n\n{volatile}"
+
         parts = []
         
         # Core identity
@@ -52,10 +64,61 @@ class ContextBuilder:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        memory = self._get_memory_context()
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
+        parts.extend(self._get_skills_sections())
+
+        return "\n\n---\n\n".join(parts)
+
+    def build_system_prompt_parts(self, skill_names: list[str] | None = None) -> tuple[str, str]:
+        """
+        Build the system prompt split into a stable prefix and a volatile suffix.
+
+        The prefix (identity, bootstrap files, skills) is identical across
+        sessions and only changes when those files do, so providers can cache
+        it. Memory and the current time go in the suffix.
+
+        Args:
+            skill_names: Optional list of skills to include.
+
+        Returns:
+            (static prefix, volatile suffix)
+        """
+        static = [self._get_identity(include_time=False)]
+
+        bootstrap = self._load_bootstrap_files()
+        if bootstrap:
+            static.append(bootstrap)
+
+        static.extend(self._get_skills_sections())
+
+        volatile = []
+        memory = self._get_memory_context()
+        if memory:
+            volatile.append(f"# Memory\n\n{memory}")
+        volatile.append(f"## Current Time\n{self._current_time()}")
+
+        return "\n\n---\n\n".join(static), "\n\n---\n\n".join(volatile)
+
+    def _get_memory_context(self) -> str:
+        """Get the memory context, re-reading only when the memory files change."""
+        fingerprint = (
+            today_date(),
+            file_stamp(self.memory.memory_file),
+            file_stamp(self.memory.get_today_file()),
+        )
+        return self._sections.get("memory", fingerprint, self.memory.get_memory_context)
+
+    def _get_skills_sections(self) -> list[str]:
+        """Get the skills sections, rebuilding only when skill files or requirements change."""
+        return self._sections.get("skills", self.skills.fingerprint(), self._build_skills_sections)
+
+    def _build_skills_sections(self) -> list[str]:
+        """Build the skills sections: always-loaded skill content and the skills summary."""
+        parts = []
+
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
@@ -74,12 +137,16 @@ Skills with available="false" need dependencies installed first - you can try in
 
 {skills_summary}""")
         
-        return "\n\n---\n\n".join(parts)
+        return parts
     
-    def _get_identity(self) -> str:
-        """Get the core identity section."""
+    @staticmethod
+    def _current_time() -> str:
         from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        return datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+
+    def _get_identity(self, include_time: bool = True) -> str:
+        """Get the core identity section."""
+        time_section = f"## Current Time\n{self._current_time()}\n\n" if include_time else ""
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -93,10 +160,7 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now}
-
-## Runtime
+{time_section}## Runtime
 {runtime}
 
 ## Workspace
@@ -113,7 +177,12 @@ Always be helpful, accurate, and concise. When using tools, explain what you're
 When remembering something, write to {workspace_path}/memory/MEMORY.md"""
     
     def _load_bootstrap_files(self) -> str:
-        """Load all bootstrap files from workspace, with size limits."""
+        """Load all bootstrap files, re-reading only when one of them changes."""
+        fingerprint = tuple(file_stamp(self.workspace / f) for f in self.BOOTSTRAP_FILES)
+        return self._sections.get("bootstrap", fingerprint, self._read_bootstrap_files)
+
+    def _read_bootstrap_files(self) -> str:
+        """Read all bootstrap files from workspace, with size limits."""
         parts = []
 
         for filename in self.BOOTSTRAP_FILES:
@@ -136,6 +205,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        summary: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
@@ -147,6 +217,7 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            summary: Summary of older turns compacted out of the history.
 
         Returns:
             List of messages including system prompt.
@@ -154,10 +225,24 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         messages = []
 
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+        session_info = (
+            f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+            if channel and chat_id else ""
+        )
+        if summary:
+            # Stands in for the turns compacted out of the session history
+            session_info += f"\n\n## Earlier Conversation (summary)\n{summary}"
+        if self.stable_prefix:
+            # Cache breakpoint after the stable prefix; providers without
+            # prompt caching flatten this back into a single string
+            static, volatile = self.build_system_prompt_parts(skill_names)
+            messages.append({"role": "system", "content": [
+                {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": volatile + session_info},
+            ]})
+        else:
+            system_prompt = self.build_system_prompt(skill_names) + session_info
+            messages.append({"role": "system", "content": system_prompt})
 
         # History
         messages.extend(history)
@@ -2,15 +2,21 @@
 
 import asyncio
 import json
+import time
+import uuid
+from contextlib import aclosing
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.bus.scheduler import PRIORITY_INTERACTIVE, turn_key
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.agent.compaction import SessionCompactor
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.packing import ContextPacker
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
@@ -21,7 +27,9 @@ from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.subagent import SubagentManager
 from nanobot.security.ratelimit import RateLimiter
 from nanobot.security.sanitize import sanitize_error, sanitize_tool_result
-from nanobot.session.manager import SessionManager
+from nanobot.session.manager import Session, SessionManager
+from nanobot.usage.scope import DIRECT, SYSTEM, TURN, set_scope
+from nanobot.usage.store import UsageStore
 
 # Tool name -> rate limit operation mapping
 _TOOL_RATE_MAP = {
@@ -34,6 +42,19 @@ _TOOL_RATE_MAP = {
     "cron": "cron_job",
 }
 
+# Minimum seconds between partial stream updates published to the bus
+STREAM_PUBLISH_INTERVAL = 0.25
+
+# Receives the text generated so far by the current LLM call
+StreamCallback = Callable[[str], Awaitable[None]]
+
+
+def _interrupted_note(tools_called: list[str]) -> str:
+    """Assistant message recorded for a turn cancelled by a newer message."""
+    if not tools_called:
+        return "[Interrupted by a newer message before replying]"
+    return f"[Interrupted by a newer message after calling: {', '.join(tools_called)}]"
+
 
 class AgentLoop:
     """
@@ -59,6 +80,18 @@ class AgentLoop:
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
+        max_concurrent_turns: int = 4,
+        max_parallel_tool_calls: int = 1,
+        stream: bool = False,
+        prompt_caching: bool = False,
+        max_tokens: int = 4096,
+        context_window: int = 0,
+        compaction_threshold: int = 0,
+        compaction_model: str | None = None,
+        cancel_superseded: bool = False,
+        usage: UsageStore | None = None,
+        session_token_budget: int = 0,
+        budget_window_h: float = 24.0,
     ):
         from nanobot.config.schema import ExecToolConfig
         from nanobot.cron.service import CronService
@@ -71,9 +104,23 @@ class AgentLoop:
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
-        
-        self.context = ContextBuilder(workspace)
+        self.max_parallel_tool_calls = max_parallel_tool_calls
+        self.stream = stream
+        self.max_tokens = max_tokens
+        
+        self.context = ContextBuilder(workspace, stable_prefix=prompt_caching)
+        # History is packed into a token budget when a context window is set,
+        # otherwise the last 50 messages are sent as-is
+        self.packer = (
+            ContextPacker(provider, self.model, context_window, max_tokens)
+            if context_window > 0 else None
+        )
         self.sessions = session_manager or SessionManager(workspace)
+        # Long sessions are folded into a rolling summary in the background
+        self.compactor = (
+            SessionCompactor(provider, self.sessions, self.model, compaction_threshold, compaction_model)
+            if compaction_threshold > 0 else None
+        )
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
             provider=provider,
@@ -83,10 +130,30 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            max_parallel_tool_calls=max_parallel_tool_calls,
         )
         
         self.rate_limiter = RateLimiter()
+        # Per-session token budget over a rolling window, from the usage store
+        self.usage = usage
+        self.session_token_budget = session_token_budget if usage else 0
+        self.budget_window_h = budget_window_h
         self._running = False
+
+        # Turn scheduling: sessions run in parallel up to the cap, strictly ordered within
+        self.max_concurrent_turns = max(1, max_concurrent_turns)
+        self._turn_slots = asyncio.Semaphore(self.max_concurrent_turns)
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._session_lock_refs: dict[str, int] = {}
+        self._turn_tasks: set[asyncio.Task[None]] = set()
+        # process_direct() turns queued on the bus while run() is active, by id(msg)
+        self._direct_turns: dict[int, tuple[asyncio.Future, StreamCallback | None]] = {}
+        # Running channel turns by session; a newer message from the chat cancels its turn
+        self.cancel_superseded = cancel_superseded
+        self._active_turns: dict[str, asyncio.Task] = {}
+        if cancel_superseded:
+            self.bus.inbound.on_held_put = self._supersede
+
         self._register_default_tools()
     
     def _register_default_tools(self) -> None:
@@ -122,46 +189,190 @@ class AgentLoop:
             self.tools.register(CronTool(self.cron_service))
     
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """
+        Run the agent loop, dispatching messages from the bus.
+
+        Each message becomes its own turn task. Turns for different sessions
+        run concurrently (bounded by max_concurrent_turns), while turns for
+        the same session run one at a time in arrival order. Messages are
+        only taken from the bus when a turn can start, so the backlog waits
+        in the bus's fair queue, which decides which session goes next.
+        """
         self._running = True
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max {self.max_concurrent_turns} concurrent turns)")
         
         while self._running:
+            if len(self._turn_tasks) >= self.max_concurrent_turns:
+                await asyncio.wait(self._turn_tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
             try:
-                # Wait for next message
+                # Wait for the next message from a session without a running turn
                 msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
+                    self.bus.consume_inbound(hold=True),
                     timeout=1.0
                 )
-                
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send sanitized error response
-                    safe_err = sanitize_error(e)
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {safe_err}"
-                    ))
             except asyncio.TimeoutError:
                 continue
+
+            task = asyncio.create_task(self._run_turn(msg))
+            self._turn_tasks.add(task)
+            task.add_done_callback(self._turn_tasks.discard)
+
+    async def _run_turn(self, msg: InboundMessage) -> None:
+        """Process one message as a turn and publish the response (or a sanitized error)."""
+        try:
+            direct = self._direct_turns.pop(id(msg), None)
+            if direct:
+                await self._run_direct_turn(msg, *direct)
+            else:
+                await self._run_bus_turn(msg)
+        finally:
+            await self.bus.release_inbound(msg)
+
+    async def _run_bus_turn(self, msg: InboundMessage) -> None:
+        """Run a turn for a channel message and publish its reply."""
+        stream_id = None
+        on_text = None
+        streamed = ""
+        if self.stream and msg.channel != "system":
+            stream_id = uuid.uuid4().hex[:12]
+            publish = self._stream_publisher(msg.channel, msg.chat_id, stream_id)
+
+            async def on_text(text: str) -> None:
+                nonlocal streamed
+                streamed = text
+                await publish(text)
+        try:
+            if self.cancel_superseded and msg.channel != "system":
+                response = await self._process_cancellable(msg, on_text)
+            else:
+                response = await self._process_serialized(msg, on_text)
+            if response:
+                # Lets streaming channels replace their draft with the final reply
+                response.stream_id = stream_id
+                await self.bus.publish_outbound(response)
+            elif streamed:
+                # Superseded mid-stream: close the draft so channels don't wait for a final
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    content=f"{streamed}\n\n_(interrupted)_",
+                    metadata={"interrupted": True},
+                    stream_id=stream_id,
+                ))
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            # Send sanitized error response
+            safe_err = sanitize_error(e)
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {safe_err}",
+                stream_id=stream_id,
+            ))
+
+    async def _run_direct_turn(
+        self, msg: InboundMessage, future: asyncio.Future, on_text: StreamCallback | None
+    ) -> None:
+        """Run a process_direct() turn taken from the bus, handing the result back."""
+        try:
+            response = await self._process_serialized(msg, on_text)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(response)
+
+    async def _process_cancellable(
+        self, msg: InboundMessage, on_text: StreamCallback | None = None
+    ) -> OutboundMessage | None:
+        """
+        Run a channel turn in its own task so that a newer message can cancel it.
+
+        Returns None if the turn was superseded (see _supersede).
+        """
+        key = self._turn_key(msg)
+        task = asyncio.create_task(self._process_serialized(msg, on_text))
+        self._active_turns[key] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not task.cancelled() or asyncio.current_task().cancelling():
+                raise  # we are being cancelled ourselves
+            logger.info(f"Turn for {key} superseded by a newer message")
+            return None
+        finally:
+            if self._active_turns.get(key) is task:
+                del self._active_turns[key]
+
+    def _supersede(self, priority: str, key: str) -> None:
+        """Cancel a session's running turn when the user sent another message (bus hook)."""
+        task = self._active_turns.get(key)
+        if priority == PRIORITY_INTERACTIVE and task and not task.done():
+            task.cancel()
+
+    def _stream_publisher(self, channel: str, chat_id: str, stream_id: str) -> StreamCallback:
+        """Publish in-progress reply text as partial outbound messages, coalesced in time."""
+        last_sent = 0.0
+
+        async def publish(text: str) -> None:
+            nonlocal last_sent
+            now = time.monotonic()
+            if now - last_sent < STREAM_PUBLISH_INTERVAL:
+                return
+            last_sent = now
+            self.bus.publish_partial(OutboundMessage(
+                channel=channel,
+                chat_id=chat_id,
+                content=text,
+                stream_id=stream_id,
+                is_partial=True,
+            ))
+
+        return publish
+
+    async def _process_serialized(
+        self, msg: InboundMessage, on_text: StreamCallback | None = None
+    ) -> OutboundMessage | None:
+        """Run _process_message holding the session's lock and a global turn slot."""
+        key = self._turn_key(msg)
+        lock = self._session_locks.setdefault(key, asyncio.Lock())
+        self._session_lock_refs[key] = self._session_lock_refs.get(key, 0) + 1
+        try:
+            async with lock:
+                async with self._turn_slots:
+                    return await self._process_message(msg, on_text)
+        finally:
+            self._session_lock_refs[key] -= 1
+            if self._session_lock_refs[key] == 0:
+                del self._session_lock_refs[key]
+                del self._session_locks[key]
+
+    @staticmethod
+    def _turn_key(msg: InboundMessage) -> str:
+        """Session that a message's turn mutates (system announces use their origin)."""
+        return turn_key(msg)
     
     def stop(self) -> None:
-        """Stop the agent loop."""
+        """Stop the agent loop; process_direct() calls still queued fail instead of waiting forever."""
         self._running = False
+        for future, _ in self._direct_turns.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Agent loop stopped before the message was processed"))
+        self._direct_turns.clear()
         logger.info("Agent loop stopping")
     
-    async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    async def _process_message(
+        self, msg: InboundMessage, on_text: StreamCallback | None = None
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
+            on_text: Optional callback receiving reply text as it streams in.
         
         Returns:
             The response message, or None if no response needed.
@@ -177,13 +388,24 @@ class AgentLoop:
             logger.warning(f"Rate limited: {msg.session_key} — {limit_msg}")
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content=limit_msg)
 
+        set_scope(
+            msg.session_key,
+            msg.channel,
+            msg.metadata.get("usage_source", TURN),
+            msg.metadata.get("usage_label", ""),
+        )
+        budget_msg = await self._budget_exceeded(msg.session_key)
+        if budget_msg:
+            logger.warning(f"Token budget exhausted: {msg.session_key}")
+            return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content=budget_msg)
+
         preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
         # Get or create session
         session = self.sessions.get_or_create(msg.session_key)
         
-        # Update tool contexts
+        # Update tool contexts (scoped to this turn's task)
         message_tool = self.tools.get("message")
         if isinstance(message_tool, MessageTool):
             message_tool.set_context(msg.channel, msg.chat_id)
@@ -196,9 +418,9 @@ class AgentLoop:
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(msg.channel, msg.chat_id)
         
-        # Build initial messages (use get_history for LLM-formatted messages)
-        messages = self.context.build_messages(
-            history=session.get_history(),
+        # Build initial messages (history packed into the context budget)
+        messages = self._build_turn_messages(
+            session,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
@@ -208,56 +430,63 @@ class AgentLoop:
         # Agent loop
         iteration = 0
         final_content = None
+        tools_called: list[str] = []
         
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
+        try:
+            while iteration < self.max_iterations:
+                iteration += 1
                 
-                # Execute tools with rate limiting
-                for tool_call in response.tool_calls:
-                    # Check rate limit for this tool type
-                    rate_op = _TOOL_RATE_MAP.get(tool_call.name)
-                    if rate_op and not self.rate_limiter.check(msg.session_key, rate_op):
-                        result = self.rate_limiter.get_limit_message(rate_op)
-                        logger.warning(f"Rate limited tool: {tool_call.name} for {msg.session_key}")
-                    else:
-                        args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                        logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                        result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    # Sanitize tool result before adding to LLM context
-                    result = sanitize_tool_result(result)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+                # The budget may run out in the middle of a turn
+                if iteration > 1:
+                    budget_msg = await self._budget_exceeded(msg.session_key)
+                    if budget_msg:
+                        final_content = budget_msg
+                        break
+
+                # Call LLM
+                response = await self._chat(messages, on_text)
+
+                # Handle tool calls
+                if response.has_tool_calls:
+                    # Add assistant message with tool calls
+                    tool_call_dicts = [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json.dumps(tc.arguments)  # Must be JSON string
+                            }
+                        }
+                        for tc in response.tool_calls
+                    ]
+                    messages = self.context.add_assistant_message(
+                        messages, response.content, tool_call_dicts,
+                        reasoning_content=response.reasoning_content,
                     )
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                break
+
+                    # Execute tools with rate limiting (read-only ones may fan out)
+                    async def run_tool(tool_call: ToolCallRequest) -> str:
+                        return await self._execute_tool(tool_call, msg.session_key)
+
+                    tools_called.extend(tc.name for tc in response.tool_calls)
+                    results = await self.tools.execute_calls(
+                        response.tool_calls, run_tool, self.max_parallel_tool_calls
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
+                        messages = self.context.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                else:
+                    # No tool calls, we're done
+                    final_content = response.content
+                    break
+        except asyncio.CancelledError:
+            # Superseded by a newer message: record the turn so the next one knows about it
+            session.add_message("user", msg.content)
+            session.add_message("assistant", _interrupted_note(tools_called))
+            self._save_session(session)
+            raise
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -269,7 +498,7 @@ class AgentLoop:
         # Save to session
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._save_session(session)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -277,6 +506,113 @@ class AgentLoop:
             content=final_content
         )
     
+    async def _budget_exceeded(self, session_key: str) -> str | None:
+        """Reply for a session that used up its token budget, or None if it has tokens left."""
+        if not self.session_token_budget:
+            return None
+        since = time.time() - self.budget_window_h * 3600
+        used = await asyncio.to_thread(self.usage.session_tokens, session_key, since)
+        if used < self.session_token_budget:
+            return None
+        return (
+            f"This conversation has used its token budget ({self.session_token_budget:,} tokens "
+            f"per {self.budget_window_h:g}h). Please try again later."
+        )
+
+    def _build_turn_messages(
+        self,
+        session: Session,
+        current_message: str,
+        media: list[str] | None = None,
+        channel: str | None = None,
+        chat_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Build the turn's messages, packing history into the token budget if enabled."""
+        if self.packer is None:
+            return self.context.build_messages(
+                history=session.get_history(),
+                current_message=current_message,
+                media=media,
+                channel=channel,
+                chat_id=chat_id,
+                summary=session.summary,
+            )
+
+        messages = self.context.build_messages(
+            history=[],
+            current_message=current_message,
+            media=media,
+            channel=channel,
+            chat_id=chat_id,
+            summary=session.summary,
+        )
+        history = self.packer.pack(
+            session.messages, messages, self.tools.get_definitions(), session.key
+        )
+        # build_messages emits [system, current]; history goes in between
+        return messages[:1] + history + messages[1:]
+
+    def _save_session(self, session: Session) -> None:
+        """Persist a session after a turn and compact it if it grew too long."""
+        self.sessions.save(session)
+        if self.compactor:
+            self.compactor.maybe_compact(session)
+
+    async def _chat(
+        self, messages: list[dict[str, Any]], on_text: StreamCallback | None = None
+    ) -> LLMResponse:
+        """Call the LLM, streaming the text generated so far to on_text when given."""
+        if on_text is None:
+            response = await self.provider.chat(
+                messages=messages,
+                tools=self.tools.get_definitions(),
+                model=self.model,
+                max_tokens=self.max_tokens,
+            )
+            self._log_cache_usage(response)
+            return response
+
+        text = ""
+        response: LLMResponse | None = None
+        # aclosing: a cancelled turn closes the provider's stream right away
+        async with aclosing(self.provider.stream_chat(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=self.model,
+            max_tokens=self.max_tokens,
+        )) as stream:
+            async for delta in stream:
+                if delta.content:
+                    text += delta.content
+                    await on_text(text)
+                if delta.response is not None:
+                    response = delta.response
+        response = response or LLMResponse(content=text or None)
+        self._log_cache_usage(response)
+        return response
+
+    @staticmethod
+    def _log_cache_usage(response: LLMResponse) -> None:
+        """Log provider prompt cache hits for an LLM call."""
+        cached = response.usage.get("cached_tokens", 0)
+        if cached:
+            prompt = response.usage.get("prompt_tokens", 0)
+            logger.debug(f"Prompt cache hit: {cached}/{prompt} prompt tokens")
+
+    async def _execute_tool(self, tool_call: ToolCallRequest, session_key: str) -> str:
+        """Execute one tool call with rate limiting; returns the sanitized result."""
+        # Check rate limit for this tool type
+        rate_op = _TOOL_RATE_MAP.get(tool_call.name)
+        if rate_op and not self.rate_limiter.check(session_key, rate_op):
+            result = self.rate_limiter.get_limit_message(rate_op)
+            logger.warning(f"Rate limited tool: {tool_call.name} for {session_key}")
+        else:
+            args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+            logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+            result = await self.tools.execute(tool_call.name, tool_call.arguments)
+        # Sanitize tool result before adding to LLM context
+        return sanitize_tool_result(result)
+
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a system message (e.g., subagent announce).
@@ -299,8 +635,9 @@ class AgentLoop:
         # Use the origin session for context
         session_key = f"{origin_channel}:{origin_chat_id}"
         session = self.sessions.get_or_create(session_key)
+        set_scope(session_key, origin_channel, SYSTEM)
         
-        # Update tool contexts
+        # Update tool contexts (scoped to this turn's task)
         message_tool = self.tools.get("message")
         if isinstance(message_tool, MessageTool):
             message_tool.set_context(origin_channel, origin_chat_id)
@@ -314,8 +651,8 @@ class AgentLoop:
             cron_tool.set_context(origin_channel, origin_chat_id)
         
         # Build messages with the announce content
-        messages = self.context.build_messages(
-            history=session.get_history(),
+        messages = self._build_turn_messages(
+            session,
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
@@ -331,7 +668,8 @@ class AgentLoop:
             response = await self.provider.chat(
                 messages=messages,
                 tools=self.tools.get_definitions(),
-                model=self.model
+                model=self.model,
+                max_tokens=self.max_tokens,
             )
             
             if response.has_tool_calls:
@@ -351,10 +689,15 @@ class AgentLoop:
                     reasoning_content=response.reasoning_content,
                 )
                 
-                for tool_call in response.tool_calls:
+                async def run_tool(tool_call: ToolCallRequest) -> str:
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    return await self.tools.execute(tool_call.name, tool_call.arguments)
+
+                results = await self.tools.execute_calls(
+                    response.tool_calls, run_tool, self.max_parallel_tool_calls
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -368,7 +711,7 @@ class AgentLoop:
         # Save to session (mark as system message in history)
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self._save_session(session)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -382,15 +725,22 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        on_text: StreamCallback | None = None,
+        priority: str | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
         
+        While run() is active the turn is queued on the bus like any other
+        message, so it is scheduled fairly against channel traffic.
+
         Args:
             content: The message content.
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            on_text: Optional callback receiving reply text as it streams in.
+            priority: Scheduling class when queued (see bus.scheduler.PRIORITIES).
         
         Returns:
             The agent's response.
@@ -399,8 +749,19 @@ class AgentLoop:
             channel=channel,
             sender_id="user",
             chat_id=chat_id,
-            content=content
+            content=content,
+            # Usage accounting: cron jobs and heartbeats are told apart by priority
+            metadata={"usage_source": priority or DIRECT, "usage_label": session_key},
         )
         
-        response = await self._process_message(msg)
+        if self._running:
+            future = asyncio.get_running_loop().create_future()
+            self._direct_turns[id(msg)] = (future, on_text)
+            try:
+                await self.bus.inbound.put(msg, priority)
+                response = await future
+            finally:
+                self._direct_turns.pop(id(msg), None)
+        else:
+            response = await self._process_serialized(msg, on_text)
         return response.content if response else ""
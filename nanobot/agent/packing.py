@@ -0,0 +1,134 @@
+"""Token-aware packing of session history into the model's context window."""
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+from nanobot.session.base import Message
+
+# Framing tokens each chat message costs on top of its content (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Flat estimate for an attached image (actual cost depends on size and provider)
+IMAGE_TOKENS = 1000
+
+# Recently counted prompt texts (system prompt, tool schemas) kept by content
+MAX_CACHED_TEXTS = 16
+
+
+def stored_message_tokens(provider: LLMProvider, model: str, message: Message) -> int:
+    """Token count of a stored session message, cached on the message per model."""
+    tokens = message.tokens or {}
+    if model not in tokens:
+        # Replaced rather than updated in place: the session flusher may be encoding it
+        tokens = {**tokens, model: MESSAGE_OVERHEAD_TOKENS + provider.count_tokens(message.content, model)}
+        message.tokens = tokens
+    return tokens[model]
+
+
+class ContextPacker:
+    """
+    Packs session history into a token budget.
+
+    The budget is the model's context window minus what every request needs
+    anyway: the system prompt, the current message, the tool definitions and
+    the reply (max_tokens). History is then filled from the newest message
+    backwards until the budget runs out.
+
+    Token counts of history messages are cached on the session messages
+    themselves (Message.tokens, keyed by model), so each message is only
+    tokenized once per model and the counts persist with the session.
+    """
+
+    def __init__(self, provider: LLMProvider, model: str, context_window: int, max_tokens: int):
+        self.provider = provider
+        self.model = model
+        self.context_window = context_window
+        self.max_tokens = max_tokens
+        self._text_counts: OrderedDict[str, int] = OrderedDict()
+
+    def count_text(self, text: str) -> int:
+        """Token count of a prompt text, memoized for recently seen texts."""
+        if text in self._text_counts:
+            self._text_counts.move_to_end(text)
+            return self._text_counts[text]
+        count = self.provider.count_tokens(text, self.model)
+        self._text_counts[text] = count
+        while len(self._text_counts) > MAX_CACHED_TEXTS:
+            self._text_counts.popitem(last=False)
+        return count
+
+    def count_message(self, message: dict[str, Any]) -> int:
+        """Token count of an LLM message (text parts, images, tool calls)."""
+        content = message.get("content")
+        total = MESSAGE_OVERHEAD_TOKENS
+        if isinstance(content, str):
+            total += self.count_text(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    total += IMAGE_TOKENS
+                else:
+                    total += self.count_text(part.get("text", ""))
+        if message.get("tool_calls"):
+            total += self.count_text(json.dumps(message["tool_calls"]))
+        return total
+
+    def count_messages(self, messages: list[dict[str, Any]]) -> int:
+        """Token count of a list of LLM messages."""
+        return sum(self.count_message(m) for m in messages)
+
+    def count_tools(self, tools: list[dict[str, Any]]) -> int:
+        """Token count of the tool definitions sent with each request."""
+        return self.count_text(json.dumps(tools)) if tools else 0
+
+    def history_tokens(self, message: Message) -> int:
+        """Token count of a stored session message, cached on the message."""
+        return stored_message_tokens(self.provider, self.model, message)
+
+    def pack(
+        self,
+        session_messages: list[Message],
+        prompt_messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        session_key: str = "",
+    ) -> list[dict[str, Any]]:
+        """
+        Select the newest history that fits next to the prompt.
+
+        Args:
+            session_messages: Stored session messages, oldest first.
+            prompt_messages: Messages sent regardless of history (system + current).
+            tools: Tool definitions sent with the request.
+            session_key: Session key, for logging.
+
+        Returns:
+            History in LLM format (role and content), oldest first.
+        """
+        reserved = self.count_messages(prompt_messages) + self.count_tools(tools or []) + self.max_tokens
+        budget = self.context_window - reserved
+
+        used = 0
+        start = len(session_messages)
+        while start > 0:
+            tokens = self.history_tokens(session_messages[start - 1])
+            if used + tokens > budget:
+                break
+            used += tokens
+            start -= 1
+
+        # Don't open the history with a reply whose question was cut off
+        while start < len(session_messages) and session_messages[start].role != "user":
+            used -= self.history_tokens(session_messages[start])
+            start += 1
+
+        if start:
+            logger.debug(
+                f"Context packing for {session_key or 'session'}: dropped {start} oldest "
+                f"message(s), kept {len(session_messages) - start} (~{used} tokens, "
+                f"{reserved} reserved of {self.context_window})"
+            )
+        return [m.llm_dict() for m in session_messages[start:]]
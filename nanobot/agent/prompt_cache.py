@@ -0,0 +1,78 @@
+"""Change-tracking cache for system prompt sections."""
+
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# How long a shutil.which() result is trusted before re-checking
+WHICH_TTL_SECONDS = 30.0
+
+# (PATH, binary) -> (checked_at, available)
+_which_cache: dict[tuple[str, str], tuple[float, bool]] = {}
+
+
+def file_stamp(path: Path) -> tuple[str, int, int] | None:
+    """Fingerprint a file by (path, mtime, size); None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def cached_which(binary: str) -> bool:
+    """shutil.which() availability check, cached per PATH for a short TTL."""
+    key = (os.environ.get("PATH", ""), binary)
+    now = time.monotonic()
+    entry = _which_cache.get(key)
+    if entry and now - entry[0] < WHICH_TTL_SECONDS:
+        return entry[1]
+    available = shutil.which(binary) is not None
+    _which_cache[key] = (now, available)
+    return available
+
+
+class SectionCache:
+    """
+    Cache of rendered prompt sections.
+
+    Each section is stored with the fingerprint of its inputs (file stamps,
+    requirement availability, date...). A section is rebuilt only when its
+    fingerprint changes; hits and misses are counted per section.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[Any, Any]] = {}
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def get(self, name: str, fingerprint: Any, build: Callable[[], T]) -> T:
+        """Return the cached section, rebuilding it if its fingerprint changed."""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == fingerprint:
+            self._hits[name] = self._hits.get(name, 0) + 1
+            return entry[1]
+
+        self._misses[name] = self._misses.get(name, 0) + 1
+        value = build()
+        self._entries[name] = (fingerprint, value)
+        return value
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one cached section, or all of them."""
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Hit/miss counters per section."""
+        names = sorted(set(self._hits) | set(self._misses))
+        return {
+            name: {"hits": self._hits.get(name, 0), "misses": self._misses.get(name, 0)}
+            for name in names
+        }
@@ -3,226 +3,324 @@
 import json
 import os
 import re
-import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+import yaml
+
+from nanobot.agent.prompt_cache import cached_which, file_stamp
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---(?:\n|$)", re.DOTALL)
+
+
+@dataclass
+class SkillEntry:
+    """A skill in the index: parsed frontmatter plus where its body starts."""
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    stamp: tuple[str, int, int]  # (path, mtime, size) of SKILL.md when parsed
+    frontmatter: dict[str, Any] = field(default_factory=dict)
+    meta: dict[str, Any] = field(default_factory=dict)  # "nanobot" section of metadata
+    body_offset: int = 0
+
+    @property
+    def description(self) -> str:
+        return str(self.frontmatter.get("description") or self.name)
+
+    @property
+    def always(self) -> bool:
+        return bool(self.meta.get("always") or self.frontmatter.get("always"))
+
+    @property
+    def requires(self) -> dict[str, list[str]]:
+        return self.meta.get("requires") or {}
+
+
+def parse_frontmatter(content: str) -> tuple[dict[str, Any], int]:
+    """
+    Parse YAML frontmatter from markdown content.
+
+    Returns:
+        (frontmatter dict, offset where the body starts). Content without
+        frontmatter yields ({}, 0).
+    """
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return {}, 0
+
+    try:
+        data = yaml.safe_load(match.group(1))
+    except yaml.YAMLError:
+        data = None
+    if not isinstance(data, dict):
+        # Not valid YAML (e.g. unquoted colons): fall back to "key: value" lines
+        data = {}
+        for line in match.group(1).split("\n"):
+            if ":" in line:
+                key, value = line.split(":", 1)
+                data[key.strip()] = value.strip().strip('"\'')
+    return data, match.end()
+
 
 class SkillsLoader:
     """
     Loader for agent skills.
-    
+
     Skills are markdown files (SKILL.md) that teach the agent how to use
-    specific tools or perform certain tasks.
+    specific tools or perform certain tasks. Skills are kept in an index
+    (name -> parsed frontmatter). The skill directories are only listed
+    again when their mtime changes (a skill was added or removed); otherwise
+    an access just stats the indexed SKILL.md files and re-parses those whose
+    mtime/size changed.
     """
-    
+
     def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
-    
+        self._index: dict[str, SkillEntry] = {}
+        self._scan_key: tuple | None = None
+        self._pending_dirs: list[Path] = []  # skill directories without a SKILL.md at the last scan
+
+    def _dirs_key(self) -> tuple:
+        """Stamps of the directories whose listing the index depends on."""
+        return tuple(file_stamp(d) for d in (self.workspace_skills, self.builtin_skills, *self._pending_dirs))
+
+    def _refresh(self) -> dict[str, SkillEntry]:
+        """Bring the index up to date, re-scanning the directories only if they changed."""
+        if self._scan_key is not None and self._dirs_key() == self._scan_key:
+            for name, entry in self._index.items():
+                stamp = file_stamp(entry.path)
+                if stamp is None:
+                    break  # SKILL.md removed: a shadowed skill may take its place
+                if stamp != entry.stamp:
+                    self._index[name] = self._parse_skill(name, entry.path, entry.source, stamp)
+            else:
+                return self._index
+        return self._scan()
+
+    def _scan(self) -> dict[str, SkillEntry]:
+        """Re-scan the skill directories, re-parsing only changed SKILL.md files."""
+        index: dict[str, SkillEntry] = {}
+        pending: list[Path] = []
+        roots = (file_stamp(self.workspace_skills), file_stamp(self.builtin_skills))  # before listing them
+
+        # Workspace skills first (highest priority), then built-in
+        for source, root in (("workspace", self.workspace_skills), ("builtin", self.builtin_skills)):
+            if not root or not root.exists():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                if skill_dir.name in index or not skill_dir.is_dir():
+                    continue
+                skill_file = skill_dir / "SKILL.md"
+                stamp = file_stamp(skill_file)
+                if stamp is None:
+                    pending.append(skill_dir)
+                    continue
+                entry = self._index.get(skill_dir.name)
+                if entry is None or entry.stamp != stamp:
+                    entry = self._parse_skill(skill_dir.name, skill_file, source, stamp)
+                index[skill_dir.name] = entry
+
+        self._index = index
+        self._pending_dirs = pending
+        self._scan_key = roots + tuple(file_stamp(d) for d in pending)
+        return index
+
+    def _parse_skill(self, name: str, path: Path, source: str, stamp: tuple[str, int, int]) -> SkillEntry:
+        """Read and parse one SKILL.md into an index entry."""
+        content = path.read_text(encoding="utf-8")
+        frontmatter, body_offset = parse_frontmatter(content)
+        return SkillEntry(
+            name=name,
+            path=path,
+            source=source,
+            stamp=stamp,
+            frontmatter=frontmatter,
+            meta=self._parse_nanobot_metadata(frontmatter.get("metadata", "")),
+            body_offset=body_offset,
+        )
+
+    def fingerprint(self) -> tuple:
+        """
+        Fingerprint of everything the skills prompt sections depend on.
+
+        Covers every indexed SKILL.md (path, mtime, size) and the current
+        availability of each binary/env var requirement.
+        """
+        index = self._refresh()
+        bins = sorted({b for e in index.values() for b in e.requires.get("bins", [])})
+        env = sorted({v for e in index.values() for v in e.requires.get("env", [])})
+        return (
+            tuple(e.stamp for e in index.values()),
+            tuple((b, cached_which(b)) for b in bins),
+            tuple((v, bool(os.environ.get(v))) for v in env),
+        )
+
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
         List all available skills.
-        
+
         Args:
             filter_unavailable: If True, filter out skills with unmet requirements.
-        
+
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
-    
+        return [
+            {"name": e.name, "path": str(e.path), "source": e.source}
+            for e in self._refresh().values()
+            if not filter_unavailable or self._check_requirements(e.meta)
+        ]
+
     def load_skill(self, name: str) -> str | None:
         """
         Load a skill by name.
-        
+
         Args:
             name: Skill name (directory name).
-        
+
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
-    
+        entry = self._refresh().get(name)
+        if entry is None:
+            return None
+        try:
+            return entry.path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
         Load specific skills for inclusion in agent context.
-        
+
         Args:
             skill_names: List of skill names to load.
-        
+
         Returns:
             Formatted skills content.
         """
+        index = self._refresh()
         parts = []
         for name in skill_names:
-            content = self.load_skill(name)
-            if content:
-                content = self._strip_frontmatter(content)
-                parts.append(f"### Skill: {name}\n\n{content}")
-        
+            entry = index.get(name)
+            if entry is None:
+                continue
+            try:
+                content = entry.path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            body = content[entry.body_offset:].strip()
+            if body:
+                parts.append(f"### Skill: {name}\n\n{body}")
+
         return "\n\n---\n\n".join(parts) if parts else ""
-    
+
     def build_skills_summary(self) -> str:
         """
         Build a summary of all skills (name, description, path, availability).
-        
+
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
-        
+
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        index = self._refresh()
+        if not index:
             return ""
-        
+
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        
+
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
+        for entry in index.values():
+            missing = self._get_missing_requirements(entry.meta)
+            available = not missing
+
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
-            lines.append(f"    <name>{name}</name>")
-            lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
-            
+            lines.append(f"    <name>{escape_xml(entry.name)}</name>")
+            lines.append(f"    <description>{escape_xml(entry.description)}</description>")
+            lines.append(f"    <location>{entry.path}</location>")
+
             # Show missing requirements for unavailable skills
             if not available:
-                missing = self._get_missing_requirements(skill_meta)
-                if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
-            
+                lines.append(f"    <requires>{escape_xml(missing)}</requires>")
+
             lines.append(f"  </skill>")
         lines.append("</skills>")
-        
+
         return "\n".join(lines)
-    
+
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not cached_which(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 missing.append(f"ENV: {env}")
         return ", ".join(missing)
-    
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
-    
+
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
-        if content.startswith("---"):
-            match = re.match(r"^---\n.*?\n---\n", content, re.DOTALL)
-            if match:
-                return content[match.end():].strip()
-        return content
-    
-    def _parse_nanobot_metadata(self, raw: str) -> dict:
-        """Parse nanobot metadata JSON from frontmatter."""
-        try:
-            data = json.loads(raw)
-            return data.get("nanobot", {}) if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, TypeError):
+        _, body_offset = parse_frontmatter(content)
+        return content[body_offset:].strip() if body_offset else content
+
+    def _parse_nanobot_metadata(self, raw: Any) -> dict:
+        """Parse nanobot metadata from frontmatter (a mapping, or a JSON string)."""
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                return {}
+        if not isinstance(raw, dict):
             return {}
-    
+        nanobot = raw.get("nanobot", {})
+        return nanobot if isinstance(nanobot, dict) else {}
+
     def _check_requirements(self, skill_meta: dict) -> bool:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not cached_which(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 return False
         return True
-    
+
     def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-    
+        """Get nanobot metadata for a skill."""
+        entry = self._refresh().get(name)
+        return entry.meta if entry else {}
+
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
-    
+        return [
+            e.name for e in self._refresh().values()
+            if e.always and self._check_requirements(e.meta)
+        ]
+
     def get_skill_metadata(self, name: str) -> dict | None:
         """
         Get metadata from a skill's frontmatter.
-        
+
         Args:
             name: Skill name.
-        
+
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
+        entry = self._refresh().get(name)
+        if entry is None or not entry.frontmatter:
             return None
-        
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        return entry.frontmatter
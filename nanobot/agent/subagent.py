@@ -10,7 +10,9 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, ToolCallRequest
+from nanobot.providers.cache import no_cache
+from nanobot.usage.scope import SUBAGENT, set_scope
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
@@ -38,6 +40,7 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        max_parallel_tool_calls: int = 1,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -47,6 +50,7 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_parallel_tool_calls = max_parallel_tool_calls
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -101,6 +105,8 @@ class SubagentManager:
     ) -> None:
         """Execute the subagent task and announce the result."""
         logger.info(f"Subagent [{task_id}] starting task: {label}")
+        # Usage counts towards the session that spawned the subagent
+        set_scope(f"{origin['channel']}:{origin['chat_id']}", origin["channel"], SUBAGENT, task_id)
         
         try:
             # Build subagent tools (no message tool, no spawn tool)
@@ -132,11 +138,13 @@ class SubagentManager:
             while iteration < max_iterations:
                 iteration += 1
                 
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                )
+                # Background tasks are one-off work: always ask the model afresh
+                with no_cache():
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=tools.get_definitions(),
+                        model=self.model,
+                    )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
@@ -157,11 +165,16 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
-                    for tool_call in response.tool_calls:
+                    # Execute tools (read-only ones may fan out)
+                    async def run_tool(tool_call: ToolCallRequest) -> str:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                        return await tools.execute(tool_call.name, tool_call.arguments)
+
+                    results = await tools.execute_calls(
+                        response.tool_calls, run_tool, self.max_parallel_tool_calls
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
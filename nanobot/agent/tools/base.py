@@ -39,6 +39,16 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
     
+    @property
+    def read_only(self) -> bool:
+        """
+        Whether the tool has no side effects.
+
+        Read-only calls may run concurrently with each other; all other
+        calls run one at a time in the order the LLM requested them.
+        """
+        return False
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
@@ -1,24 +1,26 @@
 """Cron tool for scheduling reminders and tasks."""
 
+from contextvars import ContextVar
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
 from nanobot.cron.service import CronService
 from nanobot.cron.types import CronSchedule
 
+# Session of the current turn; scoped per asyncio task so concurrent turns schedule
+# for their own session
+_context: ContextVar[tuple[str, str]] = ContextVar("cron_tool_context", default=("", ""))
+
 
 class CronTool(Tool):
     """Tool to schedule reminders and recurring tasks."""
     
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        """Set the session context for delivery in the current turn."""
+        _context.set((channel, chat_id))
     
     @property
     def name(self) -> str:
@@ -79,7 +81,8 @@ class CronTool(Tool):
     def _add_job(self, message: str, every_seconds: int | None, cron_expr: str | None) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = _context.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
 
         # Max jobs limit
@@ -110,8 +113,8 @@ class CronTool(Tool):
             schedule=schedule,
             message=message,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
         )
         return f"Created job '{job.name}' (id: {job.id})"
     
@@ -28,6 +28,10 @@ class ReadFileTool(Tool):
     def name(self) -> str:
         return "read_file"
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def description(self) -> str:
         return "Read the contents of a file at the given path."
@@ -195,6 +199,10 @@ class ListDirTool(Tool):
     def name(self) -> str:
         return "list_dir"
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def description(self) -> str:
         return "List the contents of a directory."
@@ -1,9 +1,15 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Sequence
 
 from nanobot.agent.tools.base import Tool
 
+if TYPE_CHECKING:
+    from nanobot.providers.base import ToolCallRequest
+
 
 class ToolRegistry:
     """
@@ -61,6 +67,55 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    async def execute_calls(
+        self,
+        calls: Sequence[ToolCallRequest],
+        run: Callable[[ToolCallRequest], Awaitable[str]] | None = None,
+        max_concurrency: int = 1,
+    ) -> list[str]:
+        """
+        Execute the tool calls from one LLM response.
+
+        With max_concurrency > 1, consecutive read-only calls run concurrently
+        (at most max_concurrency at a time). Any other call waits for all calls
+        before it and blocks all calls after it, so side effects keep their order.
+
+        Args:
+            calls: Tool calls in the order the LLM returned them.
+            run: Coroutine executing a single call (defaults to self.execute).
+            max_concurrency: Maximum read-only calls in flight; 1 means sequential.
+
+        Returns:
+            Results in the same order as calls.
+        """
+        run = run or (lambda tc: self.execute(tc.name, tc.arguments))
+        results: list[str] = [""] * len(calls)
+
+        if max_concurrency <= 1:
+            for i, tc in enumerate(calls):
+                results[i] = await run(tc)
+            return results
+
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def run_at(i: int, tc: ToolCallRequest) -> None:
+            async with slots:
+                results[i] = await run(tc)
+
+        batch: list[Awaitable[None]] = []
+        for i, tc in enumerate(calls):
+            tool = self._tools.get(tc.name)
+            if tool and tool.read_only:
+                batch.append(run_at(i, tc))
+                continue
+            if batch:
+                await asyncio.gather(*batch)
+                batch = []
+            results[i] = await run(tc)
+        if batch:
+            await asyncio.gather(*batch)
+        return results
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -100,6 +100,10 @@ class ExecTool(Tool):
             except asyncio.TimeoutError:
                 process.kill()
                 return f"Error: Command timed out after {self.timeout} seconds"
+            except asyncio.CancelledError:
+                # The turn was cancelled: don't leave the command running
+                process.kill()
+                raise
 
             output_parts = []
 
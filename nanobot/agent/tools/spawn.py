@@ -1,5 +1,6 @@
 """Spawn tool for creating background subagents."""
 
+from contextvars import ContextVar
 from typing import Any, TYPE_CHECKING
 
 from nanobot.agent.tools.base import Tool
@@ -7,6 +8,10 @@ from nanobot.agent.tools.base import Tool
 if TYPE_CHECKING:
     from nanobot.agent.subagent import SubagentManager
 
+# Origin of the current turn; scoped per asyncio task so concurrent turns announce
+# to their own origin
+_origin: ContextVar[tuple[str, str]] = ContextVar("spawn_tool_origin", default=("cli", "direct"))
+
 
 class SpawnTool(Tool):
     """
@@ -18,13 +23,10 @@ class SpawnTool(Tool):
     
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
+        """Set the origin context for subagent announcements in the current turn."""
+        _origin.set((channel, chat_id))
     
     @property
     def name(self) -> str:
@@ -58,9 +60,10 @@ class SpawnTool(Tool):
     
     async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
         """Spawn a subagent to execute the given task."""
+        origin_channel, origin_chat_id = _origin.get()
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=origin_channel,
+            origin_chat_id=origin_chat_id,
         )
@@ -1,6 +1,6 @@
 """Event types for the message bus."""
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any
 
@@ -16,6 +16,7 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    spool_id: int | None = field(default=None, repr=False, compare=False)  # Set while held in a BusSpool
     
     @property
     def session_key(self) -> str:
@@ -33,5 +34,27 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    stream_id: str | None = None  # Groups the progressive updates of one streamed reply
+    is_partial: bool = False  # In-progress stream update; content is the text so far
+    spool_id: int | None = field(default=None, repr=False, compare=False)  # Set while held in a BusSpool
 
 
+
+
+def message_to_dict(msg: InboundMessage | OutboundMessage) -> dict[str, Any]:
+    """JSON-ready dict of a bus message (without its spool id)."""
+    data = asdict(msg)
+    data.pop("spool_id", None)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    return data
+
+
+def inbound_from_dict(data: dict[str, Any]) -> InboundMessage:
+    """Rebuild an InboundMessage from message_to_dict() output."""
+    return InboundMessage(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
+
+def outbound_from_dict(data: dict[str, Any]) -> OutboundMessage:
+    """Rebuild an OutboundMessage from message_to_dict() output."""
+    return OutboundMessage(**data)
@@ -0,0 +1,125 @@
+"""Per-channel outbound lanes with their own queues and workers."""
+
+import asyncio
+import time
+import zlib
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+
+# Default bound on messages waiting in one lane
+MAX_LANE_QUEUE = 200
+
+# Send-latency samples kept per lane for percentiles
+LATENCY_SAMPLES = 512
+
+OutboundCallback = Callable[[OutboundMessage], Awaitable[None]]
+
+
+class OutboundLane:
+    """
+    Delivers the outbound messages of one channel.
+
+    The lane has `workers` workers, each with its own bounded queue. A chat
+    always maps to the same worker, so messages to one chat (including the
+    partial updates of a streamed reply) are sent in order, while different
+    chats are sent concurrently. A slow send only holds up its own worker,
+    and a slow channel only its own lane.
+
+    A message counts as sent, and on_sent is called for it, only when every
+    callback succeeded; a failed one is counted in `failed` and, with a bus
+    spool, stays in the spool to be delivered again on the next start.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        workers: int = 1,
+        max_queue: int = MAX_LANE_QUEUE,
+        on_sent: Callable[[OutboundMessage], None] | None = None,
+    ):
+        self.channel = channel
+        self.callbacks: list[OutboundCallback] = []
+        self.on_sent = on_sent  # called after each successful send
+        workers = max(1, workers)
+        self._queues: list[asyncio.Queue[tuple[OutboundMessage, float]]] = [
+            asyncio.Queue(maxsize=max(1, max_queue // workers)) for _ in range(workers)
+        ]
+        self._tasks: list[asyncio.Task] = []
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._wait_total = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def _queue_for(self, msg: OutboundMessage) -> asyncio.Queue:
+        return self._queues[zlib.crc32(msg.chat_id.encode()) % len(self._queues)]
+
+    async def put(self, msg: OutboundMessage) -> None:
+        """Queue a message, waiting while its worker's queue is full."""
+        await self._queue_for(msg).put((msg, time.monotonic()))
+
+    def put_nowait(self, msg: OutboundMessage) -> bool:
+        """Queue a message if there is room; returns False (and counts a drop) if not."""
+        try:
+            self._queue_for(msg).put_nowait((msg, time.monotonic()))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        """Start the workers (idempotent)."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work(q)) for q in self._queues]
+
+    async def stop(self) -> None:
+        """Stop the workers; queued messages are discarded."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            msg, enqueued_at = await queue.get()
+            started = time.monotonic()
+            self._wait_total += started - enqueued_at
+            ok = True
+            for callback in self.callbacks:
+                try:
+                    await callback(msg)
+                except Exception as e:
+                    ok = False
+                    logger.error(f"Error sending to {self.channel}: {e}")
+            self._latencies.append(time.monotonic() - started)
+            if not ok:
+                self.failed += 1
+                continue
+            self.sent += 1
+            if self.on_sent:
+                self.on_sent(msg)
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting in the lane."""
+        return sum(q.qsize() for q in self._queues)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, counters and send latency (seconds)."""
+        latencies = sorted(self._latencies)
+        handled = self.sent + self.failed
+        return {
+            "depth": self.depth,
+            "workers": len(self._queues),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "wait_avg_s": self._wait_total / handled if handled else 0.0,
+            "send_avg_s": sum(latencies) / len(latencies) if latencies else 0.0,
+            "send_p95_s": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            "send_max_s": latencies[-1] if latencies else 0.0,
+        }
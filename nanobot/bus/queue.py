@@ -1,14 +1,18 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
-from typing import Callable, Awaitable
+from typing import Any, Awaitable, Callable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.lanes import MAX_LANE_QUEUE, OutboundLane
+from nanobot.bus.scheduler import FairQueue
+from nanobot.bus.spool import BusSpool
 
 # Queue bounds
 MAX_QUEUE_SIZE = 1000
+MAX_SESSION_QUEUE = 100  # inbound messages waiting per session
 PUT_TIMEOUT = 5.0  # seconds
 
 
@@ -17,69 +21,227 @@ class MessageBus:
     Async message bus that decouples chat channels from the agent core.
 
     Channels push messages to the inbound queue, and the agent processes
-    them and pushes responses to the outbound queue.
+    them and pushes responses to the outbound side. The inbound queue is
+    fair across sessions and priority classes (see FairQueue); responses are
+    delivered through one lane per subscribed channel (see OutboundLane).
+
+    Channel messages are coalesced per sender within `coalesce_ms` (see
+    FairQueue), so a burst of short messages or a photo album becomes one
+    turn.
+
+    With a BusSpool, inbound and final outbound messages are persisted
+    before they are queued and acknowledged once handled (see release_inbound
+    and OutboundLane.on_sent); a full queue then defers a message instead of
+    dropping it, and recover() replays what a previous run left unfinished.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+    def __init__(self, spool: BusSpool | None = None, coalesce_ms: int = 0):
+        self.inbound = FairQueue(
+            maxsize=MAX_QUEUE_SIZE, max_per_session=MAX_SESSION_QUEUE, coalesce_s=coalesce_ms / 1000
+        )
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
-        self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
+        self.spool = spool
+        self._lanes: dict[str, OutboundLane] = {}
+        self._deferred: set[asyncio.Task] = set()
         self._running = False
 
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent, with backpressure."""
+    async def _put(self, put: Awaitable[None]) -> bool:
+        """
+        Wait up to PUT_TIMEOUT for a queue put; False if it was given up.
+
+        With a spool the put is never given up: after the timeout it goes on
+        in the background and the publisher is released.
+        """
+        if self.spool is None:
+            try:
+                await asyncio.wait_for(put, timeout=PUT_TIMEOUT)
+                return True
+            except asyncio.TimeoutError:
+                return False
+        task = asyncio.ensure_future(put)
         try:
-            await asyncio.wait_for(self.inbound.put(msg), timeout=PUT_TIMEOUT)
+            await asyncio.wait_for(asyncio.shield(task), timeout=PUT_TIMEOUT)
         except asyncio.TimeoutError:
-            logger.warning("Inbound queue full, message dropped (backpressure)")
+            logger.warning("Bus queue full, message deferred (backpressure)")
+            self._defer(task)
+        return True
 
-    async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+    def _defer(self, put: Awaitable[None]) -> None:
+        """Finish a put in the background (the message is safe in the spool meanwhile)."""
+        task = asyncio.ensure_future(put)
+        self._deferred.add(task)
+        task.add_done_callback(self._deferred.discard)
+
+    def _ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        if self.spool is not None:
+            self.spool.ack(msg)
+
+    async def publish_inbound(self, msg: InboundMessage, priority: str | None = None) -> None:
+        """
+        Publish a message from a channel to the agent, with backpressure.
+
+        priority is one of scheduler.PRIORITIES; by default subagent announces
+        are "system" and everything else "interactive".
+        """
+        if self.spool is not None and msg.spool_id is None:
+            self.spool.append(msg)
+        if not await self._put(self._put_inbound(msg, priority)):
+            logger.warning(f"Inbound queue full for {msg.session_key}, message dropped (backpressure)")
+
+    async def _put_inbound(self, msg: InboundMessage, priority: str | None) -> None:
+        merged_into = await self.inbound.put(msg, priority, coalesce=True)
+        if merged_into is not None and self.spool is not None:
+            # The merged message now carries this one; keep only its spool row
+            self.spool.update(merged_into)
+            self.spool.ack(msg)
+
+    async def consume_inbound(self, hold: bool = False) -> InboundMessage:
+        """
+        Consume the next inbound message (blocks until available).
+
+        With hold=True the message's session is not served again until
+        release_inbound() is called for it (which also acknowledges it);
+        otherwise it is acknowledged right away.
+        """
+        msg = await self.inbound.get(hold=hold)
+        if not hold:
+            self._ack(msg)
+        return msg
+
+    async def release_inbound(self, msg: InboundMessage) -> None:
+        """Mark the turn for a message consumed with hold=True as finished."""
+        await self.inbound.release(msg)
+        self._ack(msg)
+
+    def inbound_stats(self) -> dict[str, dict[str, float]]:
+        """Inbound queue depth and wait times per priority class."""
+        return self.inbound.stats()
 
     async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels, with backpressure."""
+        """
+        Publish a response from the agent to channels, with backpressure.
+
+        Messages for a channel with an outbound lane go straight to that lane,
+        so a full lane only holds up publishers to that channel.
+        """
+        if self.spool is not None and msg.spool_id is None:
+            self.spool.append(msg)
+        lane = self._lanes.get(msg.channel)
+        if not await self._put(lane.put(msg) if lane else self.outbound.put(msg)):
+            if lane:
+                lane.dropped += 1
+            logger.warning(f"Outbound queue for {msg.channel} full, message dropped (backpressure)")
+
+    def publish_partial(self, msg: OutboundMessage) -> None:
+        """
+        Publish an in-progress stream update without waiting.
+
+        Partial updates are superseded by later ones and by the final reply,
+        so they are dropped rather than applying backpressure when the queue is full.
+        """
+        lane = self._lanes.get(msg.channel)
+        if lane:
+            lane.put_nowait(msg)
+            return
         try:
-            await asyncio.wait_for(self.outbound.put(msg), timeout=PUT_TIMEOUT)
-        except asyncio.TimeoutError:
-            logger.warning("Outbound queue full, message dropped (backpressure)")
+            self.outbound.put_nowait(msg)
+        except asyncio.QueueFull:
+            pass
 
     async def consume_outbound(self) -> OutboundMessage:
-        """Consume the next outbound message (blocks until available)."""
-        return await self.outbound.get()
+        """Consume the next outbound message for a channel without a lane (blocks until available)."""
+        msg = await self.outbound.get()
+        self._ack(msg)
+        return msg
 
     def subscribe_outbound(
         self,
         channel: str,
-        callback: Callable[[OutboundMessage], Awaitable[None]]
+        callback: Callable[[OutboundMessage], Awaitable[None]],
+        workers: int = 1,
+        max_queue: int = MAX_LANE_QUEUE,
     ) -> None:
-        """Subscribe to outbound messages for a specific channel."""
-        if channel not in self._outbound_subscribers:
-            self._outbound_subscribers[channel] = []
-        self._outbound_subscribers[channel].append(callback)
+        """
+        Subscribe to outbound messages for a specific channel.
+
+        The first subscription creates the channel's OutboundLane with
+        `workers` concurrent senders (per-chat order is kept) and a queue of
+        `max_queue` messages; dispatch_outbound() runs it.
+        """
+        lane = self._lanes.get(channel)
+        if lane is None:
+            lane = self._lanes[channel] = OutboundLane(
+                channel, workers=workers, max_queue=max_queue, on_sent=self._ack
+            )
+            if self._running:
+                lane.start()
+        lane.callbacks.append(callback)
 
     async def dispatch_outbound(self) -> None:
         """
-        Dispatch outbound messages to subscribed channels.
-        Run this as a background task.
+        Run the outbound lanes of all subscribed channels.
+
+        Also routes messages queued for a channel before it subscribed, and
+        drops those for channels nobody subscribed to. Run this as a
+        background task; it returns (stopping the lanes) after stop().
         """
         self._running = True
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
-                    try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
-            except asyncio.TimeoutError:
-                continue
+        for lane in self._lanes.values():
+            lane.start()
+        try:
+            while self._running:
+                try:
+                    msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                lane = self._lanes.get(msg.channel)
+                if lane is None:
+                    logger.warning(f"Unknown channel: {msg.channel}")
+                    self._ack(msg)
+                elif self.spool is not None and msg.spool_id is not None:
+                    self._defer(lane.put(msg))
+                elif not lane.put_nowait(msg):
+                    logger.warning(f"Outbound queue for {msg.channel} full, message dropped (backpressure)")
+        finally:
+            self._running = False
+            await asyncio.gather(*(lane.stop() for lane in self._lanes.values()))
 
     def stop(self) -> None:
         """Stop the dispatcher loop."""
         self._running = False
 
+    def recover(self) -> int:
+        """
+        Replay the messages a previous run accepted but never finished.
+
+        Inbound messages are queued for the agent again, outbound ones for
+        their channel (in the background, in their original order).
+        Returns the number of messages replayed.
+        """
+        if self.spool is None:
+            return 0
+        pending = self.spool.pending()
+        inbound = [m for m in pending if isinstance(m, InboundMessage)]
+        outbound = [m for m in pending if isinstance(m, OutboundMessage)]
+
+        async def replay_inbound() -> None:
+            for msg in inbound:
+                await self.inbound.put(msg)
+
+        async def replay_outbound() -> None:
+            for msg in outbound:
+                await self.outbound.put(msg)
+
+        self._defer(replay_inbound())
+        self._defer(replay_outbound())
+        if pending:
+            logger.info(f"Replaying {len(inbound)} inbound and {len(outbound)} outbound messages from the spool")
+        return len(pending)
+
+    def outbound_stats(self) -> dict[str, dict[str, Any]]:
+        """Queue depth, counters and send latency per outbound lane."""
+        return {channel: lane.stats() for channel, lane in self._lanes.items()}
+
     @property
     def inbound_size(self) -> int:
         """Number of pending inbound messages."""
@@ -87,5 +249,5 @@ class MessageBus:
 
     @property
     def outbound_size(self) -> int:
-        """Number of pending outbound messages."""
-        return self.outbound.qsize()
+        """Number of pending outbound messages (including those in lanes)."""
+        return self.outbound.qsize() + sum(lane.depth for lane in self._lanes.values())
@@ -0,0 +1,250 @@
+"""Fair scheduling of inbound messages across sessions and priority classes."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from nanobot.bus.events import InboundMessage
+
+# Priority classes, highest first. A class is only served while every
+# higher one has nothing ready.
+PRIORITY_INTERACTIVE = "interactive"  # users talking to the bot
+PRIORITY_SYSTEM = "system"  # subagent result announces
+PRIORITY_CRON = "cron"
+PRIORITY_HEARTBEAT = "heartbeat"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_SYSTEM, PRIORITY_CRON, PRIORITY_HEARTBEAT)
+
+# Deficit round robin: every visit credits a session one quantum; a message
+# costs one quantum per COST_UNIT_CHARS of content (at least one)
+COST_UNIT_CHARS = 4000
+
+# Wait-time samples kept per class for percentiles
+WAIT_SAMPLES = 512
+
+# A burst keeps being coalesced for at most this many windows after its first message
+COALESCE_MAX_WINDOWS = 4
+
+
+def turn_key(msg: InboundMessage) -> str:
+    """Session that a message's turn belongs to (system announces use their origin)."""
+    if msg.channel == "system" and ":" in msg.chat_id:
+        return msg.chat_id
+    return msg.session_key
+
+
+def default_priority(msg: InboundMessage) -> str:
+    """Priority class of a message published without an explicit one."""
+    return PRIORITY_SYSTEM if msg.channel == "system" else PRIORITY_INTERACTIVE
+
+
+def _can_merge(queued: InboundMessage, msg: InboundMessage) -> bool:
+    """Whether `msg` may be folded into a queued message of the same session."""
+    return queued.channel != "system" and queued.sender_id == msg.sender_id
+
+
+def _merge(queued: InboundMessage, msg: InboundMessage) -> None:
+    """Fold `msg` into `queued`: contents joined by newlines, media and metadata combined."""
+    queued.content = "\n".join(c for c in (queued.content, msg.content) if c)
+    queued.media.extend(msg.media)
+    queued.metadata.update(msg.metadata)
+
+
+@dataclass
+class _Entry:
+    msg: InboundMessage
+    cost: int
+    enqueued_at: float
+    ready_at: float  # not served before this (coalescing window)
+
+
+@dataclass
+class _ClassStats:
+    served: int = 0
+    coalesced: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    samples: deque = field(default_factory=lambda: deque(maxlen=WAIT_SAMPLES))
+
+
+class FairQueue:
+    """
+    Inbound queue with one sub-queue per session.
+
+    Sessions within a priority class are served by deficit round robin, so
+    a session with a long backlog gets one turn per round like everyone
+    else instead of everything queued behind it. Classes are served in
+    strict priority order (see PRIORITIES). Messages of one session and
+    class stay in arrival order.
+
+    Consumers that process a session's messages one at a time get with
+    hold=True: that session is then skipped until release(), so a worker
+    slot is never spent waiting on a busy session. The queue is bounded
+    both in total and per session; put() waits for room.
+
+    With a coalescing window, messages put with coalesce=True are held for
+    `coalesce_s` after they arrive, and a message from the same sender that
+    arrives while the previous one is still queued (in its window, or
+    behind a running turn) is merged into it instead of becoming a turn of
+    its own. A burst is served at most COALESCE_MAX_WINDOWS windows after
+    its first message.
+
+    on_held_put, if set, is called with (priority, session) whenever a
+    message is queued for a held session, i.e. one whose turn is running.
+    """
+
+    def __init__(self, maxsize: int, max_per_session: int, coalesce_s: float = 0):
+        self.maxsize = maxsize
+        self.max_per_session = max_per_session
+        self.coalesce_s = coalesce_s
+        self._queues: dict[tuple[str, str], deque[_Entry]] = {}
+        self._rings: dict[str, deque[str]] = {p: deque() for p in PRIORITIES}
+        self._deficit: dict[tuple[str, str], int] = {}
+        self._per_session: dict[str, int] = {}
+        self._held: set[str] = set()
+        self.on_held_put: Callable[[str, str], None] | None = None
+        self._size = 0
+        self._changed = asyncio.Condition()
+        self._stats = {p: _ClassStats() for p in PRIORITIES}
+
+    def qsize(self) -> int:
+        return self._size
+
+    async def put(
+        self, msg: InboundMessage, priority: str | None = None, coalesce: bool = False
+    ) -> InboundMessage | None:
+        """
+        Queue a message, waiting while the queue or its session's sub-queue is full.
+
+        Returns the queued message `msg` was merged into, if it was coalesced
+        (see class docs), else None.
+        """
+        priority = priority or default_priority(msg)
+        if priority not in self._rings:
+            raise ValueError(f"Unknown priority class: {priority}")
+        key = turn_key(msg)
+        coalesce = coalesce and self.coalesce_s > 0
+        async with self._changed:
+            now = time.monotonic()
+            queue = self._queues.get((priority, key))
+            if coalesce and queue and _can_merge(queue[-1].msg, msg):
+                entry = queue[-1]
+                _merge(entry.msg, msg)
+                entry.cost = 1 + len(entry.msg.content) // COST_UNIT_CHARS
+                entry.ready_at = min(now + self.coalesce_s, entry.enqueued_at + COALESCE_MAX_WINDOWS * self.coalesce_s)
+                self._stats[priority].coalesced += 1
+                self._changed.notify_all()
+                self._notify_held(priority, key)
+                return entry.msg
+
+            await self._changed.wait_for(
+                lambda: self._size < self.maxsize and self._per_session.get(key, 0) < self.max_per_session
+            )
+            queue = self._queues.get((priority, key))
+            if queue is None:
+                queue = self._queues[(priority, key)] = deque()
+                self._deficit[(priority, key)] = 0
+                self._rings[priority].append(key)
+            cost = 1 + len(msg.content) // COST_UNIT_CHARS
+            now = time.monotonic()
+            queue.append(_Entry(msg, cost, now, now + self.coalesce_s if coalesce else now))
+            self._per_session[key] = self._per_session.get(key, 0) + 1
+            self._size += 1
+            self._changed.notify_all()
+        self._notify_held(priority, key)
+        return None
+
+    def _notify_held(self, priority: str, key: str) -> None:
+        if self.on_held_put and key in self._held:
+            self.on_held_put(priority, key)
+
+    async def get(self, hold: bool = False) -> InboundMessage:
+        """Take the next message by priority and fairness (see class docs)."""
+        async with self._changed:
+            while (picked := self._pick()) is None:
+                next_ready = self._next_ready()
+                if next_ready is None:
+                    await self._changed.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=max(0.0, next_ready - time.monotonic()))
+                except asyncio.TimeoutError:
+                    pass
+            priority, key, entry = picked
+            if hold:
+                self._held.add(key)
+            self._changed.notify_all()
+
+        wait = time.monotonic() - entry.enqueued_at
+        stats = self._stats[priority]
+        stats.served += 1
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+        stats.samples.append(wait)
+        return entry.msg
+
+    async def release(self, msg: InboundMessage) -> None:
+        """Let the session of a message taken with hold=True be served again."""
+        async with self._changed:
+            self._held.discard(turn_key(msg))
+            self._changed.notify_all()
+
+    def _ready(self, priority: str, key: str, now: float) -> bool:
+        return key not in self._held and self._queues[(priority, key)][0].ready_at <= now
+
+    def _next_ready(self) -> float | None:
+        """When the next waiting (coalescing) entry of a session that is not held becomes ready."""
+        times = [
+            queue[0].ready_at for (_, key), queue in self._queues.items() if key not in self._held
+        ]
+        return min(times) if times else None
+
+    def _pick(self) -> tuple[str, str, _Entry] | None:
+        """Pop the next ready entry, or None if nothing is ready."""
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            ring = self._rings[priority]
+            if not any(self._ready(priority, key, now) for key in ring):
+                continue
+            while True:
+                key = ring[0]
+                slot = (priority, key)
+                if not self._ready(priority, key, now):
+                    ring.rotate(-1)
+                    continue
+                queue = self._queues[slot]
+                self._deficit[slot] += 1
+                if self._deficit[slot] < queue[0].cost:
+                    ring.rotate(-1)  # large message: keeps its credit for the next round
+                    continue
+                entry = queue.popleft()
+                self._deficit[slot] -= entry.cost
+                if queue:
+                    ring.rotate(-1)
+                else:
+                    ring.popleft()
+                    del self._queues[slot]
+                    del self._deficit[slot]
+                self._size -= 1
+                self._per_session[key] -= 1
+                if not self._per_session[key]:
+                    del self._per_session[key]
+                return priority, key, entry
+        return None
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Queue depth and wait times (seconds) per priority class."""
+        result = {}
+        for priority in PRIORITIES:
+            stats = self._stats[priority]
+            samples = sorted(stats.samples)
+            result[priority] = {
+                "queued": sum(len(q) for (p, _), q in self._queues.items() if p == priority),
+                "served": stats.served,
+                "coalesced": stats.coalesced,
+                "wait_avg_s": stats.wait_total / stats.served if stats.served else 0.0,
+                "wait_p95_s": samples[int(len(samples) * 0.95)] if samples else 0.0,
+                "wait_max_s": stats.wait_max,
+            }
+        return result
@@ -0,0 +1,117 @@
+"""Durable on-disk spool for bus messages (SQLite, WAL mode)."""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from nanobot.bus.events import (
+    InboundMessage,
+    OutboundMessage,
+    inbound_from_dict,
+    message_to_dict,
+    outbound_from_dict,
+)
+
+INBOUND = "in"
+OUTBOUND = "out"
+
+# Reclaim the space of acknowledged messages after this many acks
+COMPACT_EVERY_ACKS = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    direction TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _encode(msg: InboundMessage | OutboundMessage) -> str:
+    return json.dumps(message_to_dict(msg), default=str)
+
+
+def _decode(direction: str, text: str) -> InboundMessage | OutboundMessage:
+    data = json.loads(text)
+    return inbound_from_dict(data) if direction == INBOUND else outbound_from_dict(data)
+
+
+class BusSpool:
+    """
+    Write-ahead spool that keeps bus messages until they are acknowledged.
+
+    Every inbound and final outbound message is appended before it is
+    queued in memory, and deleted once acknowledged: inbound messages when
+    the agent has finished the turn, outbound ones when the channel's send
+    succeeded. Messages still in the spool at startup were accepted but
+    never finished (or their send failed), and are replayed (delivery is
+    at least once). Space of
+    acknowledged messages is reclaimed every COMPACT_EVERY_ACKS acks.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect on a new database, before the first table
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._acks = 0
+
+    def append(self, msg: InboundMessage | OutboundMessage) -> int:
+        """Persist a message; sets and returns its spool id."""
+        direction = INBOUND if isinstance(msg, InboundMessage) else OUTBOUND
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO spool (direction, data) VALUES (?, ?)", (direction, _encode(msg))
+            )
+        msg.spool_id = cursor.lastrowid
+        return msg.spool_id
+
+    def update(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Rewrite a spooled message after it was changed (no-op if not spooled)."""
+        if msg.spool_id is None:
+            return
+        with self._lock:
+            self._conn.execute("UPDATE spool SET data = ? WHERE id = ?", (_encode(msg), msg.spool_id))
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Drop a spooled message once it has been handled (no-op if not spooled)."""
+        if msg.spool_id is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM spool WHERE id = ?", (msg.spool_id,))
+            self._acks += 1
+            if self._acks >= COMPACT_EVERY_ACKS:
+                self._compact()
+        msg.spool_id = None
+
+    def pending(self) -> list[InboundMessage | OutboundMessage]:
+        """Unacknowledged messages in the order they were accepted."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, direction, data FROM spool ORDER BY id").fetchall()
+        messages = []
+        for spool_id, direction, data in rows:
+            msg = _decode(direction, data)
+            msg.spool_id = spool_id
+            messages.append(msg)
+        return messages
+
+    def _compact(self) -> None:
+        """Return freed pages to the filesystem and truncate the WAL. Caller holds _lock."""
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._acks = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._compact()
+            self._conn.close()
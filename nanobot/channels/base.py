@@ -1,5 +1,6 @@
 """Base channel interface for chat platforms."""
 
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -12,6 +13,34 @@ from nanobot.security.ratelimit import RateLimiter
 # Maximum message size (50KB)
 MAX_MESSAGE_SIZE = 50 * 1024
 
+# Drafts of streamed replies whose final message never came (aborted turn) are
+# forgotten once they have not been edited for this long
+DRAFT_TTL_S = 10 * 60
+
+
+def split_message(text: str, limit: int) -> list[str]:
+    """Split text into chunks of at most `limit` characters, at line breaks or spaces where possible."""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            chunks.append(text[:limit])
+            text = text[limit:]
+            continue
+        chunks.append(text[:cut])
+        text = text[cut + 1:]  # drop the line break or space split at
+    chunks.append(text)
+    return chunks
+
+
+def evict_stale_drafts(drafts: dict[str, tuple[Any, float, str]], max_age_s: float = DRAFT_TTL_S) -> None:
+    """Drop stream drafts (stream_id -> (message_id, last edit, text)) not edited in max_age_s."""
+    cutoff = time.monotonic() - max_age_s
+    for stream_id in [sid for sid, (_, last_edit, _) in drafts.items() if last_edit < cutoff]:
+        del drafts[stream_id]
+
 
 class BaseChannel(ABC):
     """
@@ -22,6 +51,7 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+    supports_streaming: bool = False  # Renders partial OutboundMessages (is_partial=True)
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from pathlib import Path
 from typing import Any
 
@@ -11,18 +12,21 @@ from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, evict_stale_drafts, split_message
 from nanobot.config.schema import DiscordConfig
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
 MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
+MAX_MESSAGE_CHARS = 2000
+STREAM_EDIT_INTERVAL = 1.0  # seconds between draft edits of a streamed reply
 
 
 class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -32,6 +36,7 @@ class DiscordChannel(BaseChannel):
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._drafts: dict[str, tuple[str, float, str]] = {}  # stream_id -> (message_id, last edit, text)
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -78,35 +83,75 @@ class DiscordChannel(BaseChannel):
             logger.warning("Discord HTTP client not initialized")
             return
 
-        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
-        payload: dict[str, Any] = {"content": msg.content}
-
-        if msg.reply_to:
-            payload["message_reference"] = {"message_id": msg.reply_to}
-            payload["allowed_mentions"] = {"replied_user": False}
+        if msg.is_partial:
+            await self._send_partial(msg)
+            return
 
-        headers = {"Authorization": f"Bot {self.config.token}"}
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
+        # Replies longer than Discord allows are sent as several messages
+        chunks = split_message(msg.content, MAX_MESSAGE_CHARS)
 
         try:
-            for attempt in range(3):
-                try:
-                    response = await self._http.post(url, headers=headers, json=payload)
-                    if response.status_code == 429:
-                        data = response.json()
-                        retry_after = float(data.get("retry_after", 1.0))
-                        logger.warning(f"Discord rate limited, retrying in {retry_after}s")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    response.raise_for_status()
-                    return
-                except Exception as e:
-                    if attempt == 2:
-                        logger.error(f"Error sending Discord message: {e}")
-                    else:
-                        await asyncio.sleep(1)
+            # Streamed reply: replace the draft with the (first part of the) final text
+            draft = self._drafts.pop(msg.stream_id, None) if msg.stream_id else None
+            if draft:
+                message_id, _, last_text = draft
+                text = chunks.pop(0)
+                if text != last_text:
+                    await self._api_request("PATCH", f"{url}/{message_id}", {"content": text})
+
+            for i, chunk in enumerate(chunks):
+                payload: dict[str, Any] = {"content": chunk}
+                if msg.reply_to and i == 0 and not draft:
+                    payload["message_reference"] = {"message_id": msg.reply_to}
+                    payload["allowed_mentions"] = {"replied_user": False}
+                await self._api_request("POST", url, payload)
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _send_partial(self, msg: OutboundMessage) -> None:
+        """Render an in-progress streamed reply by posting a draft and editing it (throttled)."""
+        text = msg.content[:MAX_MESSAGE_CHARS]
+        if not text.strip() or not msg.stream_id:
+            return
+
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
+        draft = self._drafts.get(msg.stream_id)
+        if draft is None:
+            evict_stale_drafts(self._drafts)
+            data = await self._api_request("POST", url, {"content": text})
+            if data and data.get("id"):
+                self._drafts[msg.stream_id] = (str(data["id"]), time.monotonic(), text)
+            return
+
+        message_id, last_edit, last_text = draft
+        if text == last_text or time.monotonic() - last_edit < STREAM_EDIT_INTERVAL:
+            return
+        await self._api_request("PATCH", f"{url}/{message_id}", {"content": text})
+        self._drafts[msg.stream_id] = (message_id, time.monotonic(), text)
+
+    async def _api_request(self, method: str, url: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+        """Call the Discord REST API with retries on rate limits. Returns the JSON body."""
+        headers = {"Authorization": f"Bot {self.config.token}"}
+
+        for attempt in range(3):
+            try:
+                response = await self._http.request(method, url, headers=headers, json=payload)
+                if response.status_code == 429:
+                    data = response.json()
+                    retry_after = float(data.get("retry_after", 1.0))
+                    logger.warning(f"Discord rate limited, retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                return response.json() if response.content else {}
+            except Exception as e:
+                if attempt == 2:
+                    logger.error(f"Error sending Discord message: {e}")
+                else:
+                    await asyncio.sleep(1)
+        return None
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
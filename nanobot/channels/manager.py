@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
 
 from loguru import logger
 
@@ -110,8 +110,16 @@ class ChannelManager:
             logger.warning("No channels enabled")
             return
         
-        # Start outbound dispatcher
-        self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
+        # Each channel gets its own outbound lane, so a slow one can't delay the others
+        for name, channel in self.channels.items():
+            self.bus.subscribe_outbound(
+                name,
+                self._sender(channel),
+                workers=self.config.channels.outbound_workers,
+                max_queue=self.config.channels.outbound_queue,
+            )
+        self._dispatch_task = asyncio.create_task(self.bus.dispatch_outbound())
+        logger.info("Outbound dispatcher started")
         
         # Start channels
         tasks = []
@@ -128,6 +136,7 @@ class ChannelManager:
         
         # Stop dispatcher
         if self._dispatch_task:
+            self.bus.stop()
             self._dispatch_task.cancel()
             try:
                 await self._dispatch_task
@@ -142,30 +151,15 @@ class ChannelManager:
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
     
-    async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
-        logger.info("Outbound dispatcher started")
-        
-        while True:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_outbound(),
-                    timeout=1.0
-                )
-                
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
-                else:
-                    logger.warning(f"Unknown channel: {msg.channel}")
-                    
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
+    @staticmethod
+    def _sender(channel: BaseChannel) -> Callable[[OutboundMessage], Awaitable[None]]:
+        """Outbound lane callback delivering messages to a channel."""
+        async def send(msg: OutboundMessage) -> None:
+            if msg.is_partial and not channel.supports_streaming:
+                # Non-streaming channels only get the final reply
+                return
+            await channel.send(msg)
+        return send
     
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
@@ -173,10 +167,12 @@ class ChannelManager:
     
     def get_status(self) -> dict[str, Any]:
         """Get status of all channels."""
+        outbound = self.bus.outbound_stats()
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "outbound": outbound.get(name, {}),
             }
             for name, channel in self.channels.items()
         }
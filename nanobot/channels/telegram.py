@@ -4,20 +4,25 @@ from __future__ import annotations
 
 import asyncio
 import re
+import time
 from typing import TYPE_CHECKING
 
 from loguru import logger
 from telegram import BotCommand, Update
+from telegram.error import BadRequest
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, evict_stale_drafts, split_message
 from nanobot.config.schema import TelegramConfig
 
 if TYPE_CHECKING:
     from nanobot.session.manager import SessionManager
 
+MAX_MESSAGE_CHARS = 4096
+STREAM_EDIT_INTERVAL = 1.0  # seconds between draft edits (Telegram rate-limits edits)
+
 
 def _markdown_to_telegram_html(text: str) -> str:
     """
@@ -90,6 +95,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -112,6 +118,7 @@ class TelegramChannel(BaseChannel):
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._drafts: dict[str, tuple[int, float, str]] = {}  # stream_id -> (message_id, last edit, text)
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -188,32 +195,98 @@ class TelegramChannel(BaseChannel):
             logger.warning("Telegram bot not running")
             return
         
+        if msg.is_partial:
+            await self._send_partial(msg)
+            return
+
         # Stop typing indicator for this chat
         self._stop_typing(msg.chat_id)
         
+        # Replies longer than Telegram allows are sent as several messages
+        chunks = split_message(msg.content, MAX_MESSAGE_CHARS)
+
+        # Streamed reply: replace the draft with the (first part of the) final formatted text
+        draft = self._drafts.pop(msg.stream_id, None) if msg.stream_id else None
+        if draft:
+            await self._finish_draft(msg, draft, chunks.pop(0))
+
+        for chunk in chunks:
+            await self._send_text(msg.chat_id, chunk)
+
+    async def _send_text(self, chat_id: str, text: str) -> None:
+        """Send one message as Telegram HTML, falling back to plain text."""
         try:
             # chat_id should be the Telegram chat ID (integer)
-            chat_id = int(msg.chat_id)
             # Convert markdown to Telegram HTML
-            html_content = _markdown_to_telegram_html(msg.content)
             await self._app.bot.send_message(
-                chat_id=chat_id,
-                text=html_content,
+                chat_id=int(chat_id),
+                text=_markdown_to_telegram_html(text),
                 parse_mode="HTML"
             )
         except ValueError:
-            logger.error(f"Invalid chat_id: {msg.chat_id}")
+            logger.error(f"Invalid chat_id: {chat_id}")
         except Exception as e:
             # Fallback to plain text if HTML parsing fails
             logger.warning(f"HTML parse failed, falling back to plain text: {e}")
             try:
                 await self._app.bot.send_message(
-                    chat_id=int(msg.chat_id),
-                    text=msg.content
+                    chat_id=int(chat_id),
+                    text=text
                 )
             except Exception as e2:
                 logger.error(f"Error sending Telegram message: {e2}")
     
+    async def _send_partial(self, msg: OutboundMessage) -> None:
+        """Render an in-progress streamed reply by sending a draft and editing it (throttled)."""
+        text = msg.content[:MAX_MESSAGE_CHARS]
+        if not text.strip() or not msg.stream_id:
+            return
+
+        try:
+            draft = self._drafts.get(msg.stream_id)
+            if draft is None:
+                evict_stale_drafts(self._drafts)
+                self._stop_typing(msg.chat_id)
+                sent = await self._app.bot.send_message(chat_id=int(msg.chat_id), text=text)
+                self._drafts[msg.stream_id] = (sent.message_id, time.monotonic(), text)
+                return
+
+            message_id, last_edit, last_text = draft
+            if text == last_text or time.monotonic() - last_edit < STREAM_EDIT_INTERVAL:
+                return
+            await self._app.bot.edit_message_text(
+                chat_id=int(msg.chat_id), message_id=message_id, text=text
+            )
+            self._drafts[msg.stream_id] = (message_id, time.monotonic(), text)
+        except Exception as e:
+            logger.debug(f"Telegram draft update failed: {e}")
+
+    async def _finish_draft(self, msg: OutboundMessage, draft: tuple[int, float, str], text: str) -> None:
+        """Edit a streamed draft into the final text, falling back to plain text."""
+        message_id, _, last_text = draft
+        html = _markdown_to_telegram_html(text)
+        if html == last_text:
+            return  # nothing to format: the draft already reads the same
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=int(msg.chat_id),
+                message_id=message_id,
+                text=html,
+                parse_mode="HTML"
+            )
+        except Exception as e:
+            if isinstance(e, BadRequest) and "not modified" in str(e).lower():
+                return
+            logger.warning(f"HTML edit failed, falling back to plain text: {e}")
+            if text == last_text:
+                return
+            try:
+                await self._app.bot.edit_message_text(
+                    chat_id=int(msg.chat_id), message_id=message_id, text=text
+                )
+            except Exception as e2:
+                logger.error(f"Error finalizing Telegram message: {e2}")
+
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -239,10 +312,7 @@ class TelegramChannel(BaseChannel):
             await update.message.reply_text("⚠️ Session management is not available.")
             return
         
-        session = self.session_manager.get_or_create(session_key)
-        msg_count = len(session.messages)
-        session.clear()
-        self.session_manager.save(session)
+        msg_count = await self.session_manager.reset(session_key)
         
         logger.info(f"Session reset for {session_key} (cleared {msg_count} messages)")
         await update.message.reply_text("🔄 Conversation history cleared. Let's start fresh!")
@@ -112,6 +112,35 @@ def _prompt_text() -> str:
     return "\001\033[1;34m\002You:\001\033[0m\002 "
 
 
+class _StreamPrinter:
+    """Print agent reply text to the terminal as it streams in."""
+
+    def __init__(self) -> None:
+        self.printed = ""
+
+    async def __call__(self, text: str) -> None:
+        if not self.printed:
+            sys.stdout.write(f"\n{__logo__} ")
+        elif not text.startswith(self.printed):
+            # A new LLM call in the tool loop started over
+            sys.stdout.write(f"\n{__logo__} ")
+            self.printed = ""
+        sys.stdout.write(text[len(self.printed):])
+        sys.stdout.flush()
+        self.printed = text
+
+    def finish(self, response: str) -> None:
+        """Print the final response unless the stream already showed all of it."""
+        if self.printed and response == self.printed:
+            sys.stdout.write("\n\n")
+            sys.stdout.flush()
+        else:
+            if self.printed:
+                sys.stdout.write("\n")
+            console.print(f"\n{__logo__} {response}\n")
+        self.printed = ""
+
+
 async def _read_interactive_input_async() -> str:
     """Read user input with arrow keys and history (runs input() in a thread)."""
     try:
@@ -249,39 +278,221 @@ This file stores important information that should persist across sessions.
         console.print("  [dim]Created memory/MEMORY.md[/dim]")
 
 
-def _make_provider(config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
-    from nanobot.providers.litellm_provider import LiteLLMProvider
+def _make_provider(config, usage=None):
+    """Create the LLM provider from config (with retries, failover, accounting and caching). Exits if no API key found."""
     p = config.get_provider()
     model = config.agents.defaults.model
     if not (p and p.api_key) and not model.startswith("bedrock/"):
         console.print("[red]Error: No API key configured.[/red]")
         console.print("Set one in ~/.nanobot/config.json under providers section")
         raise typer.Exit(1)
-    return LiteLLMProvider(
-        api_key=p.api_key if p else None,
-        api_base=config.get_api_base(),
-        default_model=model,
-        extra_headers=p.extra_headers if p else None,
+
+    from nanobot.config.schema import ProviderConfig
+    from nanobot.providers.resilient import ChainMember, CircuitBreaker, ResilientProvider
+    resilience = config.providers.resilience
+
+    def member(name, provider, member_model=None):
+        breaker = CircuitBreaker(resilience.breaker_failures, resilience.breaker_cooldown_s)
+        return ChainMember(name, provider, member_model, breaker)
+
+    def named(name, member_model):
+        fp = getattr(config.providers, name, None)
+        if not isinstance(fp, ProviderConfig) or not fp.api_key:
+            console.print(f"[yellow]Warning: provider '{name}' is not configured, skipping[/yellow]")
+            return None
+        api_base = fp.api_base or _default_api_base(name)
+        return _make_single_provider(config, fp, api_base, member_model or model, usage)
+
+    primary = _make_single_provider(config, p, config.get_api_base(), model, usage)
+    hedging = config.providers.hedging
+    if hedging.enabled:
+        from nanobot.providers.hedged import HedgedProvider
+        primary = HedgedProvider(
+            primary,
+            secondary=named(hedging.provider, hedging.model) if hedging.provider else None,
+            secondary_model=hedging.model or None,
+            percentile=hedging.percentile,
+            min_delay_s=hedging.min_delay_s,
+            max_fraction=hedging.max_fraction,
+        )
+
+    chain = [member("primary", primary)]
+    for fallback in config.providers.failover:
+        provider = named(fallback.provider, fallback.model)
+        if provider:
+            chain.append(member(fallback.provider, provider, fallback.model or None))
+
+    provider = ResilientProvider(
+        chain,
+        max_retries=resilience.max_retries,
+        max_delay_s=resilience.max_backoff_s,
+    )
+
+    cache = config.providers.cache
+    if cache.enabled:
+        from nanobot.config.loader import get_data_dir
+        from nanobot.providers.cache import CachingProvider
+        provider = CachingProvider(
+            provider,
+            max_entries=cache.max_entries,
+            ttl_s=cache.ttl_s,
+            db_path=get_data_dir() / "cache" / "llm_responses.db" if cache.disk else None,
+        )
+    return provider
+
+
+def _default_api_base(name: str) -> str | None:
+    """Default API base of a gateway provider (others need none)."""
+    from nanobot.providers.registry import find_by_name
+    spec = find_by_name(name)
+    return spec.default_api_base if spec and spec.is_gateway else None
+
+
+def _make_single_provider(config, p, api_base, model, usage=None):
+    """Create the provider for one ProvidersConfig section (metered into `usage` when given)."""
+    provider = None
+    if config.providers.native_http and p:
+        from nanobot.providers.registry import find_gateway
+        spec = find_gateway(p.api_key, api_base)
+        if spec and (spec.is_gateway or spec.is_local):
+            from nanobot.providers.openai_compat import OpenAICompatProvider
+            provider = OpenAICompatProvider(
+                api_key=p.api_key,
+                api_base=api_base,
+                default_model=model,
+                extra_headers=p.extra_headers,
+                spec=spec,
+            )
+
+    if provider is None:
+        from nanobot.providers.litellm_provider import LiteLLMProvider
+        provider = LiteLLMProvider(
+            api_key=p.api_key if p else None,
+            api_base=api_base,
+            default_model=model,
+            extra_headers=p.extra_headers if p else None,
+        )
+
+    if usage is not None:
+        # Around each upstream provider: every retry, failover and hedge is its own record,
+        # with the model that was actually called. Cache hits never get here.
+        from nanobot.providers.metered import MeteredProvider
+        provider = MeteredProvider(provider, usage)
+    return provider
+
+
+def _make_retention_service(config, session_manager, expire_sessions: bool = True):
+    """Create the RetentionService from the retention config (`expire_sessions`: include session expiry)."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.retention.service import RetentionService
+    retention = config.retention
+    return RetentionService(
+        sessions=session_manager,
+        data_dir=get_data_dir(),
+        interval_s=retention.interval_s,
+        session_days=retention.session_days if expire_sessions else 0,
+        media_days=retention.media_days,
+        media_max_bytes=retention.media_max_mb * 1024 * 1024,
+        temp_hours=retention.temp_hours,
+        batch_size=retention.batch_size,
+        enabled=retention.enabled,
     )
 
 
+def _make_usage_store(config):
+    """Open the usage accounting store, or None when accounting is off."""
+    if not config.usage.enabled:
+        return None
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.store import UsageStore
+    return UsageStore(get_data_dir() / "usage.db", keep_days=config.usage.keep_days)
+
+
+def _make_agent(config, bus, provider, session_manager, cron, usage=None):
+    """Create the gateway's AgentLoop (also used by worker processes)."""
+    from nanobot.agent.loop import AgentLoop
+    agent = AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=session_manager,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_parallel_tool_calls=config.agents.defaults.max_parallel_tool_calls,
+        stream=config.agents.defaults.stream,
+        prompt_caching=config.agents.defaults.prompt_caching,
+        max_tokens=config.agents.defaults.max_tokens,
+        context_window=config.agents.defaults.context_window,
+        compaction_threshold=config.agents.defaults.compaction_threshold,
+        compaction_model=config.agents.defaults.compaction_model or None,
+        cancel_superseded=config.agents.defaults.cancel_superseded,
+        usage=usage,
+        session_token_budget=config.usage.session_token_budget,
+        budget_window_h=config.usage.budget_window_h,
+    )
+    _set_replayable_tools(provider, agent)
+    return agent
+
+
+def _set_replayable_tools(provider, agent):
+    """Let the response cache replay calls to the agent's read-only tools (never ones with side effects)."""
+    from nanobot.providers.cache import CachingProvider
+    if isinstance(provider, CachingProvider):
+        provider.replayable_tools = {
+            name for name in agent.tools.tool_names if agent.tools.get(name).read_only
+        }
+
+
+def _make_session_manager(config, migrate: bool = True):
+    """Create the SessionManager for the configured backend (`migrate`: fill an empty SQLite store from JSONL)."""
+    from nanobot.session.jsonl_store import JsonlSessionStore
+    from nanobot.session.manager import SessionManager
+    sessions_dir = Path.home() / ".nanobot" / "sessions"
+    options = {
+        "cache_bytes": config.sessions.cache_mb * 1024 * 1024,
+        "flush_interval": config.sessions.flush_interval,
+    }
+    jsonl = JsonlSessionStore(
+        sessions_dir,
+        journal=config.sessions.journal,
+        fsync=config.sessions.fsync,
+        tail_messages=config.sessions.tail_messages,
+    )
+    if config.sessions.backend != "sqlite":
+        return SessionManager(config.workspace_path, store=jsonl, **options)
+
+    from nanobot.session.sqlite_store import SqliteSessionStore, migrate_jsonl_sessions
+    store = SqliteSessionStore(sessions_dir / "sessions.db", tail_messages=config.sessions.tail_messages)
+    if migrate and store.is_empty():
+        migrated = migrate_jsonl_sessions(jsonl, store)
+        if migrated:
+            console.print(f"[green]✓[/green] Migrated {migrated} JSONL sessions to SQLite")
+    return SessionManager(config.workspace_path, store=store, **options)
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
 
+# How often a gateway with workers checks the cron store for jobs they added
+CRON_POLL_S = 30
+
 
 @app.command()
 def gateway(
     port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    workers: int = typer.Option(None, "--workers", "-w", help="Run the agent in N worker processes (default: gateway.workers)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
-    from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
@@ -293,36 +504,46 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
-    bus = MessageBus()
-    provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    spool = None
+    if config.bus.spool:
+        from nanobot.bus.spool import BusSpool
+        spool = BusSpool(get_data_dir() / "bus" / "spool.db")
+    bus = MessageBus(spool=spool, coalesce_ms=config.bus.coalesce_ms)
+    session_manager = _make_session_manager(config)
     
-    # Create cron service first (callback set after agent creation)
+    if workers is None:
+        workers = config.gateway.workers
+
+    # Create cron service first (callback set after agent creation); workers
+    # add jobs to the shared store, so poll it for changes
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, poll_s=CRON_POLL_S if workers else 0)
     
-    # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-    )
+    # Run the agent here, or in worker processes that own the sessions (and
+    # build their own providers)
+    pool = None
+    agent = None
+    provider = None
+    usage = None
+    if workers:
+        from nanobot.workers.supervisor import WorkerPool
+        pool = WorkerPool(bus, workers, socket_path=get_data_dir() / "run" / "workers.sock")
+        process_direct = pool.process_direct
+    else:
+        usage = _make_usage_store(config)
+        provider = _make_provider(config, usage)
+        agent = _make_agent(config, bus, provider, session_manager, cron, usage)
+        process_direct = agent.process_direct
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
-        response = await agent.process_direct(
+        response = await process_direct(
             job.payload.message,
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            priority="cron",
         )
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
@@ -337,7 +558,7 @@ def gateway(
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await process_direct(prompt, session_key="heartbeat", priority="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -346,8 +567,12 @@ def gateway(
         enabled=True
     )
     
-    # Create channel manager
-    channels = ChannelManager(config, bus, session_manager=session_manager)
+    # Create retention service (expires sessions, media and temp files); with
+    # workers each one expires the sessions it owns and holds in its cache
+    retention = _make_retention_service(config, session_manager, expire_sessions=not pool)
+
+    # Create channel manager (in worker mode /reset goes to the worker caching the session)
+    channels = ChannelManager(config, bus, session_manager=pool or session_manager)
     
     if channels.enabled_channels:
         console.print(f"[green]✓[/green] Channels enabled: {', '.join(channels.enabled_channels)}")
@@ -359,25 +584,89 @@ def gateway(
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
+    if config.providers.failover:
+        console.print(f"[green]✓[/green] LLM failover: {', '.join(f.provider for f in config.providers.failover)}")
+    if config.providers.cache.enabled:
+        console.print(f"[green]✓[/green] LLM response cache: {config.providers.cache.max_entries} entries")
+    if pool:
+        console.print(f"[green]✓[/green] Agent workers: {workers}")
+    if retention.enabled:
+        console.print(f"[green]✓[/green] Retention: every {retention.interval_s // 60}m")
     
     async def run():
         try:
+            replayed = bus.recover()
+            if replayed:
+                console.print(f"[green]✓[/green] Replaying {replayed} unfinished messages from the bus spool")
             await cron.start()
             await heartbeat.start()
+            await retention.start()
+            if pool:
+                await pool.start()
             await asyncio.gather(
-                agent.run(),
+                pool.run() if pool else agent.run(),
                 channels.start_all(),
             )
         except KeyboardInterrupt:
             console.print("\nShutting down...")
             heartbeat.stop()
+            retention.stop()
             cron.stop()
-            agent.stop()
+            if agent:
+                agent.stop()
             await channels.stop_all()
+        finally:
+            if pool:
+                await pool.stop()
+            if provider is not None:
+                await provider.aclose()
+            session_manager.close()
+            if spool is not None:
+                spool.close()
+            if usage is not None:
+                usage.close()
     
     asyncio.run(run())
 
 
+@app.command(hidden=True)
+def worker(
+    index: int = typer.Option(..., "--index", help="Worker index"),
+    workers: int = typer.Option(1, "--workers", help="Number of workers the gateway runs"),
+    socket: str = typer.Option(..., "--socket", help="Gateway socket path"),
+):
+    """Run an agent worker for `gateway --workers` (started by the gateway)."""
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.cron.service import CronService
+    from nanobot.workers.worker import AgentWorker
+
+    config = load_config()
+    # The gateway migrated the sessions (if needed) before it started the workers
+    session_manager = _make_session_manager(config, migrate=False)
+    # Jobs added by the cron tool are run by the gateway's cron service
+    cron = CronService(get_data_dir() / "cron" / "jobs.json")
+    usage = _make_usage_store(config)
+    provider = _make_provider(config, usage)
+    agent = _make_agent(config, MessageBus(), provider, session_manager, cron, usage)
+
+    async def run():
+        try:
+            await AgentWorker(
+                index,
+                socket,
+                agent,
+                session_manager,
+                workers=workers,
+                session_days=config.retention.session_days if config.retention.enabled else 0,
+                expire_interval_s=config.retention.interval_s,
+                expire_batch=config.retention.batch_size,
+            ).run()
+        finally:
+            await provider.aclose()
+            session_manager.close()
+
+    asyncio.run(run())
 
 
 # ============================================================================
@@ -389,6 +678,7 @@ def gateway(
 def agent(
     message: str = typer.Option(None, "--message", "-m", help="Message to send to the agent"),
     session_id: str = typer.Option("cli:default", "--session", "-s", help="Session ID"),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Print the reply as it is generated"),
 ):
     """Interact with the agent directly."""
     from nanobot.config.loader import load_config
@@ -398,7 +688,9 @@ def agent(
     config = load_config()
     
     bus = MessageBus()
-    provider = _make_provider(config)
+    usage = _make_usage_store(config)
+    provider = _make_provider(config, usage)
+    session_manager = _make_session_manager(config)
     
     agent_loop = AgentLoop(
         bus=bus,
@@ -407,35 +699,60 @@ def agent(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=session_manager,
+        max_parallel_tool_calls=config.agents.defaults.max_parallel_tool_calls,
+        prompt_caching=config.agents.defaults.prompt_caching,
+        max_tokens=config.agents.defaults.max_tokens,
+        context_window=config.agents.defaults.context_window,
+        compaction_threshold=config.agents.defaults.compaction_threshold,
+        compaction_model=config.agents.defaults.compaction_model or None,
+        usage=usage,
+        session_token_budget=config.usage.session_token_budget,
+        budget_window_h=config.usage.budget_window_h,
     )
+    _set_replayable_tools(provider, agent_loop)
     
     if message:
         # Single message mode
         async def run_once():
-            response = await agent_loop.process_direct(message, session_id)
-            console.print(f"\n{__logo__} {response}")
+            printer = _StreamPrinter()
+            try:
+                response = await agent_loop.process_direct(
+                    message, session_id, on_text=printer if stream else None
+                )
+            finally:
+                await provider.aclose()
+            printer.finish(response)
         
         asyncio.run(run_once())
+        session_manager.close()
     else:
         # Interactive mode
         _enable_line_editing()
         console.print(f"{__logo__} Interactive mode (Ctrl+C to exit)\n")
         
         async def run_interactive():
-            while True:
-                try:
-                    _flush_pending_tty_input()
-                    user_input = await _read_interactive_input_async()
-                    if not user_input.strip():
-                        continue
-                    
-                    response = await agent_loop.process_direct(user_input, session_id)
-                    console.print(f"\n{__logo__} {response}\n")
-                except KeyboardInterrupt:
-                    console.print("\nGoodbye!")
-                    break
+            try:
+                while True:
+                    try:
+                        _flush_pending_tty_input()
+                        user_input = await _read_interactive_input_async()
+                        if not user_input.strip():
+                            continue
+
+                        printer = _StreamPrinter()
+                        response = await agent_loop.process_direct(
+                            user_input, session_id, on_text=printer if stream else None
+                        )
+                        printer.finish(response)
+                    except KeyboardInterrupt:
+                        console.print("\nGoodbye!")
+                        break
+            finally:
+                await provider.aclose()
         
         asyncio.run(run_interactive())
+        session_manager.close()
 
 
 # ============================================================================
@@ -719,6 +1036,193 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Retention Commands
+# ============================================================================
+
+retention_app = typer.Typer(help="Clean up old sessions, media and temp files")
+app.add_typer(retention_app, name="retention")
+
+
+@retention_app.command("run")
+def retention_run(
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Only show what would be removed"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="List every item"),
+):
+    """Run one retention pass now."""
+    from nanobot.config.loader import load_config
+
+    config = load_config()
+    session_manager = _make_session_manager(config)
+    service = _make_retention_service(config, session_manager)
+    results = service.run_once(dry_run=dry_run)
+    session_manager.close()
+
+    table = Table(title="Retention (dry run)" if dry_run else "Retention")
+    table.add_column("Category", style="cyan")
+    table.add_column("Removed" if not dry_run else "Would remove")
+    table.add_column("Freed")
+    table.add_column("Remaining")
+    for name, result in results.items():
+        table.add_row(
+            name,
+            str(len(result.removed)),
+            _format_bytes(result.freed_bytes) if name != "sessions" else "",
+            _format_bytes(result.remaining_bytes) if name != "sessions" else "",
+        )
+    console.print(table)
+
+    if verbose:
+        for name, result in results.items():
+            for item in result.removed:
+                console.print(f"  [dim]{name}[/dim] {item}")
+
+
+@retention_app.command("status")
+def retention_status():
+    """Show the counters of the gateway's retention service."""
+    import json
+    import time
+
+    from nanobot.config.loader import get_data_dir
+
+    metrics_file = get_data_dir() / "retention.json"
+    if not metrics_file.exists():
+        console.print("No retention pass has run yet.")
+        return
+
+    stats = json.loads(metrics_file.read_text())
+    last = stats.get("last_run_at")
+    console.print(f"Runs: {stats.get('runs', 0)}")
+    if last:
+        console.print(f"Last run: {time.strftime('%Y-%m-%d %H:%M', time.localtime(last))} "
+                      f"({stats.get('last_duration_s', 0)}s)")
+    for name, count in stats.get("removed", {}).items():
+        freed = stats.get("freed_bytes", {}).get(name)
+        suffix = f" ({_format_bytes(freed)})" if freed is not None else ""
+        console.print(f"Removed {name}: {count}{suffix}")
+    console.print(f"Media on disk: {_format_bytes(stats.get('media_bytes', 0))}")
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable byte count."""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+# ============================================================================
+# Usage Commands
+# ============================================================================
+
+
+stats_app = typer.Typer(help="Token usage and cost of LLM calls")
+app.add_typer(stats_app, name="stats")
+
+
+def _open_usage_store():
+    """Open the usage store for reading; exits if nothing was recorded yet."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.store import UsageStore
+
+    db_path = get_data_dir() / "usage.db"
+    if not db_path.exists():
+        console.print("No LLM usage recorded yet.")
+        raise typer.Exit()
+    return UsageStore(db_path, keep_days=0)
+
+
+@stats_app.callback(invoke_without_command=True)
+def stats_summary(
+    ctx: typer.Context,
+    by: str = typer.Option("session", "--by", "-b", help="session, channel, model, source, day, cron or subagent"),
+    days: float = typer.Option(7, "--days", "-d", help="Only the last N days (0 = all)"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Max rows (0 = all)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the rollup as JSON"),
+):
+    """Show token usage and cost rolled up by session, channel, model, ..."""
+    if ctx.invoked_subcommand is not None:
+        return
+    import json
+    import time
+
+    from nanobot.usage.store import GROUPS
+
+    if by not in GROUPS:
+        console.print(f"[red]Unknown --by value '{by}' (use one of: {', '.join(GROUPS)})[/red]")
+        raise typer.Exit(1)
+    store = _open_usage_store()
+    since = time.time() - days * 86400 if days else 0.0
+    rows = store.summary(by, since=since, limit=limit or None)
+    store.close()
+
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        console.print("No LLM calls in this period.")
+        return
+
+    period = f"last {days:g} days" if days else "all time"
+    table = Table(title=f"LLM usage by {by} ({period})")
+    table.add_column(by.capitalize(), style="cyan")
+    for column in ("Calls", "Errors", "Prompt", "Cached", "Completion", "Reasoning", "Total", "Cost ($)", "Avg ms"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            str(row["name"] or "-"),
+            f"{row['calls']:,}",
+            f"{row['errors']:,}",
+            f"{row['prompt_tokens']:,}",
+            f"{row['cached_tokens']:,}",
+            f"{row['completion_tokens']:,}",
+            f"{row['reasoning_tokens']:,}",
+            f"{row['total_tokens']:,}",
+            f"{row['cost']:.4f}",
+            f"{row['avg_latency_ms']:,}",
+        )
+    console.print(table)
+
+
+@stats_app.command("export")
+def stats_export(
+    fmt: str = typer.Option("jsonl", "--format", "-f", help="jsonl or csv"),
+    days: float = typer.Option(0, "--days", "-d", help="Only the last N days (0 = all)"),
+    output: Path = typer.Option(None, "--output", "-o", help="Write to this file instead of stdout"),
+):
+    """Export every recorded LLM call (one row per call)."""
+    import csv
+    import json
+    import time
+
+    if fmt not in ("jsonl", "csv"):
+        console.print(f"[red]Unknown format '{fmt}' (use jsonl or csv)[/red]")
+        raise typer.Exit(1)
+    store = _open_usage_store()
+    since = time.time() - days * 86400 if days else 0.0
+    out = open(output, "w", newline="") if output else sys.stdout
+    try:
+        writer = None
+        for record in store.records(since):
+            if fmt == "jsonl":
+                out.write(json.dumps(record) + "\n")
+                continue
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+    finally:
+        store.close()
+        if output:
+            out.close()
+    if output:
+        console.print(f"[green]✓[/green] Exported usage to {output}")
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
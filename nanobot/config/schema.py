@@ -54,6 +54,8 @@ class ChannelsConfig(BaseModel):
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
     feishu: FeishuConfig = Field(default_factory=FeishuConfig)
     dingtalk: DingTalkConfig = Field(default_factory=DingTalkConfig)
+    outbound_workers: int = 4  # Concurrent senders per channel (messages to one chat stay ordered)
+    outbound_queue: int = 200  # Outbound messages queued per channel before backpressure
 
 
 class AgentDefaults(BaseModel):
@@ -63,6 +65,14 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    max_concurrent_turns: int = 4  # Sessions processed in parallel by the agent loop
+    max_parallel_tool_calls: int = 1  # >1 runs read-only tool calls of one response concurrently
+    stream: bool = False  # Stream replies to channels that support progressive rendering
+    prompt_caching: bool = False  # Stable-prefix system prompt with provider cache breakpoints
+    context_window: int = 0  # Token budget for prompt + reply; history is packed to fit (0 = last 50 messages)
+    compaction_threshold: int = 0  # History tokens that trigger background summarization of old turns (0 = off)
+    compaction_model: str = ""  # Cheaper model for session summaries (empty = main model)
+    cancel_superseded: bool = False  # A new message to a chat cancels its running turn (partial work is kept in the session)
 
 
 class AgentsConfig(BaseModel):
@@ -77,6 +87,38 @@ class ProviderConfig(BaseModel):
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
 
 
+class FailoverConfig(BaseModel):
+    """A fallback provider, tried when the ones before it are down."""
+    provider: str  # Name of a provider section below, e.g. "openrouter"
+    model: str = ""  # Model to ask it for (empty = the agent's model)
+
+
+class ResilienceConfig(BaseModel):
+    """Retries and circuit breaking for LLM calls."""
+    max_retries: int = 2  # Retries of a transient error (429, 5xx, timeout) on the same provider
+    max_backoff_s: float = 30.0  # Longest wait between retries; a longer Retry-After fails over instead
+    breaker_failures: int = 5  # Consecutive failures that take a provider out of rotation
+    breaker_cooldown_s: float = 30.0  # How long it stays out before one trial call
+
+
+class HedgingConfig(BaseModel):
+    """Duplicate LLM calls that run longer than usual (tail-latency cut)."""
+    enabled: bool = False
+    percentile: float = 0.9  # Hedge once a call is slower than this share of recent calls to its model
+    min_delay_s: float = 1.0  # Never hedge sooner than this
+    max_fraction: float = 0.1  # At most this share of calls is hedged
+    provider: str = ""  # Provider section to send hedges to (empty = the main provider)
+    model: str = ""  # Model for hedges (empty = same model)
+
+
+class ResponseCacheConfig(BaseModel):
+    """Exact-match cache of LLM responses."""
+    enabled: bool = False
+    max_entries: int = 256  # Responses kept in memory (least recently used go first)
+    ttl_s: float = 3600.0  # How long a response may be reused
+    disk: bool = False  # Also keep responses in ~/.nanobot/cache so they survive restarts
+
+
 class ProvidersConfig(BaseModel):
     """Configuration for LLM providers."""
     anthropic: ProviderConfig = Field(default_factory=ProviderConfig)
@@ -90,6 +132,11 @@ class ProvidersConfig(BaseModel):
     gemini: ProviderConfig = Field(default_factory=ProviderConfig)
     moonshot: ProviderConfig = Field(default_factory=ProviderConfig)
     aihubmix: ProviderConfig = Field(default_factory=ProviderConfig)  # AiHubMix API gateway
+    native_http: bool = False  # Call gateways and local OpenAI-compatible servers over a pooled HTTP/2 client instead of LiteLLM
+    failover: list[FailoverConfig] = Field(default_factory=list)  # Providers to fall back to, in order
+    resilience: ResilienceConfig = Field(default_factory=ResilienceConfig)
+    hedging: HedgingConfig = Field(default_factory=HedgingConfig)
+    cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
 
 
 class TranscriptionConfig(BaseModel):
@@ -103,6 +150,42 @@ class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "127.0.0.1"
     port: int = 18790
+    workers: int = 0  # Agent worker processes (sessions spread by consistent hashing); 0 = run the agent in the gateway process
+
+
+class BusConfig(BaseModel):
+    """Message bus configuration."""
+    spool: bool = False  # Persist accepted messages in ~/.nanobot/bus/spool.db until handled; replay after a restart
+    coalesce_ms: int = 0  # Merge messages a sender sends to a chat within this window into one turn (0 = off)
+
+
+class SessionsConfig(BaseModel):
+    """Session persistence configuration."""
+    backend: str = "jsonl"  # "jsonl" (file per session) | "sqlite" (~/.nanobot/sessions/sessions.db)
+    journal: bool = False  # Append each turn to the session file instead of rewriting it
+    fsync: bool = False  # fsync journal appends (durable across power loss, slower)
+    tail_messages: int = 0  # Load only the newest N messages, paging older ones on demand (0 = all)
+    cache_mb: int = 64  # Estimated memory budget for cached sessions
+    flush_interval: float = 0  # Write-behind: write dirty sessions every N seconds off the event loop (0 = on every save)
+
+
+class RetentionConfig(BaseModel):
+    """Retention of old sessions, downloaded media and temp files (run by the gateway and its workers)."""
+    enabled: bool = True
+    interval_s: int = 60 * 60  # Time between passes
+    batch_size: int = 500  # Max deletions per category per pass
+    session_days: int = 30  # Expire sessions not updated for this long (0 = keep)
+    media_days: int = 30  # Delete downloaded media older than this (0 = no age limit)
+    media_max_mb: int = 1024  # Then delete the oldest media until the rest fits (0 = no limit)
+    temp_hours: int = 24  # Delete leftover *.tmp files older than this (0 = keep)
+
+
+class UsageConfig(BaseModel):
+    """Token usage and cost accounting (see `nanobot stats`)."""
+    enabled: bool = True
+    keep_days: int = 90  # Delete usage records older than this (0 = keep)
+    session_token_budget: int = 0  # Max prompt + completion tokens per session within the window (0 = unlimited)
+    budget_window_h: float = 24.0  # Rolling window the session budget applies to
 
 
 class WebSearchConfig(BaseModel):
@@ -134,6 +217,10 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    retention: RetentionConfig = Field(default_factory=RetentionConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     transcription: TranscriptionConfig = Field(default_factory=TranscriptionConfig)
     
@@ -2,10 +2,17 @@
 
 import asyncio
 import json
+import os
 import time
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no worker processes, the store has a single writer
+    fcntl = None
 
 from loguru import logger
 
@@ -40,25 +47,39 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    The store file may be shared with other processes (the CLI, gateway
+    workers): it is reloaded whenever it changed on disk, and with
+    `poll_s` the timer wakes at least that often to pick up jobs added
+    elsewhere. Every change is a read-modify-write of the file under an
+    exclusive lock (see _locked), so writers never overwrite each other's
+    changes; a job's run is written back the same way once it finishes.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        poll_s: float = 0,
     ):
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.poll_s = poll_s
         self._store: CronStore | None = None
+        self._store_mtime: int | None = None
         self._timer_task: asyncio.Task | None = None
         self._running = False
     
-    def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+    def _load_store(self, force: bool = False) -> CronStore:
+        """Load jobs from disk (cached until the file changes, unless `force`)."""
+        mtime = self._file_mtime()
+        if self._store and mtime == self._store_mtime and not force:
             return self._store
         
-        if self.store_path.exists():
+        self._store_mtime = mtime
+        if mtime is not None:
             try:
                 data = json.loads(self.store_path.read_text())
                 jobs = []
@@ -142,14 +163,33 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        # Replace atomically so readers without the lock never see a partial file
+        tmp = self.store_path.with_name(f"{self.store_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, self.store_path)
+        self._store_mtime = self._file_mtime()
+
+    @contextmanager
+    def _locked(self) -> Iterator[CronStore]:
+        """Hold the store's file lock; yields the store freshly loaded from disk."""
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.store_path.with_name(f"{self.store_path.name}.lock"), "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield self._load_store(force=True)
+
+    def _file_mtime(self) -> int | None:
+        try:
+            return self.store_path.stat().st_mtime_ns
+        except OSError:
+            return None
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
-        self._load_store()
-        self._recompute_next_runs()
-        self._save_store()
+        with self._locked():
+            self._recompute_next_runs()
+            self._save_store()
         self._arm_timer()
         logger.info(f"Cron service started with {len(self._store.jobs if self._store else [])} jobs")
     
@@ -182,12 +222,17 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
         
-        next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running:
             return
-        
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        next_wake = self._get_next_wake_ms()
+        if not next_wake:
+            if not self.poll_s:
+                return
+            delay_s = self.poll_s
+        else:
+            delay_s = max(0, next_wake - _now_ms()) / 1000
+            if self.poll_s:
+                delay_s = min(delay_s, self.poll_s)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -198,8 +243,7 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
-        if not self._store:
-            return
+        self._load_store()
         
         now = _now_ms()
         due_jobs = [
@@ -207,10 +251,10 @@ class CronService:
             if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
         ]
         
+        # Not under the lock: a job's turn may itself add or change jobs
         for job in due_jobs:
             await self._execute_job(job)
-        
-        self._save_store()
+            self._record_run(job)
         self._arm_timer()
     
     async def _execute_job(self, job: CronJob) -> None:
@@ -235,17 +279,31 @@ class CronService:
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
         
-        # Handle one-shot jobs
+        # Handle one-shot jobs (deleted by _record_run if delete_after_run)
         if job.schedule.kind == "at":
-            if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
+            job.enabled = False
+            job.state.next_run_at_ms = None
         else:
             # Compute next run
             job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
     
+    def _record_run(self, job: CronJob) -> None:
+        """Write a finished run into the store, keeping changes made by others while it ran."""
+        with self._locked() as store:
+            current = next((j for j in store.jobs if j.id == job.id), None)
+            if current is None:
+                return  # removed while it ran
+            if job.schedule.kind == "at" and job.delete_after_run:
+                store.jobs.remove(current)
+            else:
+                current.state = job.state
+                current.updated_at_ms = job.updated_at_ms
+                if job.schedule.kind == "at":
+                    current.enabled = False
+                elif not current.enabled:  # disabled while it ran
+                    current.state.next_run_at_ms = None
+            self._save_store()
+
     # ========== Public API ==========
     
     def list_jobs(self, include_disabled: bool = False) -> list[CronJob]:
@@ -265,7 +323,6 @@ class CronService:
         delete_after_run: bool = False,
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
         now = _now_ms()
         
         job = CronJob(
@@ -286,8 +343,9 @@ class CronService:
             delete_after_run=delete_after_run,
         )
         
-        store.jobs.append(job)
-        self._save_store()
+        with self._locked() as store:
+            store.jobs.append(job)
+            self._save_store()
         self._arm_timer()
         
         logger.info(f"Cron: added job '{name}' ({job.id})")
@@ -295,13 +353,14 @@ class CronService:
     
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        with self._locked() as store:
+            before = len(store.jobs)
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            removed = len(store.jobs) < before
+            if removed:
+                self._save_store()
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info(f"Cron: removed job {job_id}")
         
@@ -309,19 +368,19 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        with self._locked() as store:
+            job = next((j for j in store.jobs if j.id == job_id), None)
+            if job is None:
+                return None
+            job.enabled = enabled
+            job.updated_at_ms = _now_ms()
+            if enabled:
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            else:
+                job.state.next_run_at_ms = None
+            self._save_store()
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
@@ -331,7 +390,7 @@ class CronService:
                 if not force and not job.enabled:
                     return False
                 await self._execute_job(job)
-                self._save_store()
+                self._record_run(job)
                 self._arm_timer()
                 return True
         return False
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -21,6 +21,7 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error: Exception | None = field(default=None, repr=False, compare=False)  # What failed, on error responses
     
     @property
     def has_tool_calls(self) -> bool:
@@ -28,6 +29,14 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class StreamDelta:
+    """An incremental piece of a streamed chat completion."""
+    content: str = ""
+    reasoning_content: str = ""
+    response: LLMResponse | None = None  # Complete response, set on the last delta only
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -64,6 +73,53 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Stream a chat completion as incremental deltas.
+
+        Text arrives in `content` deltas as it is generated; the last delta
+        carries the assembled LLMResponse (tool calls, usage, finish reason).
+        Providers without native streaming fall back to a single chat() call.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Yields:
+            StreamDelta items, ending with one whose `response` is set.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        yield StreamDelta(content=response.content or "", response=response)
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        """
+        Count the tokens `text` occupies for a model.
+
+        The default is a rough ~4 characters per token estimate; providers
+        with access to the model's tokenizer should override it.
+        """
+        return (len(text) + 3) // 4
+
+    async def aclose(self) -> None:
+        """Release the provider's resources (connections, files); wrappers close what they wrap."""
+        pass
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -0,0 +1,275 @@
+"""Exact-match response cache for LLM calls, with single-flight deduplication."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+
+# Drop expired rows from the disk tier after this many writes
+PRUNE_EVERY_WRITES = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def no_cache() -> Iterator[None]:
+    """LLM calls made inside this block skip the response cache."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def request_key(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    model: str | None,
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """Canonical hash of a chat request (key order and whitespace don't matter)."""
+    payload = json.dumps(
+        {
+            "messages": messages,
+            "tools": tools or [],
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _encode(response: LLMResponse) -> str:
+    data = asdict(response)
+    data.pop("error", None)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _decode(text: str) -> LLMResponse:
+    data = json.loads(text)
+    data["tool_calls"] = [ToolCallRequest(**tc) for tc in data.get("tool_calls") or []]
+    return LLMResponse(**data)
+
+
+class CachingProvider(LLMProvider):
+    """
+    Returns stored responses for chat requests seen before.
+
+    Requests are keyed by a hash of messages, tools, model, max_tokens and
+    temperature. Responses live in an in-memory LRU of `max_entries` and,
+    with `db_path`, in a SQLite file that survives restarts; both expire
+    after `ttl_s`. Identical requests that arrive while one is in flight
+    share its upstream call.
+
+    Not cached: errors, calls made under no_cache(), and responses calling
+    a tool that isn't in `replayable_tools` (tools with side effects; the
+    model should decide afresh whether to run them). Streamed calls are
+    served from the cache on a hit and stored on a miss, but not
+    deduplicated.
+    """
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        max_entries: int = 256,
+        ttl_s: float = 3600.0,
+        db_path: Path | None = None,
+        replayable_tools: Iterable[str] = (),
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.replayable_tools = set(replayable_tools)
+        self._memory: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+        self._in_flight: dict[str, list] = {}  # key -> [task, waiters]
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.uncacheable = 0
+
+    def _get(self, key: str) -> LLMResponse | None:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if now - entry[0] < self.ttl_s:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._memory[key]
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, data FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or now - row[0] >= self.ttl_s:
+            return None
+        response = _decode(row[1])
+        self._remember(key, row[0], response)
+        self.hits += 1
+        self.disk_hits += 1
+        return response
+
+    def _remember(self, key: str, stored_at: float, response: LLMResponse) -> None:
+        self._memory[key] = (stored_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _cacheable(self, response: LLMResponse) -> bool:
+        if response.finish_reason == "error":
+            return False
+        return all(tc.name in self.replayable_tools for tc in response.tool_calls)
+
+    def _put(self, key: str, response: LLMResponse) -> None:
+        if not self._cacheable(response):
+            self.uncacheable += 1
+            return
+        now = time.time()
+        self._remember(key, now, response)
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, data) VALUES (?, ?, ?)",
+                (key, now, _encode(response)),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY_WRITES == 0:
+                self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.ttl_s,))
+
+    async def _single_flight(self, key: str, call: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        """Run `call` once for all concurrent callers with the same key."""
+        flight = self._in_flight.get(key)
+        if flight is None:
+            task = asyncio.create_task(call())
+            flight = self._in_flight[key] = [task, 0]
+
+            def landed(_: asyncio.Task) -> None:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+
+            task.add_done_callback(landed)
+        else:
+            self.coalesced += 1
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0])
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and not flight[0].done():
+                flight[0].cancel()  # every caller gave up (e.g. cancelled turns)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Answer from the cache, or make (or join) the upstream call and store its response."""
+        kwargs = dict(messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature)
+        if _bypass.get():
+            return await self.inner.chat(**kwargs)
+        key = request_key(**kwargs)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        async def call() -> LLMResponse:
+            self.misses += 1
+            response = await self.inner.chat(**kwargs)
+            self._put(key, response)
+            return response
+
+        return await self._single_flight(key, call)
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream from upstream and store the result; a cache hit is yielded as one delta."""
+        kwargs = dict(messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature)
+        key = None if _bypass.get() else request_key(**kwargs)
+        cached = self._get(key) if key else None
+        if cached is not None:
+            yield StreamDelta(content=cached.content or "", response=cached)
+            return
+        if key:
+            self.misses += 1
+        async with aclosing(self.inner.stream_chat(**kwargs)) as stream:
+            async for delta in stream:
+                if key and delta.response is not None:
+                    self._put(key, delta.response)
+                yield delta
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return self.inner.count_tokens(text, model)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+    async def aclose(self) -> None:
+        """Close the disk tier and the wrapped provider."""
+        self.close()
+        await self.inner.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit, miss and deduplication counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "uncacheable": self.uncacheable,
+        }
@@ -0,0 +1,176 @@
+"""Hedged LLM requests: a duplicate call when the first one is slower than usual."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta
+
+# Latencies kept per model for the hedge delay
+LATENCY_WINDOW = 200
+# Calls per model measured before any hedging (the delay is a guess until then)
+MIN_SAMPLES = 20
+
+
+class HedgedProvider(LLMProvider):
+    """
+    Sends a second copy of a chat call that is taking longer than usual.
+
+    If a call hasn't returned after the `percentile` latency of recent calls
+    to the same model (never less than `min_delay_s`), the same request is
+    sent again to `secondary` (the primary itself by default, optionally
+    with another model). Whichever completes first with a usable response
+    is returned and the other call is cancelled; if one fails, the other is
+    still awaited. Hedges are capped at `max_fraction` of calls so an
+    overloaded provider doesn't get twice the traffic.
+
+    Only chat() is hedged; streams go to the primary as they are. Hedge
+    counts and how often the hedge won are kept in stats().
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        secondary: LLMProvider | None = None,
+        secondary_model: str | None = None,
+        percentile: float = 0.9,
+        min_delay_s: float = 1.0,
+        max_fraction: float = 0.1,
+    ):
+        super().__init__(primary.api_key, primary.api_base)
+        self.primary = primary
+        self.secondary = secondary or primary
+        self.secondary_model = secondary_model
+        self.percentile = percentile
+        self.min_delay_s = min_delay_s
+        self.max_fraction = max_fraction
+        self._latencies: dict[str, deque[float]] = {}
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.capped = 0
+
+    def hedge_delay(self, model: str) -> float | None:
+        """Seconds to wait before hedging a call to `model`; None while there are too few samples."""
+        samples = self._latencies.get(model)
+        if not samples or len(samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay_s, ordered[index])
+
+    def _record(self, model: str, latency: float) -> None:
+        self._latencies.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion request, hedged when it runs long (see class docs)."""
+        key = model or self.primary.get_default_model()
+        self.calls += 1
+        started = time.monotonic()
+        first = asyncio.create_task(self.primary.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ))
+
+        try:
+            delay = self.hedge_delay(key)
+            if delay is not None:
+                done, _ = await asyncio.wait({first}, timeout=delay)
+                if not done and self.hedges >= self.max_fraction * self.calls:
+                    self.capped += 1
+                elif not done:
+                    return await self._hedge(first, key, started, messages, tools, model, max_tokens, temperature)
+
+            response = await first
+            if response.finish_reason != "error":
+                self._record(key, time.monotonic() - started)
+            return response
+        finally:
+            first.cancel()  # no-op once it finished; stops it if our caller was cancelled
+
+    async def _hedge(
+        self,
+        first: asyncio.Task,
+        key: str,
+        started: float,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMResponse:
+        """Race a duplicate of the running call against it; returns the first usable response."""
+        self.hedges += 1
+        logger.debug(f"Hedging LLM call to {key} after {time.monotonic() - started:.1f}s")
+        second = asyncio.create_task(self.secondary.chat(
+            messages=messages,
+            tools=tools,
+            model=self.secondary_model or model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        ))
+        pending = {first, second}
+        response: LLMResponse | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result.finish_reason != "error":
+                        if task is second:
+                            self.hedge_wins += 1
+                        # Time to the answer: a lower bound on the primary's latency if the hedge won
+                        self._record(key, time.monotonic() - started)
+                        return result
+                    response = response or result
+            return response
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream from the primary (streams are not hedged)."""
+        async with aclosing(self.primary.stream_chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )) as stream:
+            async for delta in stream:
+                yield delta
+
+    async def aclose(self) -> None:
+        await self.primary.aclose()
+        if self.secondary is not self.primary:
+            await self.secondary.aclose()
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return self.primary.count_tokens(text, model)
+
+    def get_default_model(self) -> str:
+        return self.primary.get_default_model()
+
+    def stats(self) -> dict[str, Any]:
+        """Hedge counts and win rate, and the current hedge delay per model."""
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges, 3) if self.hedges else 0.0,
+            "capped": self.capped,
+            "delays": {model: self.hedge_delay(model) for model in self._latencies},
+        }
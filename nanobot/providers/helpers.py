@@ -0,0 +1,40 @@
+"""Request and response helpers shared by the LLM providers."""
+
+import json
+from typing import Any
+
+from nanobot.providers.registry import find_by_model
+
+
+def parse_tool_arguments(args: Any) -> dict[str, Any]:
+    """Parse tool call arguments from a JSON string if needed."""
+    if isinstance(args, str):
+        try:
+            return json.loads(args)
+        except json.JSONDecodeError:
+            return {"raw": args}
+    return args
+
+
+def flatten_system_parts(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Join system prompts split into text parts (with cache_control) back into strings."""
+    if not any(m.get("role") == "system" and isinstance(m.get("content"), list) for m in messages):
+        return messages
+    flattened = []
+    for m in messages:
+        if m.get("role") == "system" and isinstance(m.get("content"), list):
+            text = "\n\n---\n\n".join(part.get("text", "") for part in m["content"])
+            m = {**m, "content": text}
+        flattened.append(m)
+    return flattened
+
+
+def apply_model_overrides(model: str, kwargs: dict[str, Any]) -> None:
+    """Apply model-specific parameter overrides from the registry."""
+    model_lower = model.lower()
+    spec = find_by_model(model)
+    if spec:
+        for pattern, overrides in spec.model_overrides:
+            if pattern in model_lower:
+                kwargs.update(overrides)
+                return
@@ -1,14 +1,18 @@
 """LiteLLM provider implementation for multi-provider support."""
 
-import json
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
-from nanobot.providers.registry import find_by_model, find_gateway
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+from nanobot.providers.helpers import (
+    apply_model_overrides,
+    flatten_system_parts,
+    parse_tool_arguments,
+)
+from nanobot.providers.registry import find_by_model, find_gateway, supports_prompt_caching
 
 
 class LiteLLMProvider(LLMProvider):
@@ -46,11 +50,11 @@ class LiteLLMProvider(LLMProvider):
         if api_key:
             self._setup_env(api_key, api_base, default_model)
         
-        if api_base:
-            litellm.api_base = api_base
-        
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
+        # Token counting falls back to bundled tiktoken encodings instead of
+        # fetching HuggingFace tokenizers over the network mid-turn
+        litellm.disable_hf_tokenizer_download = True
     
     def _setup_env(self, api_key: str, api_base: str | None, model: str) -> None:
         """Set environment variables based on detected provider."""
@@ -91,39 +95,21 @@ class LiteLLMProvider(LLMProvider):
         
         return model
     
-    def _apply_model_overrides(self, model: str, kwargs: dict[str, Any]) -> None:
-        """Apply model-specific parameter overrides from the registry."""
-        model_lower = model.lower()
-        spec = find_by_model(model)
-        if spec:
-            for pattern, overrides in spec.model_overrides:
-                if pattern in model_lower:
-                    kwargs.update(overrides)
-                    return
-    
-    async def chat(
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-        
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion() keyword arguments for a request."""
         model = self._resolve_model(model or self.default_model)
         
+        # Drop cache breakpoints the provider wouldn't understand
+        if not supports_prompt_caching(model, self._gateway):
+            messages = flatten_system_parts(messages)
+
         kwargs: dict[str, Any] = {
             "model": model,
             "messages": messages,
@@ -132,7 +118,7 @@ class LiteLLMProvider(LLMProvider):
         }
         
         # Apply model-specific overrides (e.g. kimi-k2.5 temperature)
-        self._apply_model_overrides(model, kwargs)
+        apply_model_overrides(model, kwargs)
         
         # Pass api_key directly to litellm call (avoids relying solely on env vars)
         if self._direct_api_key:
@@ -150,6 +136,31 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
@@ -160,8 +171,110 @@ class LiteLLMProvider(LLMProvider):
             return LLMResponse(
                 content=f"Error calling LLM: {safe_err}",
                 finish_reason="error",
+                error=e,
             )
     
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Stream a chat completion via LiteLLM.
+
+        Yields text deltas as they arrive and assembles tool calls from their
+        fragments; the last delta carries the complete LLMResponse.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        # Tool calls arrive as fragments keyed by index: id/name once, arguments in pieces
+        partial_calls: dict[int, dict[str, str]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta
+                if delta is None:
+                    continue
+
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    slot = partial_calls.setdefault(tc.index or 0, {"id": "", "name": "", "arguments": ""})
+                    if tc.id:
+                        slot["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        slot["name"] = tc.function.name
+                    if tc.function and tc.function.arguments:
+                        slot["arguments"] += tc.function.arguments
+
+                text = delta.content or ""
+                reasoning = getattr(delta, "reasoning_content", None) or ""
+                if text:
+                    content_parts.append(text)
+                if reasoning:
+                    reasoning_parts.append(reasoning)
+                if text or reasoning:
+                    yield StreamDelta(content=text, reasoning_content=reasoning)
+        except Exception as e:
+            from nanobot.security.sanitize import sanitize_error
+            safe_err = sanitize_error(e)
+            yield StreamDelta(
+                response=LLMResponse(content=f"Error calling LLM: {safe_err}", finish_reason="error", error=e),
+            )
+            return
+
+        tool_calls = [
+            ToolCallRequest(
+                id=slot["id"],
+                name=slot["name"],
+                arguments=parse_tool_arguments(slot["arguments"] or "{}"),
+            )
+            for _, slot in sorted(partial_calls.items())
+        ]
+        yield StreamDelta(response=LLMResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage,
+            reasoning_content="".join(reasoning_parts) or None,
+        ))
+
+    @staticmethod
+    def _parse_usage(usage: Any) -> dict[str, int]:
+        """Extract token counts (including prompt cache hits and reasoning) from a LiteLLM usage object."""
+        result = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+        # OpenAI-style details, or Anthropic's cache_read_input_tokens
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or getattr(usage, "cache_read_input_tokens", None)
+        if cached:
+            result["cached_tokens"] = cached
+        cache_write = getattr(usage, "cache_creation_input_tokens", None)
+        if cache_write:
+            result["cache_creation_tokens"] = cache_write
+        reasoning = getattr(getattr(usage, "completion_tokens_details", None), "reasoning_tokens", None)
+        if reasoning:
+            result["reasoning_tokens"] = reasoning
+        return result
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
         choice = response.choices[0]
@@ -170,27 +283,15 @@ class LiteLLMProvider(LLMProvider):
         tool_calls = []
         if hasattr(message, "tool_calls") and message.tool_calls:
             for tc in message.tool_calls:
-                # Parse arguments from JSON string if needed
-                args = tc.function.arguments
-                if isinstance(args, str):
-                    try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
-                        args = {"raw": args}
-                
                 tool_calls.append(ToolCallRequest(
                     id=tc.id,
                     name=tc.function.name,
-                    arguments=args,
+                    arguments=parse_tool_arguments(tc.function.arguments),
                 ))
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
@@ -202,6 +303,13 @@ class LiteLLMProvider(LLMProvider):
             reasoning_content=reasoning_content,
         )
     
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        """Count tokens with LiteLLM's tokenizer for the (resolved) model."""
+        try:
+            return litellm.token_counter(model=self._resolve_model(model or self.default_model), text=text)
+        except Exception:
+            return super().count_tokens(text, model)
+
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
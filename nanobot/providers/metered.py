@@ -0,0 +1,123 @@
+"""Usage accounting layer: records the tokens, latency and cost of every LLM call."""
+
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta
+from nanobot.usage.scope import current_scope
+from nanobot.usage.store import UsageRecord, UsageStore
+
+
+class MeteredProvider(LLMProvider):
+    """
+    Records each upstream LLM call in a UsageStore.
+
+    A record holds the token counts of the response (prompt, completion,
+    cached and reasoning), the call's latency, the model, its cost when
+    LiteLLM knows the model's price, and the session, channel and source
+    of the current usage scope (see nanobot.usage.scope). Failed calls are
+    recorded with error set. Calls that were cancelled before they finished
+    are not recorded, because their token counts are unknown. Records are
+    written (and priced) in a worker thread, off the event loop.
+
+    Wrap each upstream provider, inside the retry, failover and hedging
+    layers, so that every attempt is its own record with the model that
+    was actually called.
+    """
+
+    def __init__(self, inner: LLMProvider, store: UsageStore):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.store = store
+        self._unpriced: set[str] = set()
+
+    def _cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost of a call, 0 for models without a known price."""
+        if model in self._unpriced or not (prompt_tokens or completion_tokens):
+            return 0.0
+        try:
+            from litellm import cost_per_token
+            prompt_cost, completion_cost = cost_per_token(
+                model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+            )
+            return prompt_cost + completion_cost
+        except Exception:
+            self._unpriced.add(model)
+            return 0.0
+
+    async def _record(self, model: str | None, response: LLMResponse, started: float) -> None:
+        # to_thread copies the context, so the call's usage scope goes along
+        latency_ms = int((time.monotonic() - started) * 1000)
+        await asyncio.to_thread(self._write, model, response, latency_ms)
+
+    def _write(self, model: str | None, response: LLMResponse, latency_ms: int) -> None:
+        model = model or self.inner.get_default_model()
+        usage = response.usage
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+        scope = current_scope()
+        try:
+            self.store.record(UsageRecord(
+                session_key=scope.session_key,
+                channel=scope.channel,
+                source=scope.source,
+                label=scope.label,
+                model=model,
+                prompt_tokens=prompt,
+                completion_tokens=completion,
+                cached_tokens=usage.get("cached_tokens", 0),
+                reasoning_tokens=usage.get("reasoning_tokens", 0),
+                latency_ms=latency_ms,
+                cost=self._cost(model, prompt, completion),
+                error=response.finish_reason == "error",
+            ))
+        except Exception as e:
+            # Accounting must never fail a turn
+            logger.warning(f"Failed to record LLM usage: {e}")
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion request and record its usage."""
+        started = time.monotonic()
+        response = await self.inner.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        await self._record(model, response, started)
+        return response
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream a chat completion and record its usage when it completes."""
+        started = time.monotonic()
+        async with aclosing(self.inner.stream_chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )) as stream:
+            async for delta in stream:
+                if delta.response is not None:
+                    await self._record(model, delta.response, started)
+                yield delta
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return self.inner.count_tokens(text, model)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
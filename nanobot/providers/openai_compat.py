@@ -0,0 +1,260 @@
+"""Native provider for OpenAI-compatible endpoints over a pooled HTTP client."""
+
+import importlib.util
+import json
+from typing import Any, AsyncIterator
+
+import httpx
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+from nanobot.providers.helpers import (
+    apply_model_overrides,
+    flatten_system_parts,
+    parse_tool_arguments,
+)
+from nanobot.providers.registry import ProviderSpec, find_gateway, supports_prompt_caching
+
+# Connection pool: LLM calls are long, so keep plenty of idle connections warm
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY_S = 120.0
+
+# Generation can take minutes; connecting should not
+CONNECT_TIMEOUT_S = 10.0
+READ_TIMEOUT_S = 600.0
+
+
+def _parse_usage(usage: dict[str, Any]) -> dict[str, int]:
+    """Token counts (including prompt cache hits and reasoning) from an OpenAI-style usage object."""
+    result = {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens") or usage.get("cache_read_input_tokens")
+    if cached:
+        result["cached_tokens"] = cached
+    cache_write = usage.get("cache_creation_input_tokens")
+    if cache_write:
+        result["cache_creation_tokens"] = cache_write
+    reasoning = (usage.get("completion_tokens_details") or {}).get("reasoning_tokens")
+    if reasoning:
+        result["reasoning_tokens"] = reasoning
+    return result
+
+
+class OpenAICompatProvider(LLMProvider):
+    """
+    LLM provider that talks to OpenAI-compatible endpoints directly.
+
+    Meant for gateways and local servers (registry specs with is_gateway
+    or is_local: OpenRouter, AiHubMix, vLLM), which all speak the OpenAI
+    chat completions API. Requests go over one long-lived httpx client with
+    keep-alive pooling and HTTP/2 (when the h2 package is installed), so
+    the tool iterations of a turn reuse warm connections and skip LiteLLM's
+    per-call model resolution. Responses are parsed like LiteLLMProvider's,
+    including reasoning_content and errors returned as content.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_base: str | None = None,
+        default_model: str = "anthropic/claude-opus-4-5",
+        extra_headers: dict[str, str] | None = None,
+        spec: ProviderSpec | None = None,
+    ):
+        super().__init__(api_key, api_base)
+        self.default_model = default_model
+        self._gateway = spec or find_gateway(api_key, api_base)
+        base_url = api_base or (self._gateway.default_api_base if self._gateway else "")
+        if not base_url:
+            raise ValueError("OpenAICompatProvider needs an api_base")
+
+        headers = {"Content-Type": "application/json", **(extra_headers or {})}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT_S, connect=CONNECT_TIMEOUT_S),
+        )
+
+    def _resolve_model(self, model: str) -> str:
+        """Model name as the endpoint knows it (without LiteLLM routing prefixes)."""
+        if not self._gateway:
+            return model
+        if self._gateway.strip_model_prefix:
+            return model.split("/")[-1]
+        prefix = self._gateway.litellm_prefix
+        if prefix and model.startswith(f"{prefix}/"):
+            return model[len(prefix) + 1:]
+        return model
+
+    def _build_body(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the JSON body of a chat completions request."""
+        model = model or self.default_model
+        if not supports_prompt_caching(model, self._gateway):
+            messages = flatten_system_parts(messages)
+
+        body: dict[str, Any] = {
+            "model": self._resolve_model(model),
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        apply_model_overrides(model, body)
+        if tools:
+            body["tools"] = tools
+            body["tool_choice"] = "auto"
+        return body
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion request to the endpoint."""
+        body = self._build_body(messages, tools, model, max_tokens, temperature)
+        try:
+            r = await self._client.post("/chat/completions", json=body)
+            r.raise_for_status()
+            return self._parse_response(r.json())
+        except Exception as e:
+            return self._error_response(e)
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Stream a chat completion (server-sent events).
+
+        Yields text deltas as they arrive and assembles tool calls from their
+        fragments; the last delta carries the complete LLMResponse.
+        """
+        body = self._build_body(messages, tools, model, max_tokens, temperature)
+        body["stream"] = True
+        body["stream_options"] = {"include_usage": True}
+
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        # Tool calls arrive as fragments keyed by index: id/name once, arguments in pieces
+        partial_calls: dict[int, dict[str, str]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+
+        try:
+            async with self._client.stream("POST", "/chat/completions", json=body) as r:
+                if r.is_error:
+                    await r.aread()
+                    r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if chunk.get("usage"):
+                        usage = _parse_usage(chunk["usage"])
+                    if not chunk.get("choices"):
+                        continue
+                    choice = chunk["choices"][0]
+                    if choice.get("finish_reason"):
+                        finish_reason = choice["finish_reason"]
+                    delta = choice.get("delta") or {}
+
+                    for tc in delta.get("tool_calls") or []:
+                        slot = partial_calls.setdefault(tc.get("index") or 0, {"id": "", "name": "", "arguments": ""})
+                        function = tc.get("function") or {}
+                        if tc.get("id"):
+                            slot["id"] = tc["id"]
+                        if function.get("name"):
+                            slot["name"] = function["name"]
+                        if function.get("arguments"):
+                            slot["arguments"] += function["arguments"]
+
+                    text = delta.get("content") or ""
+                    reasoning = delta.get("reasoning_content") or ""
+                    if text:
+                        content_parts.append(text)
+                    if reasoning:
+                        reasoning_parts.append(reasoning)
+                    if text or reasoning:
+                        yield StreamDelta(content=text, reasoning_content=reasoning)
+        except Exception as e:
+            yield StreamDelta(response=self._error_response(e))
+            return
+
+        tool_calls = [
+            ToolCallRequest(
+                id=slot["id"],
+                name=slot["name"],
+                arguments=parse_tool_arguments(slot["arguments"] or "{}"),
+            )
+            for _, slot in sorted(partial_calls.items())
+        ]
+        yield StreamDelta(response=LLMResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage,
+            reasoning_content="".join(reasoning_parts) or None,
+        ))
+
+    @staticmethod
+    def _error_response(e: Exception) -> LLMResponse:
+        """Report a failed call as content, like LiteLLMProvider (sanitized)."""
+        from nanobot.security.sanitize import sanitize_error
+        return LLMResponse(content=f"Error calling LLM: {sanitize_error(e)}", finish_reason="error", error=e)
+
+    @staticmethod
+    def _parse_response(data: dict[str, Any]) -> LLMResponse:
+        """Parse a chat completions JSON response into our standard format."""
+        choice = data["choices"][0]
+        message = choice.get("message") or {}
+        tool_calls = [
+            ToolCallRequest(
+                id=tc["id"],
+                name=tc["function"]["name"],
+                arguments=parse_tool_arguments(tc["function"].get("arguments") or "{}"),
+            )
+            for tc in message.get("tool_calls") or []
+        ]
+        return LLMResponse(
+            content=message.get("content"),
+            tool_calls=tool_calls,
+            finish_reason=choice.get("finish_reason") or "stop",
+            usage=_parse_usage(data["usage"]) if data.get("usage") else {},
+            reasoning_content=message.get("reasoning_content"),
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    def get_default_model(self) -> str:
+        """Get the default model."""
+        return self.default_model
@@ -51,6 +51,9 @@ class ProviderSpec:
     # per-model param overrides, e.g. (("kimi-k2.5", {"temperature": 1.0}),)
     model_overrides: tuple[tuple[str, dict[str, Any]], ...] = ()
 
+    # honors Anthropic-style "cache_control" breakpoints (gateways: passed through)
+    supports_prompt_caching: bool = False
+
     @property
     def label(self) -> str:
         return self.display_name or self.name.title()
@@ -81,6 +84,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://openrouter.ai/api/v1",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=True,
     ),
 
     # AiHubMix: global gateway, OpenAI-compatible interface.
@@ -101,6 +105,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://aihubmix.com/v1",
         strip_model_prefix=True,            # anthropic/claude-3 → claude-3 → openai/claude-3
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # === Standard providers (matched by model-name keywords) ===============
@@ -121,6 +126,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=True,
     ),
 
     # OpenAI: LiteLLM recognizes "gpt-*" natively, no prefix needed.
@@ -139,6 +145,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # DeepSeek: needs "deepseek/" prefix for LiteLLM routing.
@@ -157,6 +164,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # Gemini: needs "gemini/" prefix for LiteLLM.
@@ -175,6 +183,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # Zhipu: LiteLLM uses "zai/" prefix.
@@ -197,6 +206,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # DashScope: Qwen models, needs "dashscope/" prefix.
@@ -215,6 +225,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # Moonshot: Kimi models, needs "moonshot/" prefix.
@@ -239,6 +250,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         model_overrides=(
             ("kimi-k2.5", {"temperature": 1.0}),
         ),
+        supports_prompt_caching=False,
     ),
 
     # === Local deployment (fallback: unknown api_base → assume local) ======
@@ -261,6 +273,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",                # user must provide in config
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 
     # === Auxiliary (not a primary LLM provider) ============================
@@ -282,6 +295,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_prompt_caching=False,
     ),
 )
 
@@ -315,6 +329,15 @@ def find_gateway(api_key: str | None, api_base: str | None) -> ProviderSpec | No
     return None
 
 
+def supports_prompt_caching(model: str, gateway: ProviderSpec | None = None) -> bool:
+    """Whether cache_control breakpoints can be sent for this model.
+    Via a gateway, both the gateway and the underlying model's provider must support it."""
+    spec = find_by_model(model)
+    if not (spec and spec.supports_prompt_caching):
+        return False
+    return gateway is None or gateway.supports_prompt_caching
+
+
 def find_by_name(name: str) -> ProviderSpec | None:
     """Find a provider spec by config field name, e.g. "dashscope"."""
     for spec in PROVIDERS:
@@ -0,0 +1,334 @@
+"""Resilience wrapper for LLM providers: retries, circuit breakers and failover."""
+
+import asyncio
+import random
+import time
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
+
+import httpx
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, overload, server errors
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+# Statuses that say this provider can't serve us (bad key, no access, unknown model);
+# another provider may
+FAILOVER_STATUSES = {401, 402, 403, 404}
+
+# Error classes (see classify_error)
+RETRY = "retry"
+FAILOVER = "failover"
+FATAL = "fatal"  # the request itself is bad (e.g. 400); no provider will do better
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _status_code(error: BaseException) -> int | None:
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    return status if isinstance(status, int) else None
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds the server asked us to wait (Retry-After / retry-after-ms), if it said."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "litellm_response_headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException | None) -> str:
+    """RETRY, FAILOVER or FATAL for the exception behind an error response."""
+    if error is None:
+        return RETRY  # an error response without details: assume transient
+    status = _status_code(error)
+    if status is not None:
+        if status in RETRYABLE_STATUSES:
+            return RETRY
+        return FAILOVER if status in FAILOVER_STATUSES else FATAL
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return RETRY
+    name = type(error).__name__
+    # LiteLLM exceptions without a status (connection failures, timeouts)
+    if "Timeout" in name or "Connection" in name or "ServiceUnavailable" in name:
+        return RETRY
+    return FATAL
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing provider for a while.
+
+    After `threshold` consecutive failures the breaker opens and calls are
+    refused for `cooldown_s`; then one trial call is let through (half
+    open). Its success closes the breaker, its failure opens it again. A
+    call that ends without either (cancelled) must be settled with
+    release(), which gives the trial slot back.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown_s: float = 30.0):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be made now; call only right before making it (takes the trial slot)."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_s:
+            self.state = HALF_OPEN
+            return True
+        return self.state == CLOSED
+
+    def success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+
+    def release(self) -> None:
+        """Settle a call that neither succeeded nor failed: an unfinished trial leaves the slot free."""
+        if self.state == HALF_OPEN:
+            self.state = OPEN  # cooldown already passed, so the next call is the new trial
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class ChainMember:
+    """One provider in a failover chain."""
+    name: str
+    provider: LLMProvider
+    model: str | None = None  # model to ask this provider for (None = the requested one)
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Wraps an ordered chain of providers to ride out upstream trouble.
+
+    Error responses are classified by their exception (see classify_error).
+    Transient errors are retried on the same provider up to `max_retries`
+    times, with exponential backoff and full jitter, or after the delay the
+    server asked for in Retry-After (if that is longer than `max_delay_s`,
+    the provider is given up on instead). Errors that are about the
+    provider rather than the request, retries that ran out and providers
+    whose circuit breaker is open move the call to the next provider in
+    the chain. Bad requests are returned right away.
+
+    A stream is only retried or failed over before its first delta has
+    been passed on. Counters per provider and for recoveries (a call that
+    succeeded after a failure) and failovers are kept in stats().
+    """
+
+    def __init__(
+        self,
+        chain: list[ChainMember],
+        max_retries: int = 2,
+        base_delay_s: float = 0.5,
+        max_delay_s: float = 30.0,
+    ):
+        if not chain:
+            raise ValueError("ResilientProvider needs at least one provider")
+        primary = chain[0].provider
+        super().__init__(primary.api_key, primary.api_base)
+        self.chain = chain
+        self.max_retries = max_retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.recovered = 0
+        self.failovers = 0
+        self.exhausted = 0
+
+    def _delay(self, attempt: int, error: BaseException | None) -> float | None:
+        """Seconds to wait before retry number `attempt` (0-based); None to give up on this provider."""
+        requested = retry_after(error) if error else None
+        if requested is not None:
+            return requested if requested <= self.max_delay_s else None
+        return random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+
+    def _succeeded(self, index: int, member: ChainMember, attempt: int) -> None:
+        member.breaker.success()
+        if attempt or index:
+            self.recovered += 1
+        if index:
+            self.failovers += 1
+            logger.info(f"LLM call served by failover provider {member.name}")
+
+    def _failed(self, member: ChainMember, response: LLMResponse) -> str:
+        """Record a failed call; returns its error class."""
+        kind = classify_error(response.error)
+        if kind == FATAL:
+            member.breaker.success()  # the provider answered; the request was bad
+        else:
+            member.failures += 1
+            member.breaker.failure()
+        return kind
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send a chat completion request through the chain (see class docs)."""
+        response: LLMResponse | None = None
+        for index, member in enumerate(self.chain):
+            for attempt in range(self.max_retries + 1):
+                if not member.breaker.allow():
+                    break
+                member.calls += 1
+                settled = False
+                try:
+                    response = await member.provider.chat(
+                        messages=messages,
+                        tools=tools,
+                        model=member.model or model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+                    settled = True
+                finally:
+                    if not settled:  # cancelled (superseded turn, lost hedge) or raised
+                        member.breaker.release()
+                if response.finish_reason != "error":
+                    self._succeeded(index, member, attempt)
+                    return response
+                kind = self._failed(member, response)
+                if kind == FATAL:
+                    return response
+                delay = self._delay(attempt, response.error)
+                if kind != RETRY or attempt == self.max_retries or delay is None:
+                    break
+                member.retries += 1
+                logger.warning(f"LLM call to {member.name} failed ({response.content}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            logger.warning(f"LLM provider {member.name} unavailable, trying the next one")
+
+        self.exhausted += 1
+        return response or LLMResponse(
+            content="Error calling LLM: all providers are unavailable", finish_reason="error"
+        )
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream a chat completion through the chain (see class docs)."""
+        failed: StreamDelta | None = None
+        for index, member in enumerate(self.chain):
+            for attempt in range(self.max_retries + 1):
+                if not member.breaker.allow():
+                    break
+                member.calls += 1
+                started = False
+                failed = None
+                final: LLMResponse | None = None
+                settled = False
+                try:
+                    # aclosing: a stream abandoned for a retry releases its connection first
+                    async with aclosing(member.provider.stream_chat(
+                        messages=messages,
+                        tools=tools,
+                        model=member.model or model,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )) as stream:
+                        async for delta in stream:
+                            if delta.response and delta.response.finish_reason == "error" and not started:
+                                failed = delta
+                                break
+                            started = True
+                            final = delta.response or final
+                            yield delta
+                    settled = True
+                finally:
+                    if not settled:  # closed by our consumer or cancelled
+                        member.breaker.release()
+                if failed is None:
+                    if final is not None and final.finish_reason == "error":
+                        self._failed(member, final)  # broke off mid-stream: too late to retry
+                    else:
+                        self._succeeded(index, member, attempt)
+                    return
+                kind = self._failed(member, failed.response)
+                if kind == FATAL:
+                    yield failed
+                    return
+                delay = self._delay(attempt, failed.response.error)
+                if kind != RETRY or attempt == self.max_retries or delay is None:
+                    break
+                member.retries += 1
+                logger.warning(f"LLM stream from {member.name} failed, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            logger.warning(f"LLM provider {member.name} unavailable, trying the next one")
+
+        self.exhausted += 1
+        if failed is None:
+            text = "Error calling LLM: all providers are unavailable"
+            failed = StreamDelta(response=LLMResponse(content=text, finish_reason="error"))
+        yield failed
+
+    async def aclose(self) -> None:
+        for member in self.chain:
+            await member.provider.aclose()
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return self.chain[0].provider.count_tokens(text, model)
+
+    def get_default_model(self) -> str:
+        return self.chain[0].provider.get_default_model()
+
+    def stats(self) -> dict[str, Any]:
+        """Per-provider counters and breaker state, plus recovery and failover totals."""
+        return {
+            "providers": {
+                m.name: {
+                    "calls": m.calls,
+                    "failures": m.failures,
+                    "retries": m.retries,
+                    "breaker": m.breaker.state,
+                    "breaker_trips": m.breaker.trips,
+                }
+                for m in self.chain
+            },
+            "recovered": self.recovered,
+            "failovers": self.failovers,
+            "exhausted": self.exhausted,
+        }
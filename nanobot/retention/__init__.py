@@ -0,0 +1,5 @@
+"""Retention service for sessions, media and temp files."""
+
+from nanobot.retention.service import RetentionService
+
+__all__ = ["RetentionService"]
@@ -0,0 +1,239 @@
+"""Retention service - expires old sessions, downloaded media and temp files."""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.manager import SessionManager
+
+# Default interval: 1 hour
+DEFAULT_RETENTION_INTERVAL_S = 60 * 60
+
+
+@dataclass
+class SweepResult:
+    """What one retention pass removed (or would remove) in one category."""
+    removed: list[str] = field(default_factory=list)  # session keys or file paths
+    freed_bytes: int = 0
+    remaining_bytes: int = 0  # size of what is left (files only)
+
+
+def _scan(paths: list[Path], pattern: str) -> list[tuple[float, int, Path]]:
+    """(mtime, size, path) of the regular files matching `pattern` directly in `paths`."""
+    files = []
+    for directory in paths:
+        if not directory.is_dir():
+            continue
+        for path in directory.glob(pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                files.append((st.st_mtime, st.st_size, path))
+    return files
+
+
+def _sweep(
+    files: list[tuple[float, int, Path]],
+    max_age_s: float,
+    max_bytes: int,
+    limit: int,
+    dry_run: bool,
+) -> SweepResult:
+    """
+    Remove files older than max_age_s, then the oldest ones until the rest fit in max_bytes.
+
+    At most `limit` files are removed per call (0 = no limit); the rest are
+    left for the next pass. max_age_s/max_bytes of 0 disable that quota.
+    """
+    files = sorted(files, key=lambda f: f[0])
+    total = sum(size for _, size, _ in files)
+    cutoff = time.time() - max_age_s
+    result = SweepResult()
+
+    for mtime, size, path in files:
+        if limit and len(result.removed) >= limit:
+            break
+        too_old = max_age_s and mtime < cutoff
+        over_quota = max_bytes and total > max_bytes
+        if not (too_old or over_quota):
+            break  # oldest first: nothing newer is too old either
+        if not dry_run:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Retention: could not remove {path}: {e}")
+                continue
+        result.removed.append(str(path))
+        result.freed_bytes += size
+        total -= size
+
+    result.remaining_bytes = total
+    return result
+
+
+class RetentionService:
+    """
+    Periodic janitor that keeps the data directory from growing without bound.
+
+    Each pass expires sessions not updated in `session_days`, removes
+    downloaded media (~/.nanobot/media) older than `media_days` and then the
+    oldest media until the rest fits in `media_max_bytes`, and removes temp
+    files left behind by interrupted atomic writes. Deletions are done in
+    batches of at most `batch_size` per category per pass. Counters are kept
+    in status() and written to retention.json in the data directory after
+    every pass, so `nanobot retention status` can show them.
+    """
+
+    def __init__(
+        self,
+        sessions: SessionManager,
+        data_dir: Path,
+        interval_s: int = DEFAULT_RETENTION_INTERVAL_S,
+        session_days: int = 30,
+        media_days: int = 30,
+        media_max_bytes: int = 1024 * 1024 * 1024,
+        temp_hours: int = 24,
+        batch_size: int = 500,
+        enabled: bool = True,
+    ):
+        self.sessions = sessions
+        self.data_dir = data_dir
+        self.interval_s = interval_s
+        self.session_days = session_days
+        self.media_days = media_days
+        self.media_max_bytes = media_max_bytes
+        self.temp_hours = temp_hours
+        self.batch_size = batch_size
+        self.enabled = enabled
+        self._running = False
+        self._task: asyncio.Task | None = None
+        self._stats: dict[str, Any] = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_duration_s": 0.0,
+            "removed": {"sessions": 0, "media": 0, "temp": 0},
+            "freed_bytes": {"media": 0, "temp": 0},
+            "media_bytes": 0,
+        }
+
+    @property
+    def media_dir(self) -> Path:
+        return self.data_dir / "media"
+
+    @property
+    def metrics_file(self) -> Path:
+        return self.data_dir / "retention.json"
+
+    async def start(self) -> None:
+        """Start the retention service."""
+        if not self.enabled:
+            logger.info("Retention disabled")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"Retention started (every {self.interval_s}s)")
+
+    def stop(self) -> None:
+        """Stop the retention service."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        """Main retention loop."""
+        while self._running:
+            try:
+                await asyncio.sleep(self.interval_s)
+                if self._running:
+                    await self._tick()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Retention error: {e}")
+
+    async def _tick(self) -> None:
+        """Run one pass; store and file scans and deletions happen off the event loop."""
+        started = time.monotonic()
+        expired = []
+        if self.session_days:
+            expired = await self.sessions.expire_sessions_async(self.session_days, limit=self.batch_size)
+        results = {"sessions": SweepResult(removed=expired)}
+        results.update(await asyncio.to_thread(self.sweep_files))
+        self._record(results, time.monotonic() - started)
+
+    def run_once(self, dry_run: bool = False) -> dict[str, SweepResult]:
+        """Run one pass synchronously (dry_run: report without deleting anything)."""
+        started = time.monotonic()
+        results = {"sessions": self.sweep_sessions(dry_run)}
+        results.update(self.sweep_files(dry_run))
+        if not dry_run:
+            self._record(results, time.monotonic() - started)
+        return results
+
+    def sweep_sessions(self, dry_run: bool = False) -> SweepResult:
+        """Expire sessions not updated in session_days."""
+        if not self.session_days:
+            return SweepResult()
+        expired = self.sessions.expire_sessions(self.session_days, limit=self.batch_size, dry_run=dry_run)
+        return SweepResult(removed=expired)
+
+    def sweep_files(self, dry_run: bool = False) -> dict[str, SweepResult]:
+        """Apply the media quotas and remove stale temp files."""
+        media = _sweep(
+            _scan([self.media_dir], "*"),
+            max_age_s=self.media_days * 86400,
+            max_bytes=self.media_max_bytes,
+            limit=self.batch_size,
+            dry_run=dry_run,
+        )
+        # mkstemp leftovers from atomic writes of the config and session files
+        temp = _sweep(
+            _scan([self.data_dir, self.data_dir / "sessions"], "*.tmp"),
+            max_age_s=self.temp_hours * 3600,
+            max_bytes=0,
+            limit=self.batch_size,
+            dry_run=dry_run,
+        )
+        return {"media": media, "temp": temp}
+
+    def _record(self, results: dict[str, SweepResult], duration_s: float) -> None:
+        """Update the counters and export them."""
+        stats = self._stats
+        stats["runs"] += 1
+        stats["last_run_at"] = time.time()
+        stats["last_duration_s"] = round(duration_s, 3)
+        for name, result in results.items():
+            stats["removed"][name] += len(result.removed)
+            if name in stats["freed_bytes"]:
+                stats["freed_bytes"][name] += result.freed_bytes
+        stats["media_bytes"] = results["media"].remaining_bytes
+
+        removed = {name: len(r.removed) for name, r in results.items() if r.removed}
+        if removed:
+            logger.info(f"Retention: removed {removed}")
+        self._export()
+
+    def _export(self) -> None:
+        """Write status() to retention.json (atomically)."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.data_dir), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp_path, self.metrics_file)
+        except OSError as e:
+            logger.warning(f"Retention: could not write {self.metrics_file}: {e}")
+
+    def status(self) -> dict[str, Any]:
+        """Get service status and counters."""
+        return {"enabled": self._running, **self._stats}
@@ -1,5 +1,8 @@
 """Session management module."""
 
-from nanobot.session.manager import SessionManager, Session
+from nanobot.session.base import Message, Session, SessionStore
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+from nanobot.session.sqlite_store import SqliteSessionStore
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "Message", "SessionStore", "JsonlSessionStore", "SqliteSessionStore"]
@@ -0,0 +1,260 @@
+"""Session model and the session store interface."""
+
+import json
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+# Session limits
+MAX_MESSAGE_SIZE = 100 * 1024  # 100KB per message
+MAX_MESSAGES_PER_SESSION = 1000
+SESSION_EXPIRY_DAYS = 30
+
+# Estimated bytes of a Message record besides its strings (object, slots, list slot)
+MESSAGE_OVERHEAD_BYTES = 120
+
+
+class Message:
+    """
+    A stored chat message.
+
+    A compact record instead of a dict: fixed slots, interned role strings,
+    and fields other than role/content/timestamp kept only when present.
+    The {"role", "content"} dict sent to the LLM is built on first use and
+    reused afterwards.
+    """
+
+    __slots__ = ("role", "content", "timestamp", "extra", "tokens", "size", "_llm")
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        timestamp: str = "",
+        extra: dict[str, Any] | None = None,
+        tokens: dict[str, int] | None = None,
+    ):
+        self.role = sys.intern(role)
+        self.content = content
+        self.timestamp = timestamp
+        self.extra = extra or None
+        self.tokens = tokens  # token count per model (see agent/packing.py)
+        self.size = (
+            MESSAGE_OVERHEAD_BYTES + sys.getsizeof(content) + sys.getsizeof(timestamp)
+            + (len(json.dumps(extra)) if extra else 0)
+        )
+        self._llm: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Message":
+        """Build a message from its persisted form."""
+        extra = {k: v for k, v in data.items() if k not in ("role", "content", "timestamp", "tokens")}
+        return cls(
+            role=data.get("role", "user"),
+            content=data.get("content") or "",
+            timestamp=data.get("timestamp", ""),
+            extra=extra,
+            tokens=data.get("tokens") if isinstance(data.get("tokens"), dict) else None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Persisted form (the historical message dict)."""
+        data: dict[str, Any] = {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+        if self.extra:
+            data.update(self.extra)
+        if self.tokens:
+            data["tokens"] = self.tokens
+        return data
+
+    def llm_dict(self) -> dict[str, Any]:
+        """The message in LLM format (role and content); built once, then shared."""
+        if self._llm is None:
+            self._llm = {"role": self.role, "content": self.content}
+        return self._llm
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content[:40]!r})"
+
+
+@dataclass
+class Session:
+    """
+    A conversation session.
+
+    Stores messages in JSONL format for easy reading and persistence.
+    """
+
+    key: str  # channel:chat_id
+    messages: list[Message] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    summary: str = ""  # Rolling summary of turns compacted out of messages
+
+    # Changes since the last save, used by stores that save incrementally:
+    # leading messages already persisted, how many of those were dropped
+    # since, and whether the session was cleared
+    _saved_count: int = field(default=0, repr=False, compare=False)
+    # Older persisted messages not loaded into `messages` (tail-only loading)
+    _unloaded: int = field(default=0, repr=False, compare=False)
+    _trimmed: int = field(default=0, repr=False, compare=False)
+    _cleared: bool = field(default=False, repr=False, compare=False)
+
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        """Add a message to the session, enforcing limits."""
+        # Enforce message size limit
+        if len(content.encode("utf-8")) > MAX_MESSAGE_SIZE:
+            content = content[:MAX_MESSAGE_SIZE] + "\n... (truncated)"
+
+        self.messages.append(Message(role, content, datetime.now().isoformat(), extra=kwargs))
+        self.updated_at = datetime.now()
+
+        # Enforce max messages per session (counting ones not loaded)
+        total = self._unloaded + len(self.messages)
+        if total > MAX_MESSAGES_PER_SESSION:
+            self.drop_oldest(total - MAX_MESSAGES_PER_SESSION)
+
+    def drop_oldest(self, count: int) -> None:
+        """Drop the oldest `count` messages (unloaded ones first)."""
+        if count <= 0:
+            return
+        from_unloaded = min(count, self._unloaded)
+        self._unloaded -= from_unloaded
+        rest = count - from_unloaded
+        self.messages = self.messages[rest:]
+        persisted = min(rest, self._saved_count)
+        self._saved_count -= persisted
+        self._trimmed += from_unloaded + persisted
+
+    def page_in(self, older: list[Message]) -> None:
+        """Prepend the older messages left out by a tail-only load (see SessionStore.read_older)."""
+        self.messages = older + self.messages
+        self._saved_count += len(older)
+        self._unloaded = 0
+
+    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+        """
+        Get message history for LLM context.
+
+        Args:
+            max_messages: Maximum messages to return.
+
+        Returns:
+            List of messages in LLM format.
+        """
+        # Get recent messages
+        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+
+        # LLM format (just role and content)
+        return [m.llm_dict() for m in recent]
+
+    def clear(self) -> None:
+        """Clear all messages (and the summary of older ones) in the session."""
+        self.messages = []
+        self.summary = ""
+        self.updated_at = datetime.now()
+        self._saved_count = 0
+        self._unloaded = 0
+        self._trimmed = 0
+        self._cleared = True
+
+    def resident_bytes(self) -> int:
+        """Estimated memory held by the session's messages and summary."""
+        return (
+            sum(m.size for m in self.messages)
+            + sys.getsizeof(self.summary)
+            + len(json.dumps(self.metadata))
+        )
+
+    def snapshot(self) -> "Session":
+        """
+        Detach a copy carrying the unsaved changes and mark this session saved.
+
+        The copy can then be saved from another thread while this session
+        keeps changing (see SessionManager write-behind).
+        """
+        snap = Session(
+            key=self.key,
+            messages=list(self.messages),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            metadata=dict(self.metadata),
+            summary=self.summary,
+        )
+        snap._saved_count = self._saved_count
+        snap._unloaded = self._unloaded
+        snap._trimmed = self._trimmed
+        snap._cleared = self._cleared
+        self.mark_saved()
+        return snap
+
+    def mark_saved(self) -> None:
+        """Record that the stored session now matches memory."""
+        self._saved_count = len(self.messages)
+        self._trimmed = 0
+        self._cleared = False
+
+
+class SessionStore(ABC):
+    """
+    Persistence backend for sessions.
+
+    Stores may save incrementally using the session's change tracking
+    (see Session.mark_saved); they must call mark_saved() after each save.
+    Stores that load only the newest messages record how many older ones
+    were left out in Session._unloaded and read them with read_older().
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Session | None:
+        """Load a session, or None if it doesn't exist (expiry is up to expire())."""
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a session. Returns True if it existed."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions (key, created_at, updated_at), most recently updated first."""
+        pass
+
+    @abstractmethod
+    def expire(self, before: datetime, limit: int = 0, dry_run: bool = False) -> list[str]:
+        """
+        Delete sessions last updated before `before`, oldest first.
+
+        At most `limit` sessions are deleted (0 = all); with dry_run nothing
+        is deleted. Returns the keys of the (would-be) deleted sessions.
+        """
+        pass
+
+    def read_older(self, key: str, unloaded: int, saved: int) -> list[Message]:
+        """
+        Read the `unloaded` messages stored before a session's newest `saved` ones.
+
+        Changes nothing, so it can run on another thread while the session
+        keeps changing (see SessionManager.page_in_older).
+        """
+        return []
+
+    def load_older(self, session: Session) -> None:
+        """Page in the older messages a tail-only load left out."""
+        if session._unloaded:
+            session.page_in(self.read_older(session.key, session._unloaded, session._saved_count))
+
+    def evict(self, key: str) -> None:
+        """Drop any per-session state kept for a session leaving the cache."""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+        pass
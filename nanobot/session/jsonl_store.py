@@ -0,0 +1,418 @@
+"""JSONL file session store (one file per session)."""
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from loguru import logger
+
+from nanobot.security.validators import safe_filename
+from nanobot.session.base import Message, Session, SessionStore
+from nanobot.utils.helpers import ensure_dir
+
+# Journal mode: rewrite a session file once this share of its lines is dead
+JOURNAL_COMPACT_RATIO = 0.5
+JOURNAL_COMPACT_MIN_LINES = 64
+
+# Block size for reading session files backwards (tail-only loading)
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def _reverse_lines(f: BinaryIO, start: int) -> Iterator[bytes]:
+    """Yield the non-empty lines of a binary file after offset `start`, last first."""
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    buf = b""
+    while pos > start:
+        size = min(READ_BLOCK_SIZE, pos - start)
+        pos -= size
+        f.seek(pos)
+        buf = f.read(size) + buf
+        lines = buf.split(b"\n")
+        buf = lines.pop(0)
+        for line in reversed(lines):
+            if line.strip():
+                yield line
+    if buf.strip():
+        yield buf
+
+
+@dataclass
+class _JournalState:
+    """What a journal-mode session file holds beyond its live messages."""
+    lines: int  # total lines in the file
+    size: int  # file size in bytes
+    summary: str  # last summary written
+    summary_at: int | None  # byte offset of the line holding that summary
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Stores each session as a JSONL file in the sessions directory.
+
+    By default every save rewrites the whole file. In journal mode a save
+    appends only what changed since the previous one (new messages, trim or
+    clear markers, summary updates) plus a metadata trailer with a single
+    write; the file is compacted by a full rewrite once most of its lines
+    are dead. Loading replays either format.
+
+    With tail_messages set, journal files are read backwards and only the
+    newest messages are parsed; older ones are paged in on demand with
+    load_older(). Rewrites need the whole session, so this pays off together
+    with journal mode.
+    """
+
+    def __init__(
+        self,
+        sessions_dir: Path,
+        journal: bool = False,
+        fsync: bool = False,
+        tail_messages: int = 0,
+    ):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self.journal = journal
+        self.fsync = fsync
+        self.tail_messages = tail_messages
+        self._journal_state: dict[str, _JournalState] = {}
+
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def evict(self, key: str) -> None:
+        self._journal_state.pop(key, None)
+
+    def load(self, key: str) -> Session | None:
+        """Load a session from disk (only its newest messages in tail mode)."""
+        path = self._get_session_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            loaded = self._read_tail(path) if self.tail_messages else None
+            session, state = loaded or self._read_full(path)
+            session.key = key
+            self._journal_state[key] = state
+            return session
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    def read(self, key: str) -> Session | None:
+        """Read a whole session without touching the store's state or files (for migration)."""
+        path = self._get_session_path(key)
+        if not path.exists():
+            return None
+        try:
+            session, _ = self._read_full(path)
+        except Exception as e:
+            logger.warning(f"Failed to read session {key}: {e}")
+            return None
+        session.key = key
+        return session
+
+    def _read_full(self, path: Path) -> tuple[Session, _JournalState]:
+        """Replay a whole session file."""
+        messages = []
+        metadata = {}
+        created_at = None
+        updated_at = None
+        summary = ""
+        summary_at = None
+        lines = 0
+        offset = 0
+
+        with open(path, "rb") as f:
+            for raw in f:
+                line_at = offset
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+
+                data = json.loads(raw)
+                lines += 1
+                entry_type = data.get("_type")
+
+                if entry_type == "metadata":
+                    metadata = data.get("metadata", {})
+                    created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+                    updated_at = datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
+                elif entry_type == "meta":
+                    metadata = data.get("metadata", metadata)
+                    if data.get("updated_at"):
+                        updated_at = datetime.fromisoformat(data["updated_at"])
+                elif entry_type == "summary":
+                    summary = data.get("content", "")
+                    summary_at = line_at
+                elif entry_type == "trim":
+                    del messages[:data.get("count", 0)]
+                elif entry_type == "clear":
+                    messages = []
+                    summary = ""
+                    summary_at = None
+                else:
+                    messages.append(Message.from_dict(data))
+
+        session = Session(
+            key="",
+            messages=messages,
+            created_at=created_at or datetime.now(),
+            updated_at=updated_at or created_at or datetime.now(),
+            metadata=metadata,
+            summary=summary,
+        )
+        session.mark_saved()
+        return session, _JournalState(lines=lines, size=offset, summary=summary, summary_at=summary_at)
+
+    def _read_tail(self, path: Path) -> tuple[Session, _JournalState] | None:
+        """
+        Read the header and the newest messages of a journal file, backwards.
+
+        Journal files end with a meta trailer recording the live message
+        count, line count, current metadata and where the current summary
+        is. Since trims only ever drop the oldest messages, the live messages
+        are the last `count` message lines, so the backward scan stops after
+        the newest ones. Returns None for files without such a trailer.
+        """
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("_type") != "metadata":
+                return None
+            entries = _reverse_lines(f, f.tell())
+
+            trailer = json.loads(next(entries, b"{}"))
+            if trailer.get("_type") != "meta" or "count" not in trailer:
+                return None
+
+            live = trailer["count"]
+            wanted = min(self.tail_messages, live)
+            messages: list[Message] = []
+            for line in entries:
+                if len(messages) >= wanted:
+                    break
+                data = json.loads(line)
+                if "_type" not in data:
+                    messages.append(Message.from_dict(data))
+            if len(messages) < wanted:
+                return None  # trailer doesn't match the file; replay it instead
+            messages.reverse()
+
+            summary = ""
+            summary_at = trailer.get("summary_at")
+            if summary_at is not None:
+                f.seek(summary_at)
+                summary = json.loads(f.readline()).get("content", "")
+            size = f.seek(0, os.SEEK_END)
+
+        session = Session(
+            key="",
+            messages=messages,
+            created_at=datetime.fromisoformat(header["created_at"]) if header.get("created_at") else datetime.now(),
+            updated_at=datetime.fromisoformat(trailer["updated_at"]) if trailer.get("updated_at") else datetime.now(),
+            metadata=trailer.get("metadata", header.get("metadata", {})),
+            summary=summary,
+        )
+        session.mark_saved()
+        session._unloaded = live - len(messages)
+        state = _JournalState(lines=trailer["lines"], size=size, summary=summary, summary_at=summary_at)
+        return session, state
+
+    def read_older(self, key: str, unloaded: int, saved: int) -> list[Message]:
+        """Read the older messages left out by a tail-only load."""
+        full, _ = self._read_full(self._get_session_path(key))
+        # On disk: [... unloaded, saved prefix of session.messages]
+        end = len(full.messages) - saved
+        return full.messages[end - unloaded:end]
+
+    def save(self, session: Session) -> None:
+        """Save a session to disk (append in journal mode, atomic rewrite otherwise)."""
+        path = self._get_session_path(session.key)
+        state = self._journal_state.get(session.key)
+
+        if self.journal and state is not None and path.exists():
+            self._append(session, path, state)
+            live = len(session.messages) + session._unloaded + 2 + (1 if session.summary else 0)
+            if state.lines >= JOURNAL_COMPACT_MIN_LINES and 1 - live / state.lines > JOURNAL_COMPACT_RATIO:
+                logger.debug(f"Compacting session journal {session.key} ({state.lines} lines, {live} live)")
+                self._rewrite(session, path)
+        else:
+            self._rewrite(session, path)
+
+    def _trailer(self, session: Session, lines: int, summary_at: int | None) -> bytes:
+        """Meta line closing every journal write (see _read_tail)."""
+        return (json.dumps({
+            "_type": "meta",
+            "updated_at": session.updated_at.isoformat(),
+            "count": session._unloaded + len(session.messages),
+            "lines": lines,
+            "summary_at": summary_at,
+            "metadata": session.metadata,
+        }) + "\n").encode()
+
+    def _append(self, session: Session, path: Path, state: _JournalState) -> None:
+        """Append the changes since the last save to the session file."""
+        entries: list[dict[str, Any]] = []
+        if session._cleared:
+            entries.append({"_type": "clear"})
+            state.summary, state.summary_at = "", None
+        elif session._trimmed:
+            entries.append({"_type": "trim", "count": session._trimmed})
+        entries.extend(m.to_dict() for m in session.messages[session._saved_count:])
+
+        chunks = [(json.dumps(entry) + "\n").encode() for entry in entries]
+        offset = state.size + sum(len(c) for c in chunks)
+        if session.summary != state.summary:
+            chunks.append((json.dumps({"_type": "summary", "content": session.summary}) + "\n").encode())
+            state.summary, state.summary_at = session.summary, offset if session.summary else None
+        chunks.append(self._trailer(session, state.lines + len(chunks) + 1, state.summary_at))
+
+        data = b"".join(chunks)
+        with open(path, "ab") as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        state.lines += len(chunks)
+        state.size += len(data)
+        session.mark_saved()
+
+    def _rewrite(self, session: Session, path: Path) -> None:
+        """Write the whole session file atomically (temp file + rename)."""
+        self.load_older(session)
+
+        # Metadata first, then the rolling summary of compacted turns (if any), then messages
+        chunks = [(json.dumps({
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata
+        }) + "\n").encode()]
+        summary_at = None
+        if session.summary:
+            summary_at = len(chunks[0])
+            chunks.append((json.dumps({"_type": "summary", "content": session.summary}) + "\n").encode())
+        chunks.extend((json.dumps(msg.to_dict()) + "\n").encode() for msg in session.messages)
+        if self.journal:
+            # Trailer that lets tail-only loads skip the rest of the file
+            chunks.append(self._trailer(session, len(chunks) + 1, summary_at))
+        data = b"".join(chunks)
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.journal and self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            os.replace(tmp_path, str(path))
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        session.mark_saved()
+        self._journal_state[session.key] = _JournalState(
+            lines=len(chunks), size=len(data), summary=session.summary, summary_at=summary_at
+        )
+
+    def delete(self, key: str) -> bool:
+        """Delete a session file."""
+        self._journal_state.pop(key, None)
+        path = self._get_session_path(key)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+    def _read_header(self, path: Path) -> dict[str, Any] | None:
+        """Read the metadata line of a session file."""
+        try:
+            with open(path) as f:
+                first_line = f.readline().strip()
+            data = json.loads(first_line) if first_line else None
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) and data.get("_type") == "metadata" else None
+
+    def iter_keys(self) -> Iterator[str]:
+        """Keys of all stored sessions (from the file header, else the file name)."""
+        for path in self.sessions_dir.glob("*.jsonl"):
+            header = self._read_header(path)
+            if header is not None:
+                yield header.get("key") or path.stem.replace("_", ":", 1)
+
+    def _read_trailer(self, path: Path) -> dict[str, Any] | None:
+        """Read the meta trailer (last line) of a journal file, if it has one."""
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(next(_reverse_lines(f, 0), b"{}"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) and data.get("_type") == "meta" else None
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions by reading the metadata line (and journal trailer) of every file."""
+        sessions = []
+        for path in self.sessions_dir.glob("*.jsonl"):
+            data = self._read_header(path)
+            if data is not None:
+                # Journal appends leave the header's updated_at stale: the trailer has the
+                # current one, else the file's mtime (as expire() uses)
+                updated_at = data.get("updated_at")
+                if self.journal:
+                    trailer = self._read_trailer(path) or {}
+                    updated_at = trailer.get("updated_at") or self._mtime_iso(path) or updated_at
+                sessions.append({
+                    "key": data.get("key") or path.stem.replace("_", ":"),
+                    "created_at": data.get("created_at"),
+                    "updated_at": updated_at,
+                    "path": str(path)
+                })
+
+        return sorted(sessions, key=lambda x: x.get("updated_at") or "", reverse=True)
+
+    @staticmethod
+    def _mtime_iso(path: Path) -> str | None:
+        try:
+            return datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        except OSError:
+            return None
+
+    def expire(self, before: datetime, limit: int = 0, dry_run: bool = False) -> list[str]:
+        """Delete session files not written since `before` (by file mtime), oldest first."""
+        cutoff = before.timestamp()
+        candidates = []
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if mtime < cutoff:
+                candidates.append((mtime, path))
+        candidates.sort()
+        if limit:
+            candidates = candidates[:limit]
+
+        expired = []
+        for _, path in candidates:
+            header = self._read_header(path)
+            key = (header or {}).get("key") or path.stem.replace("_", ":", 1)
+            if not dry_run:
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                self._journal_state.pop(key, None)
+            expired.append(key)
+        return expired
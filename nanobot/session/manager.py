@@ -1,103 +1,114 @@
 """Session management for conversation history."""
 
-import json
-import os
-import tempfile
+import asyncio
+import threading
 from collections import OrderedDict
-from pathlib import Path
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir
-from nanobot.security.validators import safe_filename
+# Session and its limits are re-exported here for existing imports
+from nanobot.session.base import (  # noqa: F401
+    MAX_MESSAGE_SIZE,
+    MAX_MESSAGES_PER_SESSION,
+    SESSION_EXPIRY_DAYS,
+    Message,
+    Session,
+    SessionStore,
+)
+from nanobot.session.jsonl_store import JsonlSessionStore
 
-# Session limits
-MAX_MESSAGE_SIZE = 100 * 1024  # 100KB per message
-MAX_MESSAGES_PER_SESSION = 1000
 MAX_CACHED_SESSIONS = 100
-SESSION_EXPIRY_DAYS = 30
-
-
-@dataclass
-class Session:
-    """
-    A conversation session.
-
-    Stores messages in JSONL format for easy reading and persistence.
-    """
-
-    key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    metadata: dict[str, Any] = field(default_factory=dict)
-
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session, enforcing limits."""
-        # Enforce message size limit
-        if len(content.encode("utf-8")) > MAX_MESSAGE_SIZE:
-            content = content[:MAX_MESSAGE_SIZE] + "\n... (truncated)"
-
-        msg = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        self.messages.append(msg)
-        self.updated_at = datetime.now()
-
-        # Enforce max messages per session
-        if len(self.messages) > MAX_MESSAGES_PER_SESSION:
-            self.messages = self.messages[-MAX_MESSAGES_PER_SESSION:]
-
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
-        """
-        Get message history for LLM context.
-
-        Args:
-            max_messages: Maximum messages to return.
-
-        Returns:
-            List of messages in LLM format.
-        """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
-
-    def clear(self) -> None:
-        """Clear all messages in the session."""
-        self.messages = []
-        self.updated_at = datetime.now()
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # estimated resident size of cached sessions
 
 
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
-    Uses LRU cache with bounded size.
+    Sessions are kept in an LRU cache bounded by count and by estimated
+    resident bytes (see Session.resident_bytes), and persisted through
+    a SessionStore: JSONL files in ~/.nanobot/sessions by default (optionally
+    in append-only journal mode), or any other store passed in.
+
+    With flush_interval set, saves are write-behind: save() only marks the
+    session dirty, and dirty sessions are written at most once per interval
+    on a dedicated thread, so encoding and file I/O stay off the event loop.
+    Each write works on a snapshot taken on the loop (Session.snapshot), and
+    sessions with unwritten changes are never evicted from the cache, so
+    loads always see the latest state. flush() forces a write; close()
+    writes everything still pending.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        journal: bool = False,
+        fsync: bool = False,
+        store: SessionStore | None = None,
+        tail_messages: int = 0,
+        cache_bytes: int = MAX_CACHE_BYTES,
+        flush_interval: float = 0,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
+        self.store = store or JsonlSessionStore(
+            Path.home() / ".nanobot" / "sessions",
+            journal=journal,
+            fsync=fsync,
+            tail_messages=tail_messages,
+        )
+        self.cache_bytes = cache_bytes
         self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._cache_size = 0
+
+        # Write-behind state: sessions changed since their last snapshot, and
+        # snapshots handed to the flusher thread but not yet written, per key
+        self.flush_interval = flush_interval
+        self._dirty: dict[str, Session] = {}
+        self._pending: dict[str, list[Session]] = {}
+        self._pending_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # held while the flusher writes
+        self._flush_task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _remember(self, session: Session) -> None:
+        """Put a session at the hot end of the cache, re-measuring its size."""
+        size = session.resident_bytes()
+        self._cache_size += size - self._sizes.get(session.key, 0)
+        self._sizes[session.key] = size
+        self._cache[session.key] = session
+        self._cache.move_to_end(session.key)
+        self._evict_cache()
 
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+    def _forget(self, key: str) -> None:
+        """Drop a session from the cache."""
+        self._cache.pop(key, None)
+        self._cache_size -= self._sizes.pop(key, 0)
 
     def _evict_cache(self) -> None:
-        """Evict oldest entries if cache exceeds max size."""
-        while len(self._cache) > MAX_CACHED_SESSIONS:
-            self._cache.popitem(last=False)
+        """Evict oldest entries while the cache is over its count or byte budget."""
+        while len(self._cache) > 1 and (
+            len(self._cache) > MAX_CACHED_SESSIONS or self._cache_size > self.cache_bytes
+        ):
+            # Sessions with unwritten changes stay until the flusher has saved them
+            key = next((k for k in self._cache if k not in self._dirty and k not in self._pending), None)
+            if key is None:
+                break
+            self._forget(key)
+            self.store.evict(key)
+            logger.debug(f"Evicted session {key} from cache ({self._cache_size} bytes resident)")
+
+    def cache_stats(self) -> dict[str, int]:
+        """Cached session count and estimated resident bytes."""
+        return {
+            "sessions": len(self._cache),
+            "bytes": self._cache_size,
+            "budget_bytes": self.cache_bytes,
+        }
 
     def get_or_create(self, key: str) -> Session:
         """
@@ -114,90 +125,134 @@ class SessionManager:
             self._cache.move_to_end(key)
             return self._cache[key]
 
-        # Try to load from disk
-        session = self._load(key)
+        # Try to load from the store
+        session = self.store.load(key)
         if session is None:
             session = Session(key=key)
 
-        self._cache[key] = session
-        self._evict_cache()
+        self._remember(session)
         return session
 
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-
-        if not path.exists():
-            return None
-
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
-
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
-
-            session = Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata
-            )
-
-            # Check expiry
-            if session.updated_at < datetime.now() - timedelta(days=SESSION_EXPIRY_DAYS):
-                logger.info(f"Session {key} expired, creating new")
-                path.unlink(missing_ok=True)
-                return None
-
-            return session
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
-
     def save(self, session: Session) -> None:
-        """Save a session to disk using atomic write."""
-        path = self._get_session_path(session.key)
-
-        # Atomic write: temp file + rename
-        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        """Persist a session through the store (or mark it dirty, with write-behind)."""
+        if not self.flush_interval:
+            self.store.save(session)
+            self._remember(session)
+            return
+
+        self._dirty[session.key] = session
+        self._remember(session)
         try:
-            with os.fdopen(fd, "w") as f:
-                # Write metadata first
-                metadata_line = {
-                    "_type": "metadata",
-                    "created_at": session.created_at.isoformat(),
-                    "updated_at": session.updated_at.isoformat(),
-                    "metadata": session.metadata
-                }
-                f.write(json.dumps(metadata_line) + "\n")
-
-                # Write messages
-                for msg in session.messages:
-                    f.write(json.dumps(msg) + "\n")
-
-            os.replace(tmp_path, str(path))
-        except Exception:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to flush from later: write through
+            self._write(self._take_dirty([session.key]))
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Write everything that got dirty during one flush interval."""
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self, *keys: str) -> None:
+        """
+        Write the given sessions (all dirty ones if none given) now.
+
+        The write runs on the flusher thread; this waits for it to finish.
+        """
+        batch = self._take_dirty(keys or list(self._dirty))
+        if not batch:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-flush")
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._write, batch)
+
+    async def reset(self, key: str) -> int:
+        """Clear a session's history and write it now; returns the number of messages cleared."""
+        session = self.get_or_create(key)
+        cleared = len(session.messages)
+        session.clear()
+        self.save(session)
+        await self.flush(key)
+        return cleared
+
+    def _take_dirty(self, keys: list[str]) -> list[str]:
+        """Snapshot dirty sessions into the pending queues; returns the keys to write."""
+        batch = []
+        for key in keys:
+            session = self._dirty.pop(key, None)
+            if session is None:
+                continue
+            snap = session.snapshot()
+            with self._pending_lock:
+                self._pending.setdefault(key, []).append(snap)
+            batch.append(key)
+        return batch
+
+    def _write(self, keys: list[str]) -> None:
+        """Save the pending snapshots of `keys` in order (flusher thread)."""
+        with self._io_lock:
+            for key in keys:
+                self._write_pending(key)
+
+    def _write_pending(self, key: str) -> None:
+        """Save the queued snapshots of one session. Caller holds _io_lock."""
+        while True:
+            with self._pending_lock:
+                queue = self._pending.get(key)
+                if not queue:
+                    self._pending.pop(key, None)
+                    return
+                snap = queue[0]
             try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-            raise
+                self.store.save(snap)
+            except Exception as e:
+                # Left queued: the next flush of this session retries it first
+                logger.error(f"Failed to save session {key}: {e}")
+                return
+            with self._pending_lock:
+                queue.pop(0)
+
+    def load_older(self, session: Session) -> None:
+        """Page in the older history of a session loaded tail-only."""
+        if self.flush_interval and session._unloaded:
+            # Paging is relative to what is on disk, so write pending changes first
+            self._take_dirty([session.key])
+            with self._io_lock:
+                self._write_pending(session.key)
+        self.store.load_older(session)
+        if session.key in self._cache:
+            self._remember(session)
+
+    async def page_in_older(self, session: Session) -> bool:
+        """
+        load_older() with the disk read on a worker thread.
 
-        self._cache[session.key] = session
-        self._evict_cache()
+        The read works from the session's counters as they were when it
+        started; if the session was saved, trimmed or cleared meanwhile,
+        nothing is paged in and False is returned.
+        """
+        if not session._unloaded:
+            return True
+        if self.flush_interval:
+            self._take_dirty([session.key])
+        unloaded, saved = session._unloaded, session._saved_count
+
+        def read() -> list[Message]:
+            with self._io_lock:
+                # Paging is relative to what is on disk, so write pending changes first
+                self._write_pending(session.key)
+                return self.store.read_older(session.key, unloaded, saved)
+
+        older = await asyncio.to_thread(read)
+        if (session._unloaded, session._saved_count) != (unloaded, saved):
+            return False
+        session.page_in(older)
+        if session.key in self._cache:
+            self._remember(session)
+        return True
 
     def delete(self, key: str) -> bool:
         """
@@ -209,40 +264,99 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
-        self._cache.pop(key, None)
-
-        # Remove file
-        path = self._get_session_path(key)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
+        # Remove from cache and drop unwritten changes
+        self._forget(key)
+        self._dirty.pop(key, None)
+        with self._io_lock:
+            with self._pending_lock:
+                self._pending.pop(key, None)
+            return self.store.delete(key)
 
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
 
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
+        """
+        return self.store.list_sessions()
+
+    def expire_sessions(
+        self,
+        days: int = SESSION_EXPIRY_DAYS,
+        limit: int = 0,
+        dry_run: bool = False,
+        owns: Callable[[str], bool] | None = None,
+    ) -> list[str]:
         """
-        sessions = []
+        Delete sessions not updated in `days` days, oldest first.
 
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
+        Args:
+            days: Age after which a session expires.
+            limit: Max sessions to delete in this call (0 = all).
+            dry_run: Only report what would be deleted.
+            owns: Only expire the sessions it accepts (a gateway worker's own).
 
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        Returns:
+            Keys of the expired sessions.
+        """
+        before = datetime.now() - timedelta(days=days)
+        expired = self._expire_stored(before, limit, dry_run, owns)
+        if not dry_run:
+            self._forget_expired(expired)
+        return expired
+
+    async def expire_sessions_async(
+        self,
+        days: int = SESSION_EXPIRY_DAYS,
+        limit: int = 0,
+        owns: Callable[[str], bool] | None = None,
+    ) -> list[str]:
+        """expire_sessions() with the store scan and deletions on a worker thread."""
+        before = datetime.now() - timedelta(days=days)
+        expired = await asyncio.to_thread(self._expire_stored, before, limit, False, owns)
+        self._forget_expired(expired)
+        return expired
+
+    def _expire_stored(
+        self, before: datetime, limit: int, dry_run: bool, owns: Callable[[str], bool] | None
+    ) -> list[str]:
+        """Delete expired sessions from the store and drop their pending writes (any thread)."""
+        with self._io_lock:
+            if owns is None:
+                expired = self.store.expire(before, limit=limit, dry_run=dry_run)
+            else:
+                stale = self.store.expire(before, dry_run=True)
+                # The store may not have this process's latest writes yet: trust the cached copy
+                expired = [key for key in stale if owns(key) and not self._updated_since(key, before)]
+                expired = expired[:limit or None]
+                if not dry_run:
+                    for key in expired:
+                        self.store.delete(key)
+            if not dry_run:
+                with self._pending_lock:
+                    for key in expired:
+                        self._pending.pop(key, None)
+        return expired
+
+    def _updated_since(self, key: str, before: datetime) -> bool:
+        """Whether the cached copy of a session was updated at or after `before`."""
+        cached = self._cache.get(key)
+        return cached is not None and cached.updated_at >= before
+
+    def _forget_expired(self, keys: list[str]) -> None:
+        """Drop expired sessions from the cache and their unsaved changes (event loop)."""
+        for key in keys:
+            self._forget(key)
+            self._dirty.pop(key, None)
+
+    def close(self) -> None:
+        """Write all unsaved changes, stop the flusher thread and close the store."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._take_dirty(list(self._dirty))
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._write(list(self._pending))
+        self.store.close()
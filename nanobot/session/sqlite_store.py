@@ -0,0 +1,197 @@
+"""SQLite session store (single database in WAL mode)."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.base import Message, Session, SessionStore
+from nanobot.session.jsonl_store import JsonlSessionStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    summary TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL REFERENCES sessions (key) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Stores all sessions in one SQLite database.
+
+    Sessions are rows indexed by key and updated_at; messages are rows keyed
+    by (session key, seq). Saves are incremental: only messages added since
+    the last save are inserted, and dropped or cleared ones are deleted, in a
+    single transaction. Listing and expiry are indexed queries instead of
+    directory scans. With tail_messages set, only the newest messages are
+    loaded and older ones are paged in on demand with load_older().
+    """
+
+    def __init__(self, db_path: Path, tail_messages: int = 0):
+        self.db_path = db_path
+        self.tail_messages = tail_messages
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, key: str) -> Session | None:
+        """Load a session and its messages."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, updated_at, metadata, summary FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.tail_messages:
+                (total,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM messages WHERE session_key = ?", (key,)
+                ).fetchone()
+                rows = self._conn.execute(
+                    "SELECT data FROM messages WHERE session_key = ? ORDER BY seq DESC LIMIT ?",
+                    (key, self.tail_messages),
+                ).fetchall()
+                messages = [Message.from_dict(json.loads(data)) for (data,) in reversed(rows)]
+            else:
+                messages = [
+                    Message.from_dict(json.loads(data)) for (data,) in self._conn.execute(
+                        "SELECT data FROM messages WHERE session_key = ? ORDER BY seq", (key,)
+                    )
+                ]
+                total = len(messages)
+
+        session = Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(row[0]),
+            updated_at=datetime.fromisoformat(row[1]),
+            metadata=json.loads(row[2]),
+            summary=row[3],
+        )
+        session.mark_saved()
+        session._unloaded = total - len(messages)
+        return session
+
+    def save(self, session: Session) -> None:
+        """Save the changes since the last save in one transaction."""
+        key = session.key
+        # A session never saved here (or cleared) is written out in full
+        full = session._saved_count == 0 and not session._trimmed and not session._unloaded
+        new = session.messages if full else session.messages[session._saved_count:]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO sessions (key, created_at, updated_at, metadata, summary) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "updated_at = excluded.updated_at, metadata = excluded.metadata, "
+                    "summary = excluded.summary",
+                    (key, session.created_at.isoformat(), session.updated_at.isoformat(),
+                     json.dumps(session.metadata), session.summary),
+                )
+                if full:
+                    self._conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+                elif session._trimmed:
+                    self._conn.execute(
+                        "DELETE FROM messages WHERE session_key = ? AND seq IN "
+                        "(SELECT seq FROM messages WHERE session_key = ? ORDER BY seq LIMIT ?)",
+                        (key, key, session._trimmed),
+                    )
+                (last,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), -1) FROM messages WHERE session_key = ?", (key,)
+                ).fetchone()
+                self._conn.executemany(
+                    "INSERT INTO messages (session_key, seq, data) VALUES (?, ?, ?)",
+                    [(key, last + 1 + i, json.dumps(m.to_dict())) for i, m in enumerate(new)],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        session.mark_saved()
+
+    def read_older(self, key: str, unloaded: int, saved: int) -> list[Message]:
+        """Read the older messages left out by a tail-only load."""
+        # Stored: [... unloaded, saved prefix of session.messages]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_key = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (key, unloaded, saved),
+            ).fetchall()
+        return [Message.from_dict(json.loads(data)) for (data,) in reversed(rows)]
+
+    def delete(self, key: str) -> bool:
+        """Delete a session and its messages."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions from the updated_at index."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [{"key": k, "created_at": c, "updated_at": u} for k, c, u in rows]
+
+    def expire(self, before: datetime, limit: int = 0, dry_run: bool = False) -> list[str]:
+        """Delete sessions last updated before `before`, oldest first (messages cascade)."""
+        cutoff = before.isoformat()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                keys = [k for (k,) in self._conn.execute(
+                    "SELECT key FROM sessions WHERE updated_at < ? ORDER BY updated_at LIMIT ?",
+                    (cutoff, limit or -1),
+                )]
+                if not dry_run:
+                    self._conn.executemany("DELETE FROM sessions WHERE key = ?", [(k,) for k in keys])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return keys
+
+    def is_empty(self) -> bool:
+        """True if the database holds no sessions."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_jsonl_sessions(source: JsonlSessionStore, target: SqliteSessionStore) -> int:
+    """
+    Copy every JSONL session into the SQLite store.
+
+    The JSONL files are left in place. Returns the number of sessions copied.
+    """
+    count = 0
+    for key in source.iter_keys():
+        session = source.read(key)
+        if session is None:
+            continue
+        session._saved_count = 0  # force a full write into the new store
+        target.save(session)
+        count += 1
+    return count
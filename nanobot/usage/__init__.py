@@ -0,0 +1,6 @@
+"""Token usage and cost accounting for LLM calls."""
+
+from nanobot.usage.scope import UsageScope, current_scope, set_scope, set_source
+from nanobot.usage.store import UsageRecord, UsageStore
+
+__all__ = ["UsageRecord", "UsageScope", "UsageStore", "current_scope", "set_scope", "set_source"]
@@ -0,0 +1,40 @@
+"""What an LLM call is being made for (session, channel, source), per task."""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+
+# Sources of LLM calls
+TURN = "turn"  # a chat message
+DIRECT = "direct"  # process_direct() without a priority (CLI)
+CRON = "cron"
+HEARTBEAT = "heartbeat"
+SYSTEM = "system"  # subagent announcements
+SUBAGENT = "subagent"
+COMPACTION = "compaction"
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    """Attribution of the LLM calls made by the current task."""
+    session_key: str = ""
+    channel: str = ""
+    source: str = DIRECT
+    label: str = ""  # Cron job session or subagent id
+
+
+_scope: ContextVar[UsageScope] = ContextVar("usage_scope", default=UsageScope())
+
+
+def set_scope(session_key: str, channel: str, source: str, label: str = "") -> None:
+    """Attribute the current task's LLM calls (tasks it starts inherit this)."""
+    _scope.set(UsageScope(session_key, channel, source, label))
+
+
+def set_source(source: str, label: str | None = None) -> None:
+    """Keep the current session and channel but change the source (and label)."""
+    scope = _scope.get()
+    _scope.set(replace(scope, source=source, label=scope.label if label is None else label))
+
+
+def current_scope() -> UsageScope:
+    return _scope.get()
@@ -0,0 +1,138 @@
+"""Embedded store of LLM usage records (SQLite, WAL mode)."""
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    session_key TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    source TEXT NOT NULL,
+    label TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    reasoning_tokens INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    error INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usage_session_ts ON usage (session_key, ts);
+CREATE INDEX IF NOT EXISTS usage_ts ON usage (ts);
+"""
+
+# Column (or expression) each rollup groups by, and the source it is limited to
+GROUPS: dict[str, tuple[str, str | None]] = {
+    "session": ("session_key", None),
+    "channel": ("channel", None),
+    "model": ("model", None),
+    "source": ("source", None),
+    "day": ("date(ts, 'unixepoch', 'localtime')", None),
+    "cron": ("label", "cron"),
+    "subagent": ("label", "subagent"),
+}
+
+
+@dataclass
+class UsageRecord:
+    """One LLM call."""
+    session_key: str
+    channel: str
+    source: str
+    label: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    reasoning_tokens: int = 0
+    latency_ms: int = 0
+    cost: float = 0.0  # USD, 0 when the model's price is unknown
+    error: bool = False
+    ts: float = field(default_factory=time.time)
+
+
+class UsageStore:
+    """
+    Token usage and cost of every LLM call, rolled up on demand.
+
+    Shared by the gateway and its worker processes (one SQLite file in WAL
+    mode). Records older than `keep_days` are deleted when the store is
+    opened.
+    """
+
+    def __init__(self, db_path: Path, keep_days: int = 90):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if keep_days:
+            self._conn.execute("DELETE FROM usage WHERE ts < ?", (time.time() - keep_days * 86400,))
+
+    def record(self, rec: UsageRecord) -> None:
+        """Append one call's usage."""
+        row = asdict(rec)
+        row["error"] = int(rec.error)
+        columns = ", ".join(row)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO usage ({columns}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values()),
+            )
+
+    def session_tokens(self, session_key: str, since: float = 0.0) -> int:
+        """Prompt plus completion tokens used by a session since `since` (epoch seconds)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(prompt_tokens + completion_tokens), 0) FROM usage "
+                "WHERE session_key = ? AND ts >= ?",
+                (session_key, since),
+            ).fetchone()
+        return row[0]
+
+    def summary(self, by: str = "session", since: float = 0.0, limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        Usage rolled up by session, channel, model, source, day, cron job or subagent.
+
+        Rows are ordered by total tokens, largest first.
+        """
+        if by not in GROUPS:
+            raise ValueError(f"Unknown grouping {by!r} (use one of: {', '.join(GROUPS)})")
+        column, source = GROUPS[by]
+        where, params = "ts >= ?", [since]
+        if source:
+            where += " AND source = ?"
+            params.append(source)
+        query = (
+            f"SELECT {column} AS name, COUNT(*) AS calls, SUM(error) AS errors, "
+            "SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens, "
+            "SUM(cached_tokens) AS cached_tokens, SUM(reasoning_tokens) AS reasoning_tokens, "
+            "SUM(prompt_tokens + completion_tokens) AS total_tokens, "
+            "ROUND(SUM(cost), 6) AS cost, CAST(AVG(latency_ms) AS INTEGER) AS avg_latency_ms "
+            f"FROM usage WHERE {where} GROUP BY name ORDER BY total_tokens DESC"
+        )
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+    def records(self, since: float = 0.0) -> Iterator[dict[str, Any]]:
+        """All records since `since`, oldest first (for export)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM usage WHERE ts >= ? ORDER BY id", (since,)).fetchall()
+        for row in rows:
+            yield dict(row)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
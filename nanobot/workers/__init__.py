@@ -0,0 +1,6 @@
+"""Agent worker processes for the multi-process gateway."""
+
+from nanobot.workers.ring import HashRing
+from nanobot.workers.supervisor import WorkerPool
+
+__all__ = ["HashRing", "WorkerPool"]
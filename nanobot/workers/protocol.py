@@ -0,0 +1,35 @@
+"""Frames exchanged between the gateway and its workers over a Unix socket."""
+
+import asyncio
+import json
+from typing import Any
+
+# Largest frame accepted (a message with its media paths and metadata)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+Frame = dict[str, Any]
+
+
+def encode_frame(frame: Frame) -> bytes:
+    """One frame as a line of JSON."""
+    return json.dumps(frame, default=str, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_frame(line: bytes) -> Frame:
+    return json.loads(line)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Frame | None:
+    """Next frame from the peer, or None once it closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    return decode_frame(line)
+
+
+async def open_connection(path: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.open_unix_connection(path, limit=MAX_FRAME_BYTES)
+
+
+async def start_server(callback: Any, path: str) -> asyncio.AbstractServer:
+    return await asyncio.start_unix_server(callback, path, limit=MAX_FRAME_BYTES)
@@ -0,0 +1,34 @@
+"""Consistent hashing of sessions onto workers."""
+
+import bisect
+import hashlib
+
+# Points per worker on the ring; more points spread sessions more evenly
+VIRTUAL_NODES = 64
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Maps keys onto nodes by consistent hashing.
+
+    Each node owns VIRTUAL_NODES points on the ring and a key belongs to
+    the first point at or after its hash. The mapping depends only on the
+    node names, so every process computes the same owner for a key, and
+    adding or removing a node moves only the keys of that node.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = VIRTUAL_NODES):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        """The node that owns `key`."""
+        i = bisect.bisect_left(self._hashes, _hash(key))
+        return self._nodes[i % len(self._nodes)]
@@ -0,0 +1,288 @@
+"""Gateway side of the worker mode: routes sessions to worker processes and keeps them running."""
+
+import asyncio
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import message_to_dict, outbound_from_dict
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import turn_key
+from nanobot.workers.protocol import Frame, encode_frame, read_frame, start_server
+from nanobot.workers.ring import HashRing
+
+# Frames kept per worker while it is down; beyond that inbound messages are dropped
+MAX_BACKLOG = 1000
+
+# Restart delay after a crash, doubled per consecutive crash up to the max
+RESTART_BACKOFF_S = 1.0
+MAX_RESTART_BACKOFF_S = 30.0
+# A worker that ran this long before exiting starts again with the initial delay
+STABLE_RUN_S = 60.0
+
+# Grace period for workers to finish writing sessions on shutdown
+STOP_TIMEOUT_S = 10.0
+
+
+class WorkerError(RuntimeError):
+    """A request to a worker failed or the worker exited before answering."""
+
+
+class WorkerPool:
+    """
+    Runs the agent in `workers` child processes (`nanobot worker`).
+
+    The gateway keeps the channels, cron and heartbeat; run() takes inbound
+    messages off the bus and forwards each to the worker that owns its
+    session, chosen by consistent hashing on the session key, so a session's
+    turns always run in one process and in order. Workers send their
+    outbound messages back over the same socket and they are published on
+    the gateway's bus. Frames for a worker that is down (crashed, restarting)
+    are kept until it reconnects.
+
+    Each worker is supervised: when it exits it is started again after a
+    backoff delay that grows while it keeps crashing.
+    """
+
+    def __init__(
+        self,
+        bus: MessageBus,
+        workers: int,
+        socket_path: Path,
+        max_backlog: int = MAX_BACKLOG,
+    ):
+        if workers < 1:
+            raise ValueError("WorkerPool needs at least one worker")
+        self.bus = bus
+        self.workers = workers
+        self.socket_path = socket_path
+        self.max_backlog = max_backlog
+        self.ring = HashRing([str(i) for i in range(workers)])
+        self._running = False
+        self._server: asyncio.AbstractServer | None = None
+        self._supervisors: list[asyncio.Task] = []
+        self._procs: dict[int, asyncio.subprocess.Process] = {}
+        self._writers: dict[int, asyncio.StreamWriter] = {}
+        self._send_locks = [asyncio.Lock() for _ in range(workers)]
+        self._backlog: list[deque[Frame]] = [deque() for _ in range(workers)]
+        self._requests: dict[int, tuple[int, asyncio.Future]] = {}  # id -> (worker, future)
+        self._in_flight: list[set[int]] = [set() for _ in range(workers)]
+        self._ids = itertools.count(1)
+        self.restarts = [0] * workers
+        self.routed = [0] * workers
+        self.dropped = 0
+
+    def worker_for(self, key: str) -> int:
+        """Index of the worker that owns session `key`."""
+        return int(self.ring.node_for(key))
+
+    def command_for(self, index: int) -> list[str]:
+        """Command line that starts worker `index`."""
+        return [
+            sys.executable, "-m", "nanobot", "worker",
+            "--index", str(index), "--workers", str(self.workers), "--socket", str(self.socket_path),
+        ]
+
+    async def start(self) -> None:
+        """Listen on the socket and start the workers."""
+        self._running = True
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)  # left over from a previous run
+        self._server = await start_server(self._on_connect, str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self._supervisors = [asyncio.create_task(self._supervise(i)) for i in range(self.workers)]
+        logger.info(f"Started {self.workers} agent workers")
+
+    async def run(self) -> None:
+        """Forward inbound messages from the bus to their workers until stop()."""
+        while self._running:
+            try:
+                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            index = self.worker_for(turn_key(msg))
+            self.routed[index] += 1
+            await self._send(index, {"type": "inbound", "msg": message_to_dict(msg)})
+
+    async def stop(self) -> None:
+        """Stop the workers (they write their sessions first) and the socket server."""
+        self._running = False
+        for task in self._supervisors:
+            task.cancel()
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+        for proc in self._procs.values():
+            if proc.returncode is None:
+                proc.terminate()
+        for index, proc in self._procs.items():
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=STOP_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                logger.warning(f"Worker {index} did not stop in time, killing it")
+                proc.kill()
+        if self._server:
+            self._server.close()
+        for _, future in list(self._requests.values()):
+            if not future.done():
+                future.set_exception(WorkerError("Gateway is shutting down"))
+        self._requests.clear()
+        self.socket_path.unlink(missing_ok=True)
+
+    async def process_direct(
+        self,
+        content: str,
+        session_key: str = "cli:direct",
+        channel: str = "cli",
+        chat_id: str = "direct",
+        priority: str | None = None,
+    ) -> str:
+        """Run a direct turn (see AgentLoop.process_direct) on the worker owning the session."""
+        # The turn runs in session channel:chat_id; session_key only labels it (cron:<id>, heartbeat)
+        return await self._request(self.worker_for(f"{channel}:{chat_id}"), {
+            "type": "direct",
+            "content": content,
+            "session_key": session_key,
+            "channel": channel,
+            "chat_id": chat_id,
+            "priority": priority,
+        })
+
+    async def reset(self, key: str) -> int:
+        """Clear a session on the worker that caches it; returns the number of messages cleared."""
+        return await self._request(self.worker_for(key), {"type": "reset", "session_key": key})
+
+    async def _request(self, index: int, frame: Frame) -> Any:
+        """Send a request frame and wait for the worker's result."""
+        frame["id"] = request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = (index, future)
+        try:
+            await self._send(index, frame)
+            return await future
+        finally:
+            self._requests.pop(request_id, None)
+            self._in_flight[index].discard(request_id)
+
+    async def _send(self, index: int, frame: Frame) -> None:
+        """Write a frame to a worker, or keep it for when the worker (re)connects."""
+        async with self._send_locks[index]:
+            writer = self._writers.get(index)
+            if writer is not None:
+                try:
+                    await self._write(index, writer, frame)
+                    return
+                except ConnectionError:
+                    pass  # the reader side notices and cleans up
+            backlog = self._backlog[index]
+            if len(backlog) >= self.max_backlog:
+                self.dropped += 1
+                logger.warning(f"Worker {index} backlog full, {frame['type']} frame dropped")
+                self._fail(frame, WorkerError(f"Worker {index} is not available"))
+                return
+            backlog.append(frame)
+
+    async def _write(self, index: int, writer: asyncio.StreamWriter, frame: Frame) -> None:
+        if "id" in frame:
+            self._in_flight[index].add(frame["id"])
+        writer.write(encode_frame(frame))
+        await writer.drain()
+
+    def _fail(self, frame: Frame, error: Exception) -> None:
+        """Fail the waiting caller of a request frame (no-op for other frames)."""
+        request = self._requests.get(frame.get("id"))
+        if request and not request[1].done():
+            request[1].set_exception(error)
+
+    async def _supervise(self, index: int) -> None:
+        """Keep worker `index` running, restarting it with backoff when it exits."""
+        backoff = RESTART_BACKOFF_S
+        while self._running:
+            started = time.monotonic()
+            proc = await asyncio.create_subprocess_exec(*self.command_for(index))
+            self._procs[index] = proc
+            code = await proc.wait()
+            if not self._running:
+                return
+            self.restarts[index] += 1
+            if time.monotonic() - started > STABLE_RUN_S:
+                backoff = RESTART_BACKOFF_S
+            logger.warning(f"Worker {index} exited with code {code}, restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF_S)
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one worker connection: register it, then relay what it sends."""
+        try:
+            hello = await read_frame(reader)
+        except (ConnectionError, ValueError):
+            hello = None
+        index = hello.get("worker") if isinstance(hello, dict) else None
+        if not isinstance(index, int) or hello.get("type") != "hello" or not 0 <= index < self.workers:
+            logger.warning(f"Rejected worker connection with hello {hello!r}")
+            writer.close()
+            return
+        async with self._send_locks[index]:
+            backlog = self._backlog[index]
+            while backlog:
+                await self._write(index, writer, backlog[0])
+                backlog.popleft()
+            self._writers[index] = writer
+        logger.info(f"Worker {index} ready (pid {hello.get('pid')})")
+
+        try:
+            while (frame := await read_frame(reader)) is not None:
+                await self._handle(frame)
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Worker {index} connection error: {e}")
+        finally:
+            if self._writers.get(index) is writer:
+                del self._writers[index]
+            for request_id in self._in_flight[index]:
+                self._fail({"id": request_id}, WorkerError(f"Worker {index} exited before answering"))
+            self._in_flight[index].clear()
+            writer.close()
+
+    async def _handle(self, frame: Frame) -> None:
+        """Act on a frame from a worker."""
+        kind = frame.get("type")
+        if kind == "outbound":
+            msg = outbound_from_dict(frame["msg"])
+            if msg.is_partial:
+                self.bus.publish_partial(msg)
+            else:
+                await self.bus.publish_outbound(msg)
+        elif kind == "result":
+            request = self._requests.get(frame["id"])
+            if request is None:
+                return
+            index, future = request
+            self._in_flight[index].discard(frame["id"])
+            if future.done():
+                return
+            if "error" in frame:
+                future.set_exception(WorkerError(frame["error"]))
+            else:
+                future.set_result(frame.get("result"))
+        else:
+            logger.warning(f"Unknown frame type from worker: {kind!r}")
+
+    def status(self) -> dict[str, Any]:
+        """Per-worker process state and counters."""
+        return {
+            "workers": [
+                {
+                    "pid": self._procs[i].pid if i in self._procs else None,
+                    "connected": i in self._writers,
+                    "restarts": self.restarts[i],
+                    "routed": self.routed[i],
+                    "backlog": len(self._backlog[i]),
+                }
+                for i in range(self.workers)
+            ],
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,151 @@
+"""Agent worker process: runs an AgentLoop for the sessions the gateway routes to it."""
+
+import asyncio
+import os
+import signal
+
+from loguru import logger
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import inbound_from_dict, message_to_dict
+from nanobot.bus.queue import MessageBus
+from nanobot.session.manager import SessionManager
+from nanobot.workers.protocol import Frame, encode_frame, open_connection, read_frame
+from nanobot.workers.ring import HashRing
+
+
+class AgentWorker:
+    """
+    One agent worker, connected to the gateway over its Unix socket.
+
+    Inbound messages from the gateway are queued on the worker's own bus
+    and run by its AgentLoop; everything the agent publishes outbound
+    (replies, stream updates, message tool sends) is forwarded back to the
+    gateway. The gateway can also ask for a direct turn (cron, heartbeat)
+    or a session reset, and gets a result frame back. The worker exits when
+    the gateway closes the connection or on SIGTERM/SIGINT.
+
+    Sessions that expire (not updated in `session_days`) are deleted by
+    the worker that owns them, every `expire_interval_s`, so no process
+    deletes a session another one holds in its cache.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        socket_path: str,
+        agent: AgentLoop,
+        sessions: SessionManager,
+        workers: int = 1,
+        session_days: int = 0,
+        expire_interval_s: int = 60 * 60,
+        expire_batch: int = 500,
+    ):
+        self.index = index
+        self.socket_path = socket_path
+        self.agent = agent
+        self.bus: MessageBus = agent.bus
+        self.sessions = sessions
+        self.ring = HashRing([str(i) for i in range(workers)])  # same ring as the gateway's WorkerPool
+        self.session_days = session_days
+        self.expire_interval_s = expire_interval_s
+        self.expire_batch = expire_batch
+        self._writer: asyncio.StreamWriter | None = None
+        self._send_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask run() to return."""
+        self._stopping.set()
+
+    def owns(self, key: str) -> bool:
+        """Whether the gateway routes session `key` to this worker."""
+        return self.ring.node_for(key) == str(self.index)
+
+    def expire_sessions(self) -> list[str]:
+        """Delete this worker's expired sessions (one batch); returns their keys."""
+        expired = self.sessions.expire_sessions(self.session_days, limit=self.expire_batch, owns=self.owns)
+        if expired:
+            logger.info(f"Worker {self.index}: expired {len(expired)} sessions")
+        return expired
+
+    async def run(self) -> None:
+        """Connect to the gateway and serve it until either side stops."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        reader, self._writer = await open_connection(self.socket_path)
+        await self._send({"type": "hello", "worker": self.index, "pid": os.getpid()})
+        logger.info(f"Worker {self.index} connected to the gateway (pid {os.getpid()})")
+
+        background = [
+            asyncio.create_task(self.agent.run()),
+            asyncio.create_task(self._forward_outbound()),
+        ]
+        if self.session_days:
+            background.append(asyncio.create_task(self._expire_loop()))
+        serve = asyncio.create_task(self._serve(reader))
+        stopping = asyncio.create_task(self._stopping.wait())
+        try:
+            await asyncio.wait([serve, stopping], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.agent.stop()
+            for task in [serve, stopping, *background, *self._tasks]:
+                task.cancel()
+            await asyncio.gather(serve, stopping, *background, *self._tasks, return_exceptions=True)
+            self._writer.close()
+            logger.info(f"Worker {self.index} stopped")
+
+    async def _serve(self, reader: asyncio.StreamReader) -> None:
+        """Handle frames from the gateway until it closes the connection."""
+        while (frame := await read_frame(reader)) is not None:
+            kind = frame.get("type")
+            if kind == "inbound":
+                await self.bus.publish_inbound(inbound_from_dict(frame["msg"]))
+            elif kind in ("direct", "reset"):
+                task = asyncio.create_task(self._answer(frame))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                logger.warning(f"Worker {self.index}: unknown frame type {kind!r}")
+
+    async def _answer(self, frame: Frame) -> None:
+        """Run a direct turn or session reset and send back its result."""
+        reply: Frame = {"type": "result", "id": frame["id"]}
+        try:
+            if frame["type"] == "direct":
+                reply["result"] = await self.agent.process_direct(
+                    frame["content"],
+                    session_key=frame["session_key"],
+                    channel=frame["channel"],
+                    chat_id=frame["chat_id"],
+                    priority=frame.get("priority"),
+                )
+            else:
+                reply["result"] = await self.sessions.reset(frame["session_key"])
+        except Exception as e:
+            logger.error(f"Worker {self.index}: {frame['type']} request failed: {e}")
+            reply["error"] = str(e)
+        await self._send(reply)
+
+    async def _expire_loop(self) -> None:
+        """Expire this worker's sessions every expire_interval_s."""
+        while True:
+            await asyncio.sleep(self.expire_interval_s)
+            try:
+                self.expire_sessions()
+            except Exception as e:
+                logger.error(f"Worker {self.index}: session expiry failed: {e}")
+
+    async def _forward_outbound(self) -> None:
+        """Send everything the agent publishes outbound to the gateway."""
+        while True:
+            msg = await self.bus.consume_outbound()
+            await self._send({"type": "outbound", "msg": message_to_dict(msg)})
+
+    async def _send(self, frame: Frame) -> None:
+        async with self._send_lock:
+            self._writer.write(encode_frame(frame))
+            await self._writer.drain()
@@ -0,0 +1,94 @@
+"""Tests for concurrent per-session turn processing in AgentLoop."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.message import MessageTool
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class SlowEchoProvider(LLMProvider):
+    """Replies with the last user message after a delay, tracking concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return LLMResponse(content=f"echo: {messages[-1]['content']}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def make_agent(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def _make(provider: LLMProvider, **kwargs: Any) -> tuple[AgentLoop, MessageBus]:
+        bus = MessageBus()
+        agent = AgentLoop(bus=bus, provider=provider, workspace=tmp_path / "ws", **kwargs)
+        return agent, bus
+
+    return _make
+
+
+async def _collect(bus: MessageBus, n: int) -> list[str]:
+    return [(await asyncio.wait_for(bus.consume_outbound(), 5)).content for _ in range(n)]
+
+
+async def test_sessions_run_in_parallel_up_to_cap(make_agent) -> None:
+    provider = SlowEchoProvider()
+    agent, bus = make_agent(provider, max_concurrent_turns=2)
+    runner = asyncio.create_task(agent.run())
+    for i in range(4):
+        await bus.publish_inbound(InboundMessage("telegram", "u", f"chat{i}", f"hi {i}"))
+    await _collect(bus, 4)
+    agent.stop()
+    await runner
+    assert provider.peak == 2
+
+
+async def test_messages_within_session_stay_ordered(make_agent) -> None:
+    provider = SlowEchoProvider()
+    agent, bus = make_agent(provider, max_concurrent_turns=4)
+    runner = asyncio.create_task(agent.run())
+    for i in range(3):
+        await bus.publish_inbound(InboundMessage("telegram", "u", "same", f"m{i}"))
+    replies = await _collect(bus, 3)
+    agent.stop()
+    await runner
+    assert replies == ["echo: m0", "echo: m1", "echo: m2"]
+    assert provider.peak == 1
+
+
+async def test_tool_context_is_scoped_per_task() -> None:
+    sent: list[OutboundMessage] = []
+
+    async def send(msg: OutboundMessage) -> None:
+        sent.append(msg)
+
+    tool = MessageTool(send_callback=send)
+
+    async def turn(chat_id: str) -> None:
+        tool.set_context("telegram", chat_id)
+        await asyncio.sleep(0.01)
+        await tool.execute(content=f"to {chat_id}")
+
+    await asyncio.gather(turn("a"), turn("b"))
+    assert sorted((m.channel, m.chat_id, m.content) for m in sent) == [
+        ("telegram", "a", "to a"), ("telegram", "b", "to b"),
+    ]
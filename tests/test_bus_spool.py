@@ -0,0 +1,102 @@
+"""Tests for the durable bus spool."""
+
+import asyncio
+
+from nanobot.bus import queue as bus_queue
+from nanobot.bus import spool as bus_spool
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import FairQueue
+from nanobot.bus.spool import BusSpool
+
+
+async def test_unfinished_turns_are_replayed_after_restart(tmp_path) -> None:
+    spool = BusSpool(tmp_path / "spool.db")
+    bus = MessageBus(spool=spool)
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "done", metadata={"message_id": 7}))
+    await bus.publish_inbound(InboundMessage("telegram", "u", "2", "interrupted"))
+    finished = await bus.consume_inbound(hold=True)
+    await bus.release_inbound(finished)
+    await bus.consume_inbound(hold=True)  # process dies mid-turn
+    spool.close()
+
+    restarted = MessageBus(spool=BusSpool(tmp_path / "spool.db"))
+    assert restarted.recover() == 1
+    msg = await asyncio.wait_for(restarted.consume_inbound(hold=True), 1)
+    assert (msg.chat_id, msg.content) == ("2", "interrupted")
+    await restarted.release_inbound(msg)
+    assert len(restarted.spool) == 0
+
+
+async def test_outbound_is_acked_after_the_channel_send(tmp_path) -> None:
+    spool = BusSpool(tmp_path / "spool.db")
+    bus = MessageBus(spool=spool)
+    await bus.publish_outbound(OutboundMessage("telegram", "1", "reply"))
+    bus.publish_partial(OutboundMessage("telegram", "1", "rep", is_partial=True))
+    assert len(spool) == 1  # partial updates are not spooled
+
+    restarted = MessageBus(spool=spool)
+    restarted.recover()
+    sent: list[str] = []
+
+    async def send(msg: OutboundMessage) -> None:
+        sent.append(msg.content)
+
+    restarted.subscribe_outbound("telegram", send)
+    dispatcher = asyncio.create_task(restarted.dispatch_outbound())
+    for _ in range(100):
+        if len(spool) == 0:
+            break
+        await asyncio.sleep(0.01)
+    restarted.stop()
+    await dispatcher
+
+    assert sent == ["reply"]
+    assert len(spool) == 0
+
+
+async def test_full_queue_defers_instead_of_dropping(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(bus_queue, "PUT_TIMEOUT", 0.01)
+    bus = MessageBus(spool=BusSpool(tmp_path / "spool.db"))
+    bus.inbound = FairQueue(maxsize=1, max_per_session=1)
+
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "a"))
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "b"))
+
+    contents = [(await asyncio.wait_for(bus.consume_inbound(), 1)).content for _ in range(2)]
+    assert contents == ["a", "b"]
+
+
+def test_acked_space_is_compacted(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(bus_spool, "COMPACT_EVERY_ACKS", 10)
+    spool = BusSpool(tmp_path / "spool.db")
+    for i in range(20):
+        msg = OutboundMessage("telegram", "1", "x" * 10_000)
+        spool.append(msg)
+        spool.ack(msg)
+
+    assert len(spool) == 0
+    assert (tmp_path / "spool.db-wal").stat().st_size == 0
+    assert (tmp_path / "spool.db").stat().st_size < 50_000
+
+
+async def test_failed_sends_stay_in_the_spool(tmp_path) -> None:
+    spool = BusSpool(tmp_path / "spool.db")
+    bus = MessageBus(spool=spool)
+
+    async def send(msg: OutboundMessage) -> None:
+        raise ConnectionError("channel down")
+
+    bus.subscribe_outbound("telegram", send)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+    await bus.publish_outbound(OutboundMessage("telegram", "1", "reply"))
+    lane = bus._lanes["telegram"]
+    for _ in range(100):
+        if lane.failed:
+            break
+        await asyncio.sleep(0.01)
+    bus.stop()
+    await dispatcher
+
+    assert (lane.sent, lane.failed) == (0, 1)
+    assert [m.content for m in spool.pending()] == ["reply"]
@@ -0,0 +1,68 @@
+"""Tests for coalescing bursts of inbound messages into one turn."""
+
+import asyncio
+import time
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import FairQueue
+from nanobot.bus.spool import BusSpool
+
+
+def _msg(text: str, sender: str = "u", chat: str = "1", media: list[str] | None = None) -> InboundMessage:
+    return InboundMessage("telegram", sender, chat, text, media=media or [])
+
+
+async def test_burst_within_window_becomes_one_turn() -> None:
+    bus = MessageBus(coalesce_ms=50)
+    started = time.monotonic()
+    await bus.publish_inbound(_msg("hi"))
+    await bus.publish_inbound(_msg("", media=["a.jpg"]))
+    await bus.publish_inbound(_msg("what is this?", media=["b.jpg"]))
+    await bus.publish_inbound(_msg("other chat", chat="2"))
+
+    first = await asyncio.wait_for(bus.consume_inbound(), 1)
+    second = await asyncio.wait_for(bus.consume_inbound(), 1)
+
+    assert time.monotonic() - started >= 0.05
+    assert (first.content, first.media) == ("hi\nwhat is this?", ["a.jpg", "b.jpg"])
+    assert second.content == "other chat"
+    assert bus.inbound_size == 0
+    assert bus.inbound_stats()["interactive"]["coalesced"] == 2
+
+
+async def test_messages_queued_behind_a_running_turn_are_merged() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100, coalesce_s=0.01)
+    await queue.put(_msg("first"), coalesce=True)
+    running = await queue.get(hold=True)
+    await queue.put(_msg("correction"), coalesce=True)
+    await queue.put(_msg("more"), coalesce=True)
+    await queue.put(_msg("from someone else", sender="v"), coalesce=True)
+    await queue.release(running)
+
+    assert (await queue.get()).content == "correction\nmore"
+    assert (await queue.get()).content == "from someone else"
+
+
+async def test_direct_turns_and_disabled_window_are_not_merged() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100, coalesce_s=0.01)
+    await queue.put(_msg("a"), coalesce=True)
+    assert await queue.put(_msg("b")) is None
+    assert queue.qsize() == 2
+
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a"))
+    await bus.publish_inbound(_msg("b"))
+    assert bus.inbound_size == 2
+
+
+async def test_merged_message_is_spooled_once(tmp_path) -> None:
+    spool = BusSpool(tmp_path / "spool.db")
+    bus = MessageBus(spool=spool, coalesce_ms=10)
+    await bus.publish_inbound(_msg("one"))
+    await bus.publish_inbound(_msg("two"))
+
+    assert [m.content for m in spool.pending()] == ["one\ntwo"]
+    msg = await asyncio.wait_for(bus.consume_inbound(hold=True), 1)
+    await bus.release_inbound(msg)
+    assert len(spool) == 0
@@ -0,0 +1,91 @@
+"""Tests for background session compaction into rolling summaries."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.compaction import SessionCompactor
+from nanobot.agent.context import ContextBuilder
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.session.manager import SessionManager
+
+
+class SummaryProvider(LLMProvider):
+    """One token per word; "summarizes" by counting the messages it was given."""
+
+    def __init__(self, gate: asyncio.Event | None = None):
+        super().__init__()
+        self.gate = gate
+        self.calls: list[dict[str, Any]] = []
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        return len(text.split())
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls.append({"messages": messages, **kwargs})
+        if self.gate:
+            await self.gate.wait()
+        return LLMResponse(content=f"summary of {messages[-1]['content'].count('user: ')} turns")
+
+    def get_default_model(self) -> str:
+        return "main"
+
+
+def _fill(session, turns: int) -> None:
+    for i in range(turns):
+        session.add_message("user", f"question {i} " + "word " * 20)
+        session.add_message("assistant", f"answer {i} " + "word " * 20)
+
+
+def _setup(tmp_path, monkeypatch, provider):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    sessions = SessionManager(tmp_path / "ws")
+    compactor = SessionCompactor(provider, sessions, "main", threshold_tokens=500, summary_model="cheap")
+    return sessions, compactor
+
+
+async def test_oldest_turns_are_folded_into_persisted_summary(tmp_path, monkeypatch) -> None:
+    provider = SummaryProvider()
+    sessions, compactor = _setup(tmp_path, monkeypatch, provider)
+    session = sessions.get_or_create("telegram:1")
+    _fill(session, 20)
+
+    await compactor.maybe_compact(session)
+
+    assert provider.calls[0]["model"] == "cheap"
+    assert session.messages[0].role == "user"
+    assert compactor.session_tokens(session) <= 250
+    assert session.summary.startswith("summary of")
+
+    sessions._cache.clear()
+    reloaded = sessions.get_or_create("telegram:1")
+    assert reloaded.summary == session.summary
+    assert len(reloaded.messages) == len(session.messages)
+
+
+async def test_short_sessions_are_left_alone(tmp_path, monkeypatch) -> None:
+    sessions, compactor = _setup(tmp_path, monkeypatch, SummaryProvider())
+    session = sessions.get_or_create("cli:direct")
+    _fill(session, 2)
+    assert compactor.maybe_compact(session) is None
+
+
+async def test_result_discarded_if_session_cleared_meanwhile(tmp_path, monkeypatch) -> None:
+    gate = asyncio.Event()
+    sessions, compactor = _setup(tmp_path, monkeypatch, SummaryProvider(gate))
+    session = sessions.get_or_create("heartbeat:x")
+    _fill(session, 20)
+
+    task = compactor.maybe_compact(session)
+    assert compactor.maybe_compact(session) is None  # one compaction per session at a time
+    await asyncio.sleep(0)
+    session.clear()
+    gate.set()
+    await task
+
+    assert session.summary == "" and session.messages == []
+
+
+def test_summary_is_injected_into_the_prompt(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    messages = builder.build_messages([], "hi", channel="cli", chat_id="direct", summary="User likes tea.")
+    assert "User likes tea." in messages[0]["content"]
@@ -0,0 +1,57 @@
+"""Tests for the change-tracking system prompt cache."""
+
+import os
+
+from nanobot.agent.context import ContextBuilder
+
+
+def _touch(path, content: str) -> None:
+    """Write content and bump mtime so the change is visible even on coarse clocks."""
+    path.write_text(content)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _builder(tmp_path) -> ContextBuilder:
+    builtin = tmp_path / "builtin"
+    (builtin / "demo").mkdir(parents=True)
+    (builtin / "demo" / "SKILL.md").write_text("---\ndescription: demo skill\n---\nbody")
+    builder = ContextBuilder(tmp_path / "ws")
+    builder.skills.builtin_skills = builtin
+    return builder
+
+
+def test_unchanged_files_are_served_from_cache(tmp_path) -> None:
+    builder = _builder(tmp_path)
+    first = builder.build_system_prompt()
+    second = builder.build_system_prompt()
+
+    assert first.split("## Runtime")[1] == second.split("## Runtime")[1]
+    stats = builder.cache_stats()
+    for section in ("bootstrap", "memory", "skills"):
+        assert stats[section] == {"hits": 1, "misses": 1}
+
+
+def test_changed_file_rebuilds_only_its_section(tmp_path) -> None:
+    builder = _builder(tmp_path)
+    builder.build_system_prompt()
+
+    _touch(builder.workspace / "SOUL.md", "be brief")
+    prompt = builder.build_system_prompt()
+
+    assert "be brief" in prompt
+    stats = builder.cache_stats()
+    assert stats["bootstrap"]["misses"] == 2
+    assert stats["skills"] == {"hits": 1, "misses": 1}
+
+
+def test_skill_edits_and_new_skills_are_picked_up(tmp_path) -> None:
+    builder = _builder(tmp_path)
+    builder.build_system_prompt()
+
+    _touch(builder.skills.builtin_skills / "demo" / "SKILL.md", "---\ndescription: updated\n---\nbody")
+    assert "updated" in builder.build_system_prompt()
+
+    (builder.skills.builtin_skills / "extra").mkdir()
+    (builder.skills.builtin_skills / "extra" / "SKILL.md").write_text("---\ndescription: extra one\n---\n")
+    assert "extra one" in builder.build_system_prompt()
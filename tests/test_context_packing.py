@@ -0,0 +1,90 @@
+"""Tests for token-aware history packing."""
+
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.packing import MESSAGE_OVERHEAD_TOKENS, ContextPacker
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.session.base import Message
+
+
+class WordProvider(LLMProvider):
+    """One token per word; records the messages and counting calls it sees."""
+
+    def __init__(self):
+        super().__init__()
+        self.counted: list[str] = []
+        self.sent: list[dict[str, Any]] = []
+
+    def count_tokens(self, text: str, model: str | None = None) -> int:
+        self.counted.append(text)
+        return len(text.split())
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.sent = messages
+        return LLMResponse(content="ok")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _history(n: int, words: int = 10) -> list[Message]:
+    role = ["user", "assistant"]
+    return [Message(role[i % 2], " ".join([f"m{i}"] * words)) for i in range(n)]
+
+
+def _prompt() -> list[dict[str, Any]]:
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": "now"}]
+
+
+def test_newest_history_fills_the_budget() -> None:
+    per_message = 10 + MESSAGE_OVERHEAD_TOKENS
+    reserved = 2 * (1 + MESSAGE_OVERHEAD_TOKENS) + 100
+    packer = ContextPacker(WordProvider(), "m", reserved + 4 * per_message + 5, max_tokens=100)
+
+    history = packer.pack(_history(10), _prompt())
+
+    assert [h["content"].split()[0] for h in history] == ["m6", "m7", "m8", "m9"]
+    assert set(history[0]) == {"role", "content"}
+
+
+def test_history_never_starts_with_an_assistant_reply() -> None:
+    per_message = 10 + MESSAGE_OVERHEAD_TOKENS
+    reserved = 2 * (1 + MESSAGE_OVERHEAD_TOKENS) + 100
+    packer = ContextPacker(WordProvider(), "m", reserved + 3 * per_message, max_tokens=100)
+
+    history = packer.pack(_history(10), _prompt())
+
+    assert [h["content"].split()[0] for h in history] == ["m8", "m9"]
+
+
+def test_token_counts_are_cached_on_session_messages() -> None:
+    provider = WordProvider()
+    packer = ContextPacker(provider, "m", 10_000, max_tokens=100)
+    messages = _history(4)
+
+    packer.pack(messages, _prompt())
+    assert messages[0].tokens == {"m": 10 + MESSAGE_OVERHEAD_TOKENS}
+
+    provider.counted.clear()
+    packer.pack(messages, _prompt())
+    assert provider.counted == []
+
+
+async def test_agent_packs_history_when_context_window_is_set(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    provider = WordProvider()
+    agent = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path / "ws",
+        max_tokens=100, context_window=100_000,
+    )
+    session = agent.sessions.get_or_create("cli:direct")
+    for msg in _history(80):
+        session.add_message(msg.role, msg.content)
+
+    await agent.process_direct("hello")
+
+    assert provider.sent[0]["role"] == "system"
+    assert provider.sent[-1]["content"] == "hello"
+    assert len(provider.sent) == 82  # all of the history fits, not just the last 50
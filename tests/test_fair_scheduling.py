@@ -0,0 +1,135 @@
+"""Tests for fair scheduling of inbound messages."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import COST_UNIT_CHARS, FairQueue
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+def _msg(chat: str, text: str = "x", channel: str = "telegram") -> InboundMessage:
+    return InboundMessage(channel, "u", chat, text)
+
+
+async def _drain(queue: FairQueue) -> list[str]:
+    out = []
+    while queue.qsize():
+        msg = await queue.get()
+        out.append(f"{msg.chat_id}:{msg.content}")
+    return out
+
+
+async def test_sessions_take_turns() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100)
+    for i in range(4):
+        await queue.put(_msg("busy", str(i)))
+    await queue.put(_msg("quiet", "0"))
+
+    assert await _drain(queue) == ["busy:0", "quiet:0", "busy:1", "busy:2", "busy:3"]
+
+
+async def test_large_messages_cost_more_rounds() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100)
+    await queue.put(_msg("big", "y" * (2 * COST_UNIT_CHARS)))
+    for i in range(3):
+        await queue.put(_msg("small", str(i)))
+
+    order = [m.split(":")[0] for m in await _drain(queue)]
+    assert order == ["small", "small", "big", "small"]
+
+
+async def test_higher_classes_go_first_and_waits_are_recorded() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100)
+    await queue.put(_msg("h", "beat", channel="cli"), "heartbeat")
+    await queue.put(_msg("c", "job", channel="cli"), "cron")
+    await queue.put(_msg("telegram:1", "done", channel="system"))
+    await queue.put(_msg("u", "hi"))
+
+    assert [m.split(":")[-1] for m in await _drain(queue)] == ["hi", "done", "job", "beat"]
+    stats = queue.stats()
+    assert stats["cron"]["served"] == 1
+    assert stats["heartbeat"]["wait_max_s"] >= stats["interactive"]["wait_max_s"]
+
+
+async def test_held_sessions_are_skipped_until_released() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=100)
+    await queue.put(_msg("a", "1"))
+    await queue.put(_msg("a", "2"))
+    await queue.put(_msg("b", "1"))
+
+    first = await queue.get(hold=True)
+    assert (await queue.get(hold=True)).chat_id == "b"
+    waiter = asyncio.create_task(queue.get(hold=True))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await queue.release(first)
+    assert (await waiter).content == "2"
+
+
+async def test_full_session_queue_does_not_block_other_sessions() -> None:
+    queue = FairQueue(maxsize=100, max_per_session=2)
+    await queue.put(_msg("a"))
+    await queue.put(_msg("a"))
+    blocked = asyncio.create_task(queue.put(_msg("a")))
+    await asyncio.wait_for(queue.put(_msg("b")), 1)
+    assert not blocked.done()
+
+    await queue.get()
+    await asyncio.wait_for(blocked, 1)
+
+
+class EchoProvider(LLMProvider):
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        await asyncio.sleep(0.01)
+        return LLMResponse(content=messages[-1]["content"])
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_interactive_reply_is_not_stuck_behind_a_backlog(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=EchoProvider(), workspace=tmp_path / "ws", max_concurrent_turns=1)
+    for i in range(5):
+        await bus.publish_inbound(_msg("group", f"g{i}"))
+    await bus.publish_inbound(_msg("dm", "hello"))
+    runner = asyncio.create_task(agent.run())
+
+    direct = asyncio.create_task(agent.process_direct("tick", channel="cli", chat_id="cron", priority="cron"))
+    replies = [(await asyncio.wait_for(bus.consume_outbound(), 5)).content for _ in range(6)]
+    assert await asyncio.wait_for(direct, 5) == "tick"
+    agent.stop()
+    await runner
+
+    assert replies.index("hello") <= 1
+    assert [r for r in replies if r.startswith("g")] == [f"g{i}" for i in range(5)]
+
+
+async def test_stop_fails_direct_turns_still_queued(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    class SlowProvider(EchoProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            await asyncio.sleep(0.2)
+            return await super().chat(messages, **kwargs)
+
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=SlowProvider(), workspace=tmp_path / "ws", max_concurrent_turns=1)
+    await bus.publish_inbound(_msg("group", "busy"))
+    runner = asyncio.create_task(agent.run())
+    await asyncio.sleep(0.05)
+
+    direct = asyncio.create_task(agent.process_direct("tick", channel="cli", chat_id="cron", priority="cron"))
+    await asyncio.sleep(0.05)
+    agent.stop()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(direct, 5)
+    await runner
@@ -0,0 +1,93 @@
+"""Tests for hedged LLM requests."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers import hedged
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.hedged import HedgedProvider
+
+
+class TimedProvider(LLMProvider):
+    """Replies after the next scripted delay; remembers which calls were cancelled."""
+
+    def __init__(self, name: str, delays: list[float], fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            return LLMResponse(content="Error calling LLM: down", finish_reason="error")
+        return LLMResponse(content=f"{self.name}:{model}")
+
+    def get_default_model(self) -> str:
+        return "model-a"
+
+
+@pytest.fixture(autouse=True)
+def few_samples(monkeypatch) -> None:
+    monkeypatch.setattr(hedged, "MIN_SAMPLES", 3)
+
+
+def warm(provider: HedgedProvider, latency: float = 0.01, model: str = "model-a") -> None:
+    for _ in range(hedged.MIN_SAMPLES):
+        provider._record(model, latency)
+
+
+async def test_no_hedging_until_latencies_are_known() -> None:
+    primary = TimedProvider("primary", [0.05])
+    provider = HedgedProvider(primary, min_delay_s=0.0)
+
+    assert provider.hedge_delay("model-a") is None
+    assert (await provider.chat([])).content == "primary:None"
+    assert provider.stats()["hedges"] == 0
+
+
+async def test_slow_call_is_hedged_and_the_loser_cancelled() -> None:
+    primary = TimedProvider("primary", [5.0])
+    secondary = TimedProvider("secondary", [0.01])
+    provider = HedgedProvider(primary, secondary, secondary_model="model-b", min_delay_s=0.0, max_fraction=1.0)
+    warm(provider)
+
+    response = await asyncio.wait_for(provider.chat([]), timeout=2)
+
+    assert response.content == "secondary:model-b"
+    await asyncio.sleep(0)
+    assert primary.cancelled == 1
+    stats = provider.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1 and stats["hedge_win_rate"] == 1.0
+
+
+async def test_primary_can_still_win_and_failed_hedges_are_ignored() -> None:
+    primary = TimedProvider("primary", [0.1])
+    secondary = TimedProvider("secondary", [0.0], fail=True)
+    provider = HedgedProvider(primary, secondary, min_delay_s=0.0, max_fraction=1.0)
+    warm(provider)
+
+    response = await provider.chat([])
+
+    assert response.content == "primary:None"
+    assert provider.stats()["hedge_wins"] == 0
+
+
+async def test_hedges_are_capped_as_a_fraction_of_calls() -> None:
+    primary = TimedProvider("primary", [0.05] * 10)
+    provider = HedgedProvider(primary, min_delay_s=0.0, max_fraction=0.2)
+    provider.hedge_delay = lambda model: 0.01
+
+    for _ in range(5):
+        await provider.chat([])
+
+    stats = provider.stats()
+    assert stats["hedges"] == 1 and stats["capped"] == 4
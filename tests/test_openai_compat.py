@@ -0,0 +1,96 @@
+"""Tests for the native OpenAI-compatible provider."""
+
+import json
+
+import httpx
+
+from nanobot.providers.cache import CachingProvider
+from nanobot.providers.hedged import HedgedProvider
+from nanobot.providers.openai_compat import OpenAICompatProvider
+from nanobot.providers.resilient import ChainMember, ResilientProvider
+
+
+def _provider(handler, **kwargs) -> OpenAICompatProvider:
+    provider = OpenAICompatProvider(**{"api_key": "k", "api_base": "http://llm.local/v1", **kwargs})
+    provider._client = httpx.AsyncClient(
+        base_url=str(provider._client.base_url),
+        headers=provider._client.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return provider
+
+
+async def test_chat_parses_tool_calls_reasoning_and_usage() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={
+            "choices": [{
+                "message": {
+                    "content": None,
+                    "reasoning_content": "thinking",
+                    "tool_calls": [{"id": "c1", "type": "function",
+                                    "function": {"name": "read_file", "arguments": '{"path": "a"}'}}],
+                },
+                "finish_reason": "tool_calls",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12,
+                      "prompt_tokens_details": {"cached_tokens": 8}},
+        })
+
+    provider = _provider(handler, default_model="hosted_vllm/llama-3")
+    system = {"role": "system", "content": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]}
+    response = await provider.chat([system, {"role": "user", "content": "hi"}], tools=[{"type": "function"}])
+
+    body = json.loads(requests[0].content)
+    assert requests[0].url == "http://llm.local/v1/chat/completions"
+    assert requests[0].headers["authorization"] == "Bearer k"
+    assert body["model"] == "llama-3"
+    assert body["messages"][0]["content"] == "a\n\n---\n\nb"
+    assert body["tool_choice"] == "auto"
+    assert response.tool_calls[0].arguments == {"path": "a"}
+    assert (response.reasoning_content, response.finish_reason) == ("thinking", "tool_calls")
+    assert response.usage["cached_tokens"] == 8
+
+
+async def test_stream_assembles_text_and_tool_call_fragments() -> None:
+    chunks = [
+        {"choices": [{"delta": {"content": "Hel"}}]},
+        {"choices": [{"delta": {"content": "lo", "tool_calls": [
+            {"index": 0, "id": "c1", "function": {"name": "exec", "arguments": '{"comm'}}]}}]},
+        {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": 'and": "ls"}'}}]},
+                      "finish_reason": "tool_calls"}]},
+        {"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}},
+    ]
+    sse = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+    provider = _provider(lambda request: httpx.Response(200, text=sse))
+
+    deltas = [d async for d in provider.stream_chat([{"role": "user", "content": "hi"}])]
+
+    assert [d.content for d in deltas[:-1]] == ["Hel", "lo"]
+    final = deltas[-1].response
+    assert final.content == "Hello"
+    assert final.tool_calls[0].arguments == {"command": "ls"}
+    assert final.usage["total_tokens"] == 8
+
+
+async def test_http_errors_are_returned_as_error_content() -> None:
+    provider = _provider(lambda request: httpx.Response(529, json={"error": "overloaded"}))
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+    streamed = [d async for d in provider.stream_chat([{"role": "user", "content": "hi"}])]
+
+    assert response.finish_reason == "error"
+    assert response.content.startswith("Error calling LLM:")
+    assert streamed[-1].response.finish_reason == "error"
+    assert [d.content for d in streamed if d.content] == []  # not streamed to the user as reply text
+
+
+async def test_wrappers_close_the_connection_pool() -> None:
+    provider = _provider(lambda request: httpx.Response(200, json={}))
+    wrapped = CachingProvider(ResilientProvider([ChainMember("main", HedgedProvider(provider))]))
+
+    await wrapped.aclose()
+
+    assert provider._client.is_closed
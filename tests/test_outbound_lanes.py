@@ -0,0 +1,92 @@
+"""Tests for per-channel outbound dispatch lanes."""
+
+import asyncio
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+class Recorder:
+    """Outbound callback that records sends, optionally slowly."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, msg: OutboundMessage) -> None:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        self.sent.append(f"{msg.chat_id}:{msg.content}")
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async def wait():
+        while not predicate():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(wait(), timeout)
+
+
+async def test_slow_channel_does_not_delay_others() -> None:
+    bus = MessageBus()
+    slow, fast = Recorder(delay=0.5), Recorder()
+    bus.subscribe_outbound("feishu", slow)
+    bus.subscribe_outbound("telegram", fast)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+    for i in range(3):
+        await bus.publish_outbound(OutboundMessage("feishu", "c", f"f{i}"))
+    await bus.publish_outbound(OutboundMessage("telegram", "c", "t"))
+    await _until(lambda: fast.sent, timeout=0.3)
+
+    assert slow.sent == []
+    bus.stop()
+    await dispatcher
+
+
+async def test_chats_are_sent_concurrently_but_each_in_order() -> None:
+    bus = MessageBus()
+    recorder = Recorder(delay=0.01)
+    bus.subscribe_outbound("telegram", recorder, workers=4)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+    for i in range(5):
+        for chat in ("a", "b", "c", "d"):
+            await bus.publish_outbound(OutboundMessage("telegram", chat, str(i)))
+    await _until(lambda: len(recorder.sent) == 20)
+    bus.stop()
+    await dispatcher
+
+    for chat in ("a", "b", "c", "d"):
+        assert [s for s in recorder.sent if s.startswith(chat)] == [f"{chat}:{i}" for i in range(5)]
+    assert recorder.peak > 1
+    stats = bus.outbound_stats()["telegram"]
+    assert stats["sent"] == 20 and stats["depth"] == 0 and stats["send_max_s"] > 0
+
+
+async def test_early_messages_are_routed_and_unknown_channels_dropped() -> None:
+    bus = MessageBus()
+    await bus.publish_outbound(OutboundMessage("discord", "c", "early"))
+    await bus.publish_outbound(OutboundMessage("nowhere", "c", "lost"))
+    recorder = Recorder()
+    bus.subscribe_outbound("discord", recorder)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+    await _until(lambda: recorder.sent == ["c:early"])
+    await _until(lambda: bus.outbound_size == 0)
+    bus.stop()
+    await dispatcher
+
+
+async def test_partials_are_dropped_when_a_lane_is_full() -> None:
+    bus = MessageBus()
+    bus.subscribe_outbound("telegram", Recorder(), max_queue=2)
+    for i in range(4):
+        bus.publish_partial(OutboundMessage("telegram", "c", str(i), is_partial=True))
+
+    assert bus.outbound_stats()["telegram"]["dropped"] == 2
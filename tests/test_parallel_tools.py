@@ -0,0 +1,79 @@
+"""Tests for concurrent execution of tool calls from one LLM response."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import ToolCallRequest
+
+
+class RecordingTool(Tool):
+    def __init__(self, name: str, read_only: bool, log: list[str], state: dict[str, int]):
+        self._name = name
+        self._read_only = read_only
+        self._log = log
+        self._state = state
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "records calls"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self._state["active"] += 1
+        self._state["peak"] = max(self._state["peak"], self._state["active"])
+        self._log.append(f"start {tag}")
+        await asyncio.sleep(0.01)
+        self._log.append(f"end {tag}")
+        self._state["active"] -= 1
+        return f"{self._name}:{tag}"
+
+
+def _registry() -> tuple[ToolRegistry, list[str], dict[str, int]]:
+    log: list[str] = []
+    state = {"active": 0, "peak": 0}
+    reg = ToolRegistry()
+    reg.register(RecordingTool("read", True, log, state))
+    reg.register(RecordingTool("write", False, log, state))
+    return reg, log, state
+
+
+def _calls(*specs: tuple[str, str]) -> list[ToolCallRequest]:
+    return [ToolCallRequest(id=f"c{i}", name=n, arguments={"tag": t}) for i, (n, t) in enumerate(specs)]
+
+
+async def test_sequential_by_default() -> None:
+    reg, _, state = _registry()
+    results = await reg.execute_calls(_calls(("read", "a"), ("read", "b")))
+    assert results == ["read:a", "read:b"]
+    assert state["peak"] == 1
+
+
+async def test_read_only_calls_fan_out_in_order() -> None:
+    reg, _, state = _registry()
+    calls = _calls(("read", "a"), ("read", "b"), ("read", "c"))
+    results = await reg.execute_calls(calls, max_concurrency=2)
+    assert results == ["read:a", "read:b", "read:c"]
+    assert state["peak"] == 2
+
+
+async def test_side_effecting_call_is_a_barrier() -> None:
+    reg, log, _ = _registry()
+    calls = _calls(("read", "a"), ("read", "b"), ("write", "w"), ("read", "c"))
+    results = await reg.execute_calls(calls, max_concurrency=4)
+    assert results == ["read:a", "read:b", "write:w", "read:c"]
+    w_start = log.index("start w")
+    assert log.index("end a") < w_start and log.index("end b") < w_start
+    assert log.index("end w") < log.index("start c")
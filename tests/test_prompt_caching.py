@@ -0,0 +1,63 @@
+"""Tests for the stable-prefix prompt layout and prompt caching support."""
+
+from types import SimpleNamespace
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.registry import find_gateway, supports_prompt_caching
+
+
+def test_stable_prefix_is_shared_across_sessions(tmp_path) -> None:
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "memory" / "MEMORY.md").write_text("likes tea")
+    (tmp_path / "SOUL.md").write_text("be kind")
+    builder = ContextBuilder(tmp_path, stable_prefix=True)
+
+    a = builder.build_messages([], "hi", channel="telegram", chat_id="1")[0]["content"]
+    b = builder.build_messages([], "hi", channel="discord", chat_id="2")[0]["content"]
+
+    assert a[0] == b[0]
+    assert a[0]["cache_control"] == {"type": "ephemeral"}
+    assert "be kind" in a[0]["text"]
+    for volatile in ("Current Time", "likes tea", "Chat ID"):
+        assert volatile not in a[0]["text"]
+        assert volatile in a[1]["text"]
+
+
+def test_default_layout_is_a_single_string(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    content = builder.build_messages([], "hi", channel="cli", chat_id="direct")[0]["content"]
+    assert isinstance(content, str)
+    assert content.index("Current Time") < content.index("Current Session")
+
+
+def test_supports_prompt_caching_by_model_and_gateway() -> None:
+    assert supports_prompt_caching("anthropic/claude-sonnet-4-5")
+    assert not supports_prompt_caching("gpt-4o")
+    assert supports_prompt_caching("claude-3", find_gateway("sk-or-abc", None))
+    assert not supports_prompt_caching("claude-3", find_gateway(None, "http://localhost:8000"))
+
+
+def test_system_parts_flattened_for_providers_without_caching() -> None:
+    provider = LiteLLMProvider(default_model="gpt-4o")
+    messages = [
+        {"role": "system", "content": [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "volatile"},
+        ]},
+        {"role": "user", "content": "hi"},
+    ]
+    sent = provider._build_kwargs(messages, None, None, 100, 0.5)["messages"]
+    assert sent[0]["content"] == "static\n\n---\n\nvolatile"
+    assert sent[1] is messages[1]
+
+    claude = LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5")
+    assert claude._build_kwargs(messages, None, None, 100, 0.5)["messages"] is messages
+
+
+def test_usage_reports_cached_tokens() -> None:
+    usage = SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=10, total_tokens=1010,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=800),
+    )
+    assert LiteLLMProvider._parse_usage(usage)["cached_tokens"] == 800
@@ -0,0 +1,236 @@
+"""Tests for the resilience wrapper: error classification, retries, circuit breaking and failover."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nanobot.providers import resilient
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta
+from nanobot.providers.resilient import (
+    FAILOVER,
+    FATAL,
+    OPEN,
+    RETRY,
+    ChainMember,
+    CircuitBreaker,
+    ResilientProvider,
+    classify_error,
+    retry_after,
+)
+
+
+def http_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://llm.test/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+class ScriptedProvider(LLMProvider):
+    """Answers calls from a script: an exception means an error response, a string a reply."""
+
+    def __init__(self, script: list):
+        super().__init__()
+        self.script = list(script)
+        self.models: list[str | None] = []
+
+    def _next(self, model: str | None) -> LLMResponse:
+        self.models.append(model)
+        step = self.script.pop(0) if self.script else "ok"
+        if isinstance(step, Exception):
+            return LLMResponse(content=f"Error calling LLM: {step}", finish_reason="error", error=step)
+        return LLMResponse(content=step)
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        return self._next(model)
+
+    async def stream_chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        response = self._next(model)
+        if response.finish_reason != "error":
+            yield StreamDelta(content=response.content)
+        yield StreamDelta(response=response)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch) -> list[float]:
+    waits: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        waits.append(delay)
+
+    monkeypatch.setattr(resilient.asyncio, "sleep", sleep)
+    return waits
+
+
+def test_errors_are_classified_by_status_and_type() -> None:
+    assert classify_error(http_error(429)) == RETRY
+    assert classify_error(http_error(503)) == RETRY
+    assert classify_error(httpx.ConnectTimeout("slow")) == RETRY
+    assert classify_error(http_error(401)) == FAILOVER
+    assert classify_error(http_error(400)) == FATAL
+    assert classify_error(ValueError("bad input")) == FATAL
+
+    assert retry_after(http_error(429, {"retry-after": "7"})) == 7.0
+    assert retry_after(http_error(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after(http_error(429)) is None
+
+
+async def test_transient_errors_are_retried_with_backoff(no_sleep) -> None:
+    primary = ScriptedProvider([http_error(503), http_error(429, {"retry-after": "3"}), "hello"])
+    provider = ResilientProvider([ChainMember("primary", primary)], max_retries=2, base_delay_s=1.0)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+
+    assert response.content == "hello"
+    assert 0 <= no_sleep[0] <= 1.0
+    assert no_sleep[1] == 3.0  # Retry-After wins over the backoff
+    stats = provider.stats()
+    assert stats["recovered"] == 1 and stats["failovers"] == 0
+    assert stats["providers"]["primary"]["retries"] == 2
+
+
+async def test_bad_requests_are_not_retried() -> None:
+    primary = ScriptedProvider([http_error(400)])
+    backup = ScriptedProvider([])
+    provider = ResilientProvider([ChainMember("primary", primary), ChainMember("backup", backup)])
+
+    response = await provider.chat([])
+
+    assert response.finish_reason == "error"
+    assert len(primary.models) == 1 and backup.models == []
+
+
+async def test_fails_over_in_order_with_the_member_model(no_sleep) -> None:
+    primary = ScriptedProvider([http_error(401)])
+    flaky = ScriptedProvider([http_error(429, {"retry-after": "120"})])  # longer than max_delay_s
+    backup = ScriptedProvider(["from backup"])
+    provider = ResilientProvider(
+        [
+            ChainMember("primary", primary),
+            ChainMember("flaky", flaky),
+            ChainMember("backup", backup, model="backup-model"),
+        ],
+        max_delay_s=30.0,
+    )
+
+    response = await provider.chat([], model="main-model")
+
+    assert response.content == "from backup"
+    assert primary.models == ["main-model"] and backup.models == ["backup-model"]
+    assert len(flaky.models) == 1 and no_sleep == []
+    assert provider.stats()["failovers"] == 1
+
+
+async def test_breaker_skips_a_failing_provider_until_cooldown(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(resilient.time, "monotonic", lambda: now[0])
+    primary = ScriptedProvider([http_error(500)] * 2)
+    backup = ScriptedProvider([])
+    provider = ResilientProvider(
+        [ChainMember("primary", primary, breaker=CircuitBreaker(threshold=2, cooldown_s=30)),
+         ChainMember("backup", backup)],
+        max_retries=1,
+    )
+
+    assert (await provider.chat([])).content == "ok"
+    assert provider.stats()["providers"]["primary"]["breaker"] == OPEN
+
+    await provider.chat([])
+    assert len(primary.models) == 2  # skipped while open
+
+    now[0] += 31
+    await provider.chat([])
+    assert len(primary.models) == 3  # half-open trial call succeeded
+    assert provider.stats()["providers"]["primary"]["breaker"] == "closed"
+
+
+async def test_breakers_only_move_for_providers_that_are_called(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(resilient.time, "monotonic", lambda: now[0])
+    backup_breaker = CircuitBreaker(threshold=1, cooldown_s=30)
+    backup_breaker.failure()
+    provider = ResilientProvider(
+        [ChainMember("primary", ScriptedProvider([])), ChainMember("backup", ScriptedProvider([]), breaker=backup_breaker)],
+    )
+
+    now[0] += 31
+    await provider.chat([])
+
+    # The backup was never tried, so it must not be left waiting on a trial call
+    assert provider.stats()["providers"]["backup"]["breaker"] == OPEN
+
+
+async def test_cancelled_trial_call_frees_the_trial_slot(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(resilient.time, "monotonic", lambda: now[0])
+    started = asyncio.Event()
+
+    class HangingProvider(ScriptedProvider):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            started.set()
+            await asyncio.Event().wait()
+
+    breaker = CircuitBreaker(threshold=1, cooldown_s=30)
+    breaker.failure()
+    provider = ResilientProvider([ChainMember("primary", HangingProvider([]), breaker=breaker)])
+
+    now[0] += 31
+    task = asyncio.create_task(provider.chat([]))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == OPEN and breaker.allow()
+
+
+async def test_abandoned_stream_is_closed_and_settles_the_breaker(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(resilient.time, "monotonic", lambda: now[0])
+    closed = []
+
+    class EndlessProvider(ScriptedProvider):
+        async def stream_chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            try:
+                while True:
+                    yield StreamDelta(content="x")
+            finally:
+                closed.append(True)
+
+    breaker = CircuitBreaker(threshold=1, cooldown_s=30)
+    breaker.failure()
+    provider = ResilientProvider([ChainMember("primary", EndlessProvider([]), breaker=breaker)])
+    now[0] += 31
+
+    stream = provider.stream_chat([])
+    assert (await anext(stream)).content == "x"
+    await stream.aclose()
+
+    assert closed == [True]
+    assert breaker.state == OPEN and breaker.allow()
+
+
+async def test_stream_fails_over_before_the_first_delta() -> None:
+    primary = ScriptedProvider([http_error(502)])
+    backup = ScriptedProvider(["streamed"])
+    provider = ResilientProvider([ChainMember("primary", primary), ChainMember("backup", backup)], max_retries=0)
+
+    deltas = [d async for d in provider.stream_chat([])]
+
+    assert [d.content for d in deltas if d.content] == ["streamed"]
+    assert deltas[-1].response.content == "streamed"
+    assert provider.stats()["failovers"] == 1
+
+
+async def test_all_providers_down_returns_the_last_error() -> None:
+    provider = ResilientProvider(
+        [ChainMember("a", ScriptedProvider([http_error(503)] * 3)), ChainMember("b", ScriptedProvider([http_error(401)]))],
+    )
+
+    response = await provider.chat([])
+
+    assert response.finish_reason == "error"
+    assert provider.stats()["exhausted"] == 1
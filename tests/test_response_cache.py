@@ -0,0 +1,130 @@
+"""Tests for the exact-match LLM response cache."""
+
+import asyncio
+
+from nanobot.providers import cache as cache_module
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+from nanobot.providers.cache import CachingProvider, no_cache, request_key
+
+MESSAGES = [{"role": "system", "content": "be brief"}, {"role": "user", "content": "hi"}]
+
+
+class CountingProvider(LLMProvider):
+    """Replies with a numbered answer after `delay`; can be told to call a tool or fail."""
+
+    def __init__(self, delay: float = 0.0, tool: str | None = None, fail: bool = False):
+        super().__init__()
+        self.delay = delay
+        self.tool = tool
+        self.fail = fail
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return LLMResponse(content="Error calling LLM: down", finish_reason="error")
+        tool_calls = [ToolCallRequest(id="1", name=self.tool, arguments={"path": "x"})] if self.tool else []
+        return LLMResponse(content=f"answer {self.calls}", tool_calls=tool_calls, usage={"total_tokens": 5})
+
+    async def stream_chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        response = await self.chat(messages, tools, model, max_tokens, temperature)
+        yield StreamDelta(content=response.content)
+        yield StreamDelta(response=response)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def test_key_is_canonical() -> None:
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    assert request_key(MESSAGES, None, "m", 100, 0.0) == request_key(reordered, [], "m", 100, 0.0)
+    assert request_key(MESSAGES, None, "m", 100, 0.0) != request_key(MESSAGES, None, "m", 100, 0.5)
+
+
+async def test_repeated_requests_are_answered_from_memory() -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner)
+
+    first = await provider.chat(MESSAGES, model="m")
+    second = await provider.chat(list(MESSAGES), model="m")
+    other = await provider.chat(MESSAGES, model="other")
+
+    assert first.content == second.content == "answer 1"
+    assert other.content == "answer 2"
+    assert provider.stats()["hits"] == 1 and provider.stats()["misses"] == 2
+
+
+async def test_entries_expire_and_the_lru_is_bounded(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    inner = CountingProvider()
+    provider = CachingProvider(inner, max_entries=2, ttl_s=60)
+
+    for model in ("a", "b", "c"):
+        await provider.chat(MESSAGES, model=model)
+    await provider.chat(MESSAGES, model="a")  # evicted by "c"
+    assert inner.calls == 4
+
+    now[0] += 61
+    await provider.chat(MESSAGES, model="c")
+    assert inner.calls == 5
+
+
+async def test_concurrent_identical_requests_share_one_call() -> None:
+    inner = CountingProvider(delay=0.05)
+    provider = CachingProvider(inner)
+
+    responses = await asyncio.gather(*(provider.chat(MESSAGES) for _ in range(5)))
+
+    assert inner.calls == 1
+    assert {r.content for r in responses} == {"answer 1"}
+    assert provider.stats()["coalesced"] == 4
+
+
+async def test_errors_side_effect_tools_and_opt_outs_are_not_cached() -> None:
+    failing = CachingProvider(CountingProvider(fail=True))
+    await failing.chat(MESSAGES)
+    await failing.chat(MESSAGES)
+    assert failing.inner.calls == 2
+
+    writer = CachingProvider(CountingProvider(tool="write_file"), replayable_tools={"read_file"})
+    await writer.chat(MESSAGES)
+    await writer.chat(MESSAGES)
+    assert writer.inner.calls == 2
+
+    reader = CachingProvider(CountingProvider(tool="read_file"), replayable_tools={"read_file"})
+    await reader.chat(MESSAGES)
+    assert (await reader.chat(MESSAGES)).tool_calls[0].name == "read_file"
+    assert reader.inner.calls == 1
+
+    with no_cache():
+        await reader.chat(MESSAGES)
+    assert reader.inner.calls == 2
+
+
+async def test_disk_tier_survives_restarts(tmp_path) -> None:
+    db = tmp_path / "cache" / "llm.db"
+    provider = CachingProvider(CountingProvider(tool="read_file"), db_path=db, replayable_tools={"read_file"})
+    await provider.chat(MESSAGES)
+    provider.close()
+
+    inner = CountingProvider()
+    restarted = CachingProvider(inner, db_path=db)
+    response = await restarted.chat(MESSAGES)
+
+    assert inner.calls == 0
+    assert response.content == "answer 1" and response.tool_calls[0].arguments == {"path": "x"}
+    assert restarted.stats()["disk_hits"] == 1
+
+
+async def test_streams_are_stored_and_replayed() -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner)
+
+    first = [d async for d in provider.stream_chat(MESSAGES)]
+    replay = [d async for d in provider.stream_chat(MESSAGES)]
+
+    assert inner.calls == 1
+    assert first[-1].response.content == replay[-1].response.content == "answer 1"
+    assert replay[0].content == "answer 1"
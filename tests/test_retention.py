@@ -0,0 +1,119 @@
+"""Tests for the retention service and session expiry."""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from typer.testing import CliRunner
+
+from nanobot.cli.commands import app
+from nanobot.retention.service import RetentionService
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+
+
+def _file(path, size: int, age_days: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    then = time.time() - age_days * 86400
+    os.utime(path, (then, then))
+    return path
+
+
+def _old_session(manager: SessionManager, key: str, days: int) -> None:
+    session = manager.get_or_create(key)
+    session.add_message("user", "hi")
+    session.updated_at = datetime.now() - timedelta(days=days)
+    manager.save(session)
+    path = manager.store._get_session_path(key)
+    then = session.updated_at.timestamp()
+    os.utime(path, (then, then))
+
+
+def test_updated_at_is_restored_and_only_expiry_deletes_old_sessions(tmp_path) -> None:
+    for journal in (False, True):
+        store = JsonlSessionStore(tmp_path / str(journal), journal=journal)
+        manager = SessionManager(tmp_path, store=store)
+        session = manager.get_or_create("telegram:1")
+        session.add_message("user", "hi")
+        session.updated_at = datetime.now() - timedelta(days=2)
+        manager.save(session)
+
+        loaded = store.load("telegram:1")
+        assert loaded.updated_at == session.updated_at
+
+        # Past the default 30 days: still loads, retention decides when it goes
+        session.updated_at = datetime.now() - timedelta(days=40)
+        manager.save(session)
+        then = session.updated_at.timestamp()
+        os.utime(store._get_session_path("telegram:1"), (then, then))
+        assert store.load("telegram:1").messages[0].content == "hi"
+        assert manager.expire_sessions(days=90) == []
+        assert manager.expire_sessions(days=30) == ["telegram:1"]
+        assert store.load("telegram:1") is None
+
+
+def test_pass_applies_age_quota_and_batches(tmp_path) -> None:
+    data = tmp_path / "data"
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(data / "sessions"))
+    _old_session(manager, "old:1", 45)
+    _old_session(manager, "new:1", 1)
+    _file(data / "media" / "stale.jpg", 10, age_days=40)
+    for i in range(4):
+        _file(data / "media" / f"m{i}.jpg", 100, age_days=4 - i)
+    _file(data / "sessions" / "abc.tmp", 5, age_days=2)
+    _file(data / "config.json.tmp", 5, age_days=0)
+
+    service = RetentionService(manager, data, media_max_bytes=250, batch_size=2)
+
+    preview = service.run_once(dry_run=True)
+    assert preview["sessions"].removed == ["old:1"]
+    assert (data / "media" / "stale.jpg").exists()
+
+    results = service.run_once()
+    assert results["sessions"].removed == ["old:1"]
+    assert [os.path.basename(p) for p in results["media"].removed] == ["stale.jpg", "m0.jpg"]
+    assert results["temp"].removed == [str(data / "sessions" / "abc.tmp")]
+
+    # The over-quota media left by the batch limit goes on the next pass
+    results = service.run_once()
+    assert [os.path.basename(p) for p in results["media"].removed] == ["m1.jpg"]
+    assert results["media"].remaining_bytes == 200
+    assert (data / "config.json.tmp").exists()
+
+    stats = json.loads((data / "retention.json").read_text())
+    assert stats["runs"] == 2
+    assert stats["removed"] == {"sessions": 1, "media": 3, "temp": 1}
+    assert [s["key"] for s in manager.list_sessions()] == ["new:1"]
+
+
+async def test_periodic_pass_expires_sessions_off_the_loop(tmp_path) -> None:
+    data = tmp_path / "data"
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(data / "sessions"))
+    _old_session(manager, "old:1", 45)
+    threads = []
+    expire = manager.store.expire
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return expire(*args, **kwargs)
+
+    manager.store.expire = recording
+    await RetentionService(manager, data)._tick()
+
+    assert threads and threading.main_thread() not in threads
+    assert manager.list_sessions() == []
+    assert "old:1" not in manager._cache
+
+
+def test_dry_run_cli_removes_nothing(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    media = _file(tmp_path / ".nanobot" / "media" / "old.ogg", 10, age_days=90)
+
+    result = CliRunner().invoke(app, ["retention", "run", "--dry-run"])
+
+    assert result.exit_code == 0, result.output
+    assert "Would remove" in result.output
+    assert media.exists()
@@ -0,0 +1,42 @@
+"""Tests for the byte-budgeted session cache and compact message records."""
+
+from nanobot.session.base import Message
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+
+
+def test_message_round_trip_and_shared_llm_dict() -> None:
+    data = {"role": "user", "content": "hi", "timestamp": "t", "source": "voice", "tokens": {"m": 5}}
+    msg = Message.from_dict(data)
+
+    assert msg.to_dict() == data
+    assert msg.llm_dict() is msg.llm_dict()
+    assert msg.llm_dict() == {"role": "user", "content": "hi"}
+    assert Message("".join(["us", "er"]), "x").role is msg.role  # interned
+
+
+def test_cache_is_bounded_by_resident_bytes(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s"), cache_bytes=50_000)
+    for i in range(5):
+        session = manager.get_or_create(f"telegram:{i}")
+        session.add_message("user", "x" * 20_000)
+        manager.save(session)
+
+    stats = manager.cache_stats()
+    assert stats["bytes"] <= 50_000
+    assert stats["sessions"] == 2
+    assert list(manager._cache) == ["telegram:3", "telegram:4"]
+
+    # Evicted sessions still load from the store
+    assert manager.get_or_create("telegram:0").messages[0].content == "x" * 20_000
+
+
+def test_resident_size_follows_deletes(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s"))
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "hello")
+    manager.save(session)
+    assert manager.cache_stats()["bytes"] == session.resident_bytes() > 0
+
+    manager.delete("cli:direct")
+    assert manager.cache_stats() == {"sessions": 0, "bytes": 0, "budget_bytes": manager.cache_bytes}
@@ -0,0 +1,79 @@
+"""Tests for write-behind session flushing."""
+
+import asyncio
+import threading
+
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+
+
+class RecordingStore(JsonlSessionStore):
+    """Journal store that records which thread each save ran on."""
+
+    def __init__(self, path):
+        super().__init__(path, journal=True)
+        self.saves: list[tuple[str, str]] = []
+
+    def save(self, session):
+        self.saves.append((session.key, threading.current_thread().name))
+        super().save(session)
+
+
+def _reload(tmp_path) -> SessionManager:
+    return SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s", journal=True))
+
+
+async def test_saves_are_coalesced_and_written_off_the_loop(tmp_path) -> None:
+    store = RecordingStore(tmp_path / "s")
+    manager = SessionManager(tmp_path, store=store, flush_interval=0.05)
+    session = manager.get_or_create("telegram:1")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    assert store.saves == []
+
+    await asyncio.sleep(0.2)
+
+    assert len(store.saves) == 1
+    assert store.saves[0][1].startswith("session-flush")
+    assert len(_reload(tmp_path).get_or_create("telegram:1").messages) == 5
+
+
+async def test_changes_made_during_a_write_are_kept(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s", journal=True), flush_interval=60)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "a")
+    manager.save(session)
+
+    flushing = asyncio.create_task(manager.flush())
+    await asyncio.sleep(0)
+    session.add_message("assistant", "b")  # after the snapshot was taken
+    session.drop_oldest(1)
+    manager.save(session)
+    await flushing
+    await manager.flush("telegram:1")
+
+    assert [m.content for m in _reload(tmp_path).get_or_create("telegram:1").messages] == ["b"]
+    manager.close()
+
+
+async def test_close_writes_pending_changes(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s", journal=True), flush_interval=60)
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "hello")
+    manager.save(session)
+
+    manager.close()
+
+    assert _reload(tmp_path).get_or_create("cli:direct").messages[0].content == "hello"
+
+
+async def test_dirty_sessions_are_not_evicted(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s"), flush_interval=60, cache_bytes=1)
+    a = manager.get_or_create("a")
+    a.add_message("user", "x")
+    manager.save(a)
+    manager.get_or_create("b")
+
+    assert manager.get_or_create("a") is a
+    manager.close()
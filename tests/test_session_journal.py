@@ -0,0 +1,104 @@
+"""Tests for append-only (journal mode) session persistence."""
+
+from datetime import datetime
+
+import pytest
+
+from nanobot.session import jsonl_store
+from nanobot.session.manager import SessionManager
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch) -> SessionManager:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return SessionManager(tmp_path / "ws", journal=True)
+
+
+def _reload(manager: SessionManager, key: str):
+    fresh = SessionManager(manager.workspace, journal=manager.store.journal)
+    return fresh.get_or_create(key)
+
+
+def _lines(manager: SessionManager, key: str) -> int:
+    return len(manager.store._get_session_path(key).read_text().splitlines())
+
+
+def test_saves_append_only_new_messages(journal) -> None:
+    session = journal.get_or_create("telegram:1")
+    session.add_message("user", "hi")
+    journal.save(session)  # first save writes the file
+    first = _lines(journal, "telegram:1")
+
+    session.add_message("assistant", "hello")
+    session.add_message("user", "how are you")
+    session.metadata["lang"] = "en"
+    journal.save(session)
+
+    assert _lines(journal, "telegram:1") == first + 3  # two messages + metadata delta
+    reloaded = _reload(journal, "telegram:1")
+    assert [m.content for m in reloaded.messages] == ["hi", "hello", "how are you"]
+    assert reloaded.metadata == {"lang": "en"}
+
+
+def test_replay_honours_clear_trim_and_summary(journal) -> None:
+    session = journal.get_or_create("telegram:2")
+    for i in range(4):
+        session.add_message("user", f"old {i}")
+    journal.save(session)
+
+    session.clear()
+    session.add_message("user", "a")
+    session.add_message("assistant", "b")
+    session.add_message("user", "c")
+    journal.save(session)
+
+    session.summary = "talked about a"
+    session.drop_oldest(2)
+    journal.save(session)
+
+    reloaded = _reload(journal, "telegram:2")
+    assert [m.content for m in reloaded.messages] == ["c"]
+    assert reloaded.summary == "talked about a"
+
+
+def test_mostly_dead_journal_is_compacted(journal, monkeypatch) -> None:
+    monkeypatch.setattr(jsonl_store, "JOURNAL_COMPACT_MIN_LINES", 10)
+    session = journal.get_or_create("telegram:3")
+    journal.save(session)
+    for i in range(10):
+        session.clear()
+        session.add_message("user", f"m{i}")
+        journal.save(session)
+
+    # Dead metadata deltas and cleared messages triggered at least one rewrite
+    assert _lines(journal, "telegram:3") < 10
+    assert [m.content for m in _reload(journal, "telegram:3").messages] == ["m9"]
+
+
+def test_rewrite_mode_files_load_in_journal_mode(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    plain = SessionManager(tmp_path / "ws")
+    session = plain.get_or_create("cli:direct")
+    session.add_message("user", "hi")
+    plain.save(session)
+
+    journal = SessionManager(tmp_path / "ws", journal=True)
+    session = journal.get_or_create("cli:direct")
+    session.add_message("assistant", "hello")
+    journal.save(session)
+
+    assert [m.content for m in _reload(plain, "cli:direct").messages] == ["hi", "hello"]
+
+
+def test_list_sessions_reports_the_latest_update(journal) -> None:
+    session = journal.get_or_create("telegram:1")
+    session.add_message("user", "hi")
+    session.updated_at = datetime(2026, 1, 1)
+    journal.save(session)
+
+    session.add_message("user", "again")
+    session.updated_at = datetime(2026, 3, 1)
+    journal.save(session)  # appended: the header still says January
+
+    [listed] = journal.list_sessions()
+    assert listed["updated_at"] == "2026-03-01T00:00:00"
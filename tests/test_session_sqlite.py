@@ -0,0 +1,87 @@
+"""Tests for the SQLite session store and JSONL migration."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+from nanobot.session.sqlite_store import SqliteSessionStore, migrate_jsonl_sessions
+
+
+@pytest.fixture
+def store(tmp_path) -> SqliteSessionStore:
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def _reload(store: SqliteSessionStore, key: str):
+    return SessionManager(store.db_path.parent, store=store).get_or_create(key)
+
+
+def test_incremental_saves_round_trip(store) -> None:
+    manager = SessionManager(store.db_path.parent, store=store)
+    session = manager.get_or_create("telegram:1")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+    session.metadata["lang"] = "pt"
+    manager.save(session)
+
+    session.drop_oldest(2)
+    session.add_message("assistant", "m5")
+    session.summary = "early chat"
+    manager.save(session)
+
+    reloaded = _reload(store, "telegram:1")
+    assert [m.content for m in reloaded.messages] == ["m2", "m3", "m4", "m5"]
+    assert reloaded.metadata == {"lang": "pt"} and reloaded.summary == "early chat"
+
+    session.clear()
+    session.add_message("user", "fresh")
+    manager.save(session)
+    assert [m.content for m in _reload(store, "telegram:1").messages] == ["fresh"]
+
+
+def test_listing_and_bulk_expiry(store) -> None:
+    manager = SessionManager(store.db_path.parent, store=store)
+    for key, age in (("a:1", 40), ("b:2", 1), ("c:3", 60)):
+        session = manager.get_or_create(key)
+        session.add_message("user", "hi")
+        session.updated_at = datetime.now() - timedelta(days=age)
+        manager.save(session)
+
+    assert [s["key"] for s in manager.list_sessions()] == ["b:2", "a:1", "c:3"]
+    assert sorted(manager.expire_sessions(days=30)) == ["a:1", "c:3"]
+    assert [s["key"] for s in manager.list_sessions()] == ["b:2"]
+    assert store._conn.execute("SELECT COUNT(*) FROM messages").fetchone() == (1,)
+
+
+def test_migrate_jsonl_sessions(tmp_path, store) -> None:
+    jsonl = JsonlSessionStore(tmp_path / "jsonl")
+    manager = SessionManager(tmp_path, store=jsonl)
+    for key in ("telegram:1", "cli:direct"):
+        session = manager.get_or_create(key)
+        session.add_message("user", f"hello from {key}")
+        manager.save(session)
+
+    assert store.is_empty()
+    assert migrate_jsonl_sessions(jsonl, store) == 2
+    assert _reload(store, "telegram:1").messages[0].content == "hello from telegram:1"
+    assert {s["key"] for s in store.list_sessions()} == {"telegram:1", "cli:direct"}
+
+
+def test_migration_keeps_old_jsonl_sessions(tmp_path, store) -> None:
+    jsonl = JsonlSessionStore(tmp_path / "jsonl", journal=True, tail_messages=1)
+    manager = SessionManager(tmp_path, store=jsonl)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "long ago")
+    session.add_message("assistant", "indeed")
+    session.updated_at = datetime.now() - timedelta(days=400)
+    manager.save(session)
+    path = jsonl._get_session_path("telegram:1")
+    before = path.read_bytes()
+
+    assert migrate_jsonl_sessions(jsonl, store) == 1
+    assert path.read_bytes() == before
+    assert [m.content for m in _reload(store, "telegram:1").messages] == ["long ago", "indeed"]
@@ -0,0 +1,104 @@
+"""Tests for tail-only lazy session loading."""
+
+import pytest
+
+from nanobot.session import jsonl_store
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+from nanobot.session.sqlite_store import SqliteSessionStore
+
+
+def _jsonl(tmp_path, tail: int) -> SessionManager:
+    return SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "s", journal=True, tail_messages=tail))
+
+
+def _sqlite(tmp_path, tail: int) -> SessionManager:
+    return SessionManager(tmp_path, store=SqliteSessionStore(tmp_path / "s.db", tail_messages=tail))
+
+
+def _contents(session) -> list[str]:
+    return [m.content for m in session.messages]
+
+
+@pytest.fixture(params=[_jsonl, _sqlite], ids=["jsonl", "sqlite"])
+def make(request):
+    return request.param
+
+
+def _write(manager: SessionManager, key: str, count: int) -> None:
+    session = manager.get_or_create(key)
+    session.summary = "earlier stuff"
+    session.metadata["lang"] = "en"
+    for i in range(count):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    session.drop_oldest(3)
+    manager.save(session)
+
+
+def test_only_newest_messages_are_loaded(tmp_path, make) -> None:
+    _write(make(tmp_path, 0), "telegram:1", 20)
+
+    session = make(tmp_path, 5).get_or_create("telegram:1")
+    assert _contents(session) == [f"m{i}" for i in range(15, 20)]
+    assert session.summary == "earlier stuff"
+    assert session.metadata == {"lang": "en"}
+
+
+def test_older_history_is_paged_in_on_demand(tmp_path, make) -> None:
+    _write(make(tmp_path, 0), "telegram:1", 20)
+    manager = make(tmp_path, 5)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("assistant", "new")
+    session.drop_oldest(2)  # drops unloaded messages first
+    manager.save(session)
+
+    manager.load_older(session)
+    assert _contents(session) == [f"m{i}" for i in range(5, 20)] + ["new"]
+
+    reloaded = make(tmp_path, 0).get_or_create("telegram:1")
+    assert _contents(reloaded) == _contents(session)
+
+
+async def test_older_history_is_paged_in_off_the_loop(tmp_path, make) -> None:
+    _write(make(tmp_path, 0), "telegram:1", 20)
+    manager = make(tmp_path, 5)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("assistant", "new")
+
+    assert await manager.page_in_older(session)
+    assert _contents(session) == [f"m{i}" for i in range(3, 20)] + ["new"]
+
+
+async def test_paging_in_gives_up_if_the_session_changed_meanwhile(tmp_path, make) -> None:
+    _write(make(tmp_path, 0), "telegram:1", 20)
+    manager = make(tmp_path, 5)
+    session = manager.get_or_create("telegram:1")
+    read_older = manager.store.read_older
+
+    def trimmed_meanwhile(*args):
+        session.drop_oldest(1)
+        return read_older(*args)
+
+    manager.store.read_older = trimmed_meanwhile
+    assert not await manager.page_in_older(session)
+    assert _contents(session) == [f"m{i}" for i in range(15, 20)]
+
+
+def test_tail_read_stops_before_the_start_of_the_file(tmp_path, monkeypatch) -> None:
+    _write(_jsonl(tmp_path, 0), "telegram:1", 200)
+    monkeypatch.setattr(jsonl_store, "READ_BLOCK_SIZE", 256)
+
+    reads: list[int] = []
+    original = jsonl_store._reverse_lines
+
+    def counting(f, start):
+        for line in original(f, start):
+            reads.append(len(line))
+            yield line
+
+    monkeypatch.setattr(jsonl_store, "_reverse_lines", counting)
+    session = _jsonl(tmp_path, 3).get_or_create("telegram:1")
+
+    assert _contents(session) == ["m197", "m198", "m199"]
+    assert len(reads) < 10
@@ -0,0 +1,90 @@
+"""Tests for the indexed skills loader."""
+
+from nanobot.agent.skills import SkillsLoader, parse_frontmatter
+
+
+def _skill(root, name: str, text: str) -> None:
+    (root / name).mkdir(parents=True, exist_ok=True)
+    (root / name / "SKILL.md").write_text(text)
+
+
+def _loader(tmp_path) -> SkillsLoader:
+    ws, builtin = tmp_path / "ws", tmp_path / "builtin"
+    builtin.mkdir()
+    (ws / "skills").mkdir(parents=True)
+    return SkillsLoader(ws, builtin_skills_dir=builtin)
+
+
+def test_parse_frontmatter_yaml_with_json_metadata() -> None:
+    text = '---\nname: x\ndescription: "A: b"\nmetadata: {"nanobot":{"always":true}}\n---\nBody\n'
+    data, offset = parse_frontmatter(text)
+    assert data["description"] == "A: b"
+    assert data["metadata"] == {"nanobot": {"always": True}}
+    assert text[offset:] == "Body\n"
+
+
+def test_parse_frontmatter_falls_back_for_invalid_yaml() -> None:
+    data, _ = parse_frontmatter("---\ndescription: see: this\n---\n")
+    assert data["description"] == "see: this"
+    assert parse_frontmatter("no frontmatter") == ({}, 0)
+
+
+def test_workspace_skill_overrides_builtin(tmp_path) -> None:
+    loader = _loader(tmp_path)
+    _skill(loader.builtin_skills, "demo", "---\ndescription: builtin\n---\n")
+    _skill(loader.workspace_skills, "demo", "---\ndescription: mine\n---\n")
+
+    skills = loader.list_skills()
+    assert [(s["name"], s["source"]) for s in skills] == [("demo", "workspace")]
+    assert loader.get_skill_metadata("demo")["description"] == "mine"
+
+
+def test_always_skills_and_requirements(tmp_path) -> None:
+    loader = _loader(tmp_path)
+    _skill(loader.builtin_skills, "on", '---\nmetadata: {"nanobot":{"always":true}}\n---\nAlways here')
+    _skill(loader.builtin_skills, "blocked",
+           '---\nmetadata: {"nanobot":{"always":true,"requires":{"bins":["no-such-bin-xyz"]}}}\n---\n')
+
+    assert loader.get_always_skills() == ["on"]
+    assert loader.load_skills_for_context(["on"]) == "### Skill: on\n\nAlways here"
+    summary = loader.build_skills_summary()
+    assert '<requires>CLI: no-such-bin-xyz</requires>' in summary
+
+
+def test_only_changed_skills_are_reparsed(tmp_path, monkeypatch) -> None:
+    loader = _loader(tmp_path)
+    _skill(loader.builtin_skills, "a", "---\ndescription: a\n---\n")
+    _skill(loader.builtin_skills, "b", "---\ndescription: b\n---\n")
+    loader.list_skills()
+
+    parsed: list[str] = []
+    original = loader._parse_skill
+    monkeypatch.setattr(loader, "_parse_skill", lambda name, *a: parsed.append(name) or original(name, *a))
+
+    loader.build_skills_summary()
+    assert parsed == []
+
+    _skill(loader.builtin_skills, "b", "---\ndescription: b changed\n---\n")
+    assert "b changed" in loader.build_skills_summary()
+    assert parsed == ["b"]
+
+
+def test_directories_are_only_listed_again_when_they_change(tmp_path, monkeypatch) -> None:
+    loader = _loader(tmp_path)
+    _skill(loader.builtin_skills, "a", "---\ndescription: a\n---\n")
+    (loader.workspace_skills / "draft").mkdir()
+    loader.list_skills()
+
+    scans: list[int] = []
+    original = loader._scan
+    monkeypatch.setattr(loader, "_scan", lambda: scans.append(1) or original())
+
+    loader.build_skills_summary()
+    loader.get_always_skills()
+    assert scans == []
+
+    (loader.workspace_skills / "draft" / "SKILL.md").write_text("---\ndescription: draft\n---\n")
+    assert [s["name"] for s in loader.list_skills()] == ["draft", "a"]
+    _skill(loader.builtin_skills, "b", "---\ndescription: b\n---\n")
+    assert [s["name"] for s in loader.list_skills()] == ["draft", "a", "b"]
+    assert len(scans) == 2
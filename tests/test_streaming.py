@@ -0,0 +1,140 @@
+"""Tests for token streaming from provider to bus."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import DRAFT_TTL_S, split_message
+from nanobot.channels.telegram import TelegramChannel
+from nanobot.config.schema import TelegramConfig
+from nanobot.providers import litellm_provider
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+def _chunk(content: str | None = None, tool_calls: list | None = None,
+           finish_reason: str | None = None, usage: Any = None) -> SimpleNamespace:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
+def _tc(index: int, id: str | None = None, name: str | None = None, args: str | None = None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=args))
+
+
+async def test_litellm_stream_assembles_tool_calls(monkeypatch) -> None:
+    chunks = [
+        _chunk(content="Let me "),
+        _chunk(content="look."),
+        _chunk(tool_calls=[_tc(0, "call_a", "read_file", '{"pa')]),
+        _chunk(tool_calls=[_tc(1, "call_b", "web_fetch", '{"url": "x"}')]),
+        _chunk(tool_calls=[_tc(0, args='th": "a.txt"}')], finish_reason="tool_calls"),
+        SimpleNamespace(choices=[], usage=SimpleNamespace(
+            prompt_tokens=10, completion_tokens=5, total_tokens=15)),
+    ]
+
+    async def fake_acompletion(**kwargs: Any) -> AsyncIterator[Any]:
+        assert kwargs["stream"] is True
+
+        async def gen():
+            for c in chunks:
+                yield c
+        return gen()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    provider = LiteLLMProvider(default_model="gpt-4o")
+    deltas = [d async for d in provider.stream_chat([{"role": "user", "content": "hi"}])]
+
+    assert [d.content for d in deltas[:-1]] == ["Let me ", "look."]
+    final = deltas[-1].response
+    assert final.content == "Let me look."
+    assert [(tc.id, tc.name, tc.arguments) for tc in final.tool_calls] == [
+        ("call_a", "read_file", {"path": "a.txt"}),
+        ("call_b", "web_fetch", {"url": "x"}),
+    ]
+    assert final.finish_reason == "tool_calls"
+    assert final.usage["total_tokens"] == 15
+
+
+class WordStreamProvider(LLMProvider):
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="hello there")
+
+    async def stream_chat(self, messages: list[dict[str, Any]], **kwargs: Any):
+        for word in ["hello", " there"]:
+            yield StreamDelta(content=word)
+            await asyncio.sleep(0.3)
+        yield StreamDelta(response=LLMResponse(content="hello there"))
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_agent_publishes_partials_then_final(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=WordStreamProvider(), workspace=tmp_path / "ws", stream=True)
+    runner = asyncio.create_task(agent.run())
+    await bus.publish_inbound(InboundMessage("telegram", "u", "42", "hi"))
+
+    received = []
+    while not received or received[-1].is_partial:
+        received.append(await asyncio.wait_for(bus.consume_outbound(), 5))
+    agent.stop()
+    await runner
+
+    partials, final = received[:-1], received[-1]
+    assert [p.content for p in partials] == ["hello", "hello there"]
+    assert final.content == "hello there"
+    assert final.stream_id and all(p.stream_id == final.stream_id for p in partials)
+
+
+async def test_direct_processing_streams_to_callback(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    agent = AgentLoop(bus=MessageBus(), provider=WordStreamProvider(), workspace=tmp_path / "ws")
+    seen: list[str] = []
+
+    async def on_text(text: str) -> None:
+        seen.append(text)
+
+    assert await agent.process_direct("hi", on_text=on_text) == "hello there"
+    assert seen == ["hello", "hello there"]
+
+
+def test_split_message_prefers_line_breaks() -> None:
+    assert split_message("short", 10) == ["short"]
+    assert split_message("first line\nsecond line", 15) == ["first line", "second line"]
+    assert split_message("a" * 25, 10) == ["a" * 10, "a" * 10, "a" * 5]
+
+
+async def test_telegram_final_reuses_the_draft_and_splits_long_replies() -> None:
+    calls: list[tuple[str, str]] = []
+
+    async def send_message(chat_id: int, text: str, **kwargs: Any) -> SimpleNamespace:
+        calls.append(("send", text))
+        return SimpleNamespace(message_id=len(calls))
+
+    async def edit_message_text(chat_id: int, message_id: int, text: str, **kwargs: Any) -> None:
+        calls.append(("edit", text))
+
+    channel = TelegramChannel(TelegramConfig(), MessageBus())
+    channel._app = SimpleNamespace(bot=SimpleNamespace(send_message=send_message, edit_message_text=edit_message_text))
+    channel._drafts["stale"] = (1, time.monotonic() - DRAFT_TTL_S - 1, "abandoned")
+
+    await channel.send(OutboundMessage("telegram", "1", "hello", is_partial=True, stream_id="s1"))
+    await channel.send(OutboundMessage("telegram", "1", "hello", stream_id="s1"))
+    assert calls == [("send", "hello")]  # identical final: no edit
+    assert channel._drafts == {}  # the abandoned draft was evicted
+
+    calls.clear()
+    long_reply = "x" * 4000 + "\n" + "y" * 200
+    await channel.send(OutboundMessage("telegram", "1", "x" * 10, is_partial=True, stream_id="s2"))
+    await channel.send(OutboundMessage("telegram", "1", long_reply, stream_id="s2"))
+    assert calls == [("send", "x" * 10), ("edit", "x" * 4000), ("send", "y" * 200)]
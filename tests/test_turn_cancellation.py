@@ -0,0 +1,203 @@
+"""Tests for cancelling a running turn when the user sends a newer message."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+from nanobot.providers.cache import CachingProvider
+from nanobot.providers.hedged import HedgedProvider
+from nanobot.providers.metered import MeteredProvider
+from nanobot.providers.resilient import ChainMember, ResilientProvider
+from nanobot.usage.store import UsageStore
+
+
+class StuckTool(Tool):
+    """Tool that never finishes; records whether it was cancelled."""
+
+    def __init__(self):
+        self.cancelled = asyncio.Event()
+
+    @property
+    def name(self) -> str:
+        return "stuck"
+
+    @property
+    def description(self) -> str:
+        return "Never returns."
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs: Any) -> str:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return ""
+
+
+class ToolThenEchoProvider(LLMProvider):
+    """Calls the stuck tool for "slow" messages, echoes anything else."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        last = messages[-1]
+        if last["role"] == "user" and last["content"] == "slow":
+            return LLMResponse(content=None, tool_calls=[ToolCallRequest("1", "stuck", {})])
+        return LLMResponse(content=f"echo:{last['content']}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _agent(tmp_path, bus: MessageBus, cancel: bool) -> tuple[AgentLoop, StuckTool]:
+    agent = AgentLoop(
+        bus=bus, provider=ToolThenEchoProvider(), workspace=tmp_path / "ws", cancel_superseded=cancel
+    )
+    tool = StuckTool()
+    agent.tools.register(tool)
+    return agent, tool
+
+
+async def test_newer_message_cancels_the_running_turn(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    agent, tool = _agent(tmp_path, bus, cancel=True)
+    runner = asyncio.create_task(agent.run())
+
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "slow"))
+    await asyncio.sleep(0.05)
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "never mind"))
+
+    reply = await asyncio.wait_for(bus.consume_outbound(), 5)
+    agent.stop()
+    await runner
+
+    assert tool.cancelled.is_set()
+    assert reply.content == "echo:never mind"
+    assert bus.outbound_size == 0
+    history = [(m["role"], m["content"]) for m in agent.sessions.get_or_create("telegram:1").get_history()]
+    assert history == [
+        ("user", "slow"),
+        ("assistant", "[Interrupted by a newer message after calling: stuck]"),
+        ("user", "never mind"),
+        ("assistant", "echo:never mind"),
+    ]
+
+
+async def test_other_sessions_and_disabled_mode_are_not_cancelled(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    agent, tool = _agent(tmp_path, bus, cancel=False)
+    runner = asyncio.create_task(agent.run())
+
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "slow"))
+    await asyncio.sleep(0.05)
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "again"))
+    await bus.publish_inbound(InboundMessage("telegram", "u", "2", "hi"))
+
+    reply = await asyncio.wait_for(bus.consume_outbound(), 5)
+    assert reply.content == "echo:hi"
+    assert not tool.cancelled.is_set()
+    agent.stop()
+    runner.cancel()
+
+
+async def test_cancelled_exec_kills_its_process(tmp_path, monkeypatch) -> None:
+    started: list[asyncio.subprocess.Process] = []
+    spawn = asyncio.create_subprocess_exec
+
+    async def record(*args, **kwargs):
+        started.append(await spawn(*args, **kwargs))
+        return started[-1]
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", record)
+    call = asyncio.create_task(ExecTool(working_dir=str(tmp_path)).execute("sleep 30"))
+    while not started:
+        await asyncio.sleep(0.01)
+    call.cancel()
+
+    assert await asyncio.wait_for(started[0].wait(), 5) != 0
+
+
+async def test_superseded_stream_gets_an_interrupted_final(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    class ThinkingProvider(ToolThenEchoProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            response = await super().chat(messages, **kwargs)
+            if response.tool_calls:
+                response.content = "Let me check"
+            return response
+
+    bus = MessageBus()
+    agent = AgentLoop(
+        bus=bus, provider=ThinkingProvider(), workspace=tmp_path / "ws", cancel_superseded=True, stream=True
+    )
+    agent.tools.register(StuckTool())
+    runner = asyncio.create_task(agent.run())
+
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "slow"))
+    await asyncio.sleep(0.05)
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "never mind"))
+
+    finals = []
+    while len(finals) < 2:
+        msg = await asyncio.wait_for(bus.consume_outbound(), 5)
+        if not msg.is_partial:
+            finals.append(msg)
+    agent.stop()
+    await runner
+
+    interrupted, reply = finals
+    assert interrupted.metadata == {"interrupted": True}
+    assert interrupted.content.startswith("Let me check") and interrupted.stream_id
+    assert reply.content == "echo:never mind" and reply.stream_id != interrupted.stream_id
+
+
+async def test_cancelled_turn_closes_the_innermost_stream(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    closed = asyncio.Event()
+    streams = []  # held here so garbage collection can't be what closes them
+
+    class StreamingProvider(ToolThenEchoProvider):
+        def stream_chat(self, messages: list[dict[str, Any]], **kwargs: Any):
+            streams.append(self._stream(messages))
+            return streams[-1]
+
+        async def _stream(self, messages: list[dict[str, Any]]):
+            if messages[-1]["content"] != "slow":
+                yield StreamDelta(response=await self.chat(messages))
+                return
+            try:
+                yield StreamDelta(content="Let me think")
+                yield StreamDelta(response=LLMResponse(content="Let me think"))
+            finally:
+                closed.set()
+
+    member = ChainMember("primary", HedgedProvider(StreamingProvider()))
+    provider = CachingProvider(MeteredProvider(ResilientProvider([member]), UsageStore(tmp_path / "usage.db")))
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=provider, workspace=tmp_path / "ws", cancel_superseded=True, stream=True)
+
+    async def stuck_publish(text: str) -> None:
+        await asyncio.Event().wait()
+
+    # The turn is cancelled while handling a delta, with the streams suspended between deltas
+    agent._stream_publisher = lambda *args: stuck_publish
+    runner = asyncio.create_task(agent.run())
+
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "slow"))
+    await asyncio.sleep(0.05)
+    await bus.publish_inbound(InboundMessage("telegram", "u", "1", "never mind"))
+
+    await asyncio.wait_for(closed.wait(), 5)
+    agent.stop()
+    runner.cancel()
+    assert member.breaker.state == "closed"
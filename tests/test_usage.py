@@ -0,0 +1,116 @@
+"""Tests for LLM usage accounting: recording, rollups and per-session token budgets."""
+
+import asyncio
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.metered import MeteredProvider
+from nanobot.providers.resilient import ChainMember, ResilientProvider
+from nanobot.usage.scope import SUBAGENT, set_scope
+from nanobot.usage.store import UsageRecord, UsageStore
+
+
+class UsageProvider(LLMProvider):
+    """Replies with fixed token counts; calls list_dir first when asked to."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        usage = {"prompt_tokens": 100, "completion_tokens": 20, "cached_tokens": 60, "reasoning_tokens": 5}
+        last = messages[-1]
+        if last["role"] == "user" and last["content"] == "look around":
+            return LLMResponse(content=None, tool_calls=[ToolCallRequest("1", "list_dir", {"path": "."})], usage=usage)
+        return LLMResponse(content="done", usage=usage)
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-opus-4-5"
+
+
+def test_rollups_by_session_source_and_cron_job(tmp_path) -> None:
+    store = UsageStore(tmp_path / "usage.db")
+    store.record(UsageRecord("telegram:1", "telegram", "turn", "", "m1", 100, 10))
+    store.record(UsageRecord("telegram:1", "telegram", "subagent", "ab12", "m1", 300, 30))
+    store.record(UsageRecord("cli:direct", "cli", "cron", "cron:job1", "m2", 50, 5, error=True))
+    store.record(UsageRecord("telegram:1", "telegram", "turn", "", "m1", 1000, 100, ts=1.0))  # long ago
+
+    sessions = store.summary("session", since=100.0)
+    assert [(r["name"], r["calls"], r["total_tokens"]) for r in sessions] == [
+        ("telegram:1", 2, 440), ("cli:direct", 1, 55),
+    ]
+    assert [(r["name"], r["errors"]) for r in store.summary("cron")] == [("cron:job1", 1)]
+    assert [r["name"] for r in store.summary("subagent")] == ["ab12"]
+    assert store.session_tokens("telegram:1", since=100.0) == 440
+    assert len(list(store.records())) == 4
+
+
+async def test_calls_are_recorded_with_their_scope(tmp_path) -> None:
+    store = UsageStore(tmp_path / "usage.db")
+    provider = MeteredProvider(UsageProvider(), store)
+
+    set_scope("telegram:1", "telegram", SUBAGENT, "ab12")
+    await provider.chat([{"role": "user", "content": "hi"}])
+
+    [record] = list(store.records())
+    assert record["session_key"] == "telegram:1" and record["source"] == "subagent" and record["label"] == "ab12"
+    assert record["model"] == "anthropic/claude-opus-4-5"
+    assert (record["prompt_tokens"], record["completion_tokens"]) == (100, 20)
+    assert (record["cached_tokens"], record["reasoning_tokens"]) == (60, 5)
+    assert record["cost"] > 0 and record["error"] == 0
+
+
+async def test_each_failover_attempt_is_recorded_with_its_model(tmp_path) -> None:
+    store = UsageStore(tmp_path / "usage.db")
+
+    class UnauthorizedError(Exception):
+        status_code = 401
+
+    class FailingProvider(UsageProvider):
+        async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+            return LLMResponse(content="Error: unauthorized", finish_reason="error", error=UnauthorizedError())
+
+    provider = ResilientProvider([
+        ChainMember("primary", MeteredProvider(FailingProvider(), store)),
+        ChainMember("backup", MeteredProvider(UsageProvider(), store), model="openai/gpt-4o"),
+    ])
+    response = await provider.chat([{"role": "user", "content": "hi"}], model="anthropic/claude-opus-4-5")
+
+    assert response.content == "done"
+    assert [(r["model"], r["error"]) for r in store.records()] == [
+        ("anthropic/claude-opus-4-5", 1), ("openai/gpt-4o", 0),
+    ]
+
+
+async def test_agent_loop_enforces_session_budgets(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = UsageStore(tmp_path / "usage.db")
+    bus = MessageBus()
+    agent = AgentLoop(
+        bus=bus,
+        provider=MeteredProvider(UsageProvider(), store),
+        workspace=tmp_path / "ws",
+        usage=store,
+        session_token_budget=100,
+    )
+
+    # One call (120 tokens) goes over the budget: the turn stops before its second call
+    first = await agent._process_message(InboundMessage("telegram", "u", "1", "look around"))
+    assert "token budget" in first.content
+    assert [r["source"] for r in store.records()] == ["turn"]
+
+    second = await agent._process_message(InboundMessage("telegram", "u", "1", "hello"))
+    assert "token budget" in second.content
+    assert len(list(store.records())) == 1
+
+    other = await agent._process_message(InboundMessage("telegram", "u", "2", "hello"))
+    assert other.content == "done"
+
+
+async def test_direct_turns_are_attributed_to_cron_jobs(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = UsageStore(tmp_path / "usage.db")
+    agent = AgentLoop(bus=MessageBus(), provider=MeteredProvider(UsageProvider(), store), workspace=tmp_path / "ws")
+
+    await asyncio.wait_for(agent.process_direct("ping", session_key="cron:job1", priority="cron"), timeout=5)
+
+    assert [(r["name"], r["calls"]) for r in store.summary("cron")] == [("cron:job1", 1)]
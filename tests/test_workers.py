@@ -0,0 +1,168 @@
+"""Tests for the multi-process gateway: session routing, worker supervision and the shared cron store."""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+from nanobot.workers import supervisor
+from nanobot.workers.protocol import encode_frame
+from nanobot.workers.ring import HashRing
+from nanobot.workers.supervisor import WorkerError, WorkerPool
+from nanobot.workers.worker import AgentWorker
+
+# Stand-in worker: echoes inbound messages back tagged with its index,
+# answers direct requests, and crashes on request
+FAKE_WORKER = """
+import asyncio, os, sys
+from nanobot.workers.protocol import encode_frame, open_connection, read_frame
+
+async def main(index, path):
+    reader, writer = await open_connection(path)
+    writer.write(encode_frame({"type": "hello", "worker": index, "pid": os.getpid()}))
+    while (frame := await read_frame(reader)) is not None:
+        if frame["type"] == "inbound":
+            msg = frame["msg"]
+            reply = {"channel": msg["channel"], "chat_id": msg["chat_id"], "content": f"{index}:{msg['content']}"}
+            writer.write(encode_frame({"type": "outbound", "msg": reply}))
+        elif frame["content"] == "crash":
+            os._exit(1)
+        else:
+            writer.write(encode_frame({"type": "result", "id": frame["id"], "result": f"{index}:{frame['content']}"}))
+        await writer.drain()
+
+asyncio.run(main(int(sys.argv[1]), sys.argv[2]))
+"""
+
+
+def test_ring_is_stable_balanced_and_moves_few_keys() -> None:
+    keys = [f"telegram:{i}" for i in range(3000)]
+    ring = HashRing(["0", "1", "2"])
+    owners = {key: ring.node_for(key) for key in keys}
+
+    assert owners == {key: HashRing(["0", "1", "2"]).node_for(key) for key in keys}
+    assert min(Counter(owners.values()).values()) > 600
+
+    grown = HashRing(["0", "1", "2", "3"])
+    moved = [key for key in keys if grown.node_for(key) != owners[key]]
+    assert all(grown.node_for(key) == "3" for key in moved)
+    assert len(moved) < len(keys) / 2
+
+
+async def test_pool_routes_sessions_and_restarts_crashed_workers(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(supervisor, "RESTART_BACKOFF_S", 0.05)
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER)
+    bus = MessageBus()
+    pool = WorkerPool(bus, 3, tmp_path / "workers.sock")
+    pool.command_for = lambda i: [sys.executable, str(script), str(i), str(pool.socket_path)]
+
+    await pool.start()
+    router = asyncio.create_task(pool.run())
+    try:
+        chats = [str(i) for i in range(12)]
+        for chat in chats:
+            await bus.publish_inbound(InboundMessage("telegram", "u", chat, "hi"))
+        replies = {}
+        for _ in chats:
+            msg = await asyncio.wait_for(bus.consume_outbound(), timeout=10)
+            replies[msg.chat_id] = msg.content
+        assert replies == {chat: f"{pool.worker_for(f'telegram:{chat}')}:hi" for chat in chats}
+
+        # Direct turns go to the owner of the session they run in, not of their label
+        owner = pool.worker_for("telegram:7")
+        with pytest.raises(WorkerError):
+            await asyncio.wait_for(
+                pool.process_direct("crash", session_key="cron:1", channel="telegram", chat_id="7"), timeout=10
+            )
+        # Sent while the worker restarts: kept and delivered once it is back
+        result = await asyncio.wait_for(
+            pool.process_direct("again", session_key="cron:1", channel="telegram", chat_id="7"), timeout=10
+        )
+        assert result == f"{owner}:again"
+        assert pool.restarts[owner] == 1
+        assert pool.status()["workers"][owner]["connected"]
+    finally:
+        await pool.stop()
+        router.cancel()
+    assert not pool.socket_path.exists()
+
+
+async def test_malformed_hellos_are_rejected(tmp_path) -> None:
+    pool = WorkerPool(MessageBus(), 2, tmp_path / "workers.sock")
+    for line in [
+        encode_frame({"type": "hello", "worker": "0"}),
+        encode_frame({"type": "hello", "worker": None}),
+        encode_frame({"type": "hello", "worker": 2}),
+        b"[1, 2]\n",
+        b"not json\n",
+    ]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(line)
+        reader.feed_eof()
+        closed = []
+        await pool._on_connect(reader, SimpleNamespace(close=lambda: closed.append(True)))
+        assert closed and not pool._writers
+
+
+def test_cron_store_changes_from_other_processes_are_picked_up(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    gateway = CronService(path)
+    worker = CronService(path)
+    assert gateway.list_jobs() == []
+
+    job = worker.add_job("ping", CronSchedule(kind="every", every_ms=60_000), "ping")
+
+    assert [j.id for j in gateway.list_jobs()] == [job.id]
+    gateway.remove_job(job.id)
+    assert worker.list_jobs() == []
+
+
+async def test_cron_run_keeps_jobs_added_while_it_ran(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    worker = CronService(path)
+
+    async def on_job(job):
+        # The job's turn runs on a worker, which adds a job to the shared store meanwhile
+        worker.add_job("added", CronSchedule(kind="every", every_ms=60_000), "later")
+        return "ok"
+
+    gateway = CronService(path, on_job=on_job)
+    job = gateway.add_job("tick", CronSchedule(kind="every", every_ms=60_000), "tick")
+
+    assert await gateway.run_job(job.id)
+
+    jobs = {j.name: j for j in CronService(path).list_jobs()}
+    assert set(jobs) == {"tick", "added"}
+    assert jobs["tick"].state.last_status == "ok"
+
+
+def test_workers_expire_only_the_sessions_they_own(tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"))
+    agent = SimpleNamespace(bus=MessageBus())
+    workers = [AgentWorker(i, "", agent, manager, workers=2, session_days=30) for i in range(2)]
+    keys = [f"telegram:{i}" for i in range(8)]
+    for key in keys:
+        session = manager.get_or_create(key)
+        session.add_message("user", "hi")
+        session.updated_at = datetime.now() - timedelta(days=40)
+        manager.save(session)
+        then = session.updated_at.timestamp()
+        os.utime(manager.store._get_session_path(key), (then, then))
+    owned = [key for key in keys if workers[0].owns(key)]
+    active = manager.get_or_create(owned[0])
+    active.add_message("user", "still here")  # cached, not yet written to the store
+
+    expired = workers[0].expire_sessions()
+
+    assert set(expired) == set(owned[1:])